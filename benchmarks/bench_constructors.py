@@ -0,0 +1,95 @@
+"""
+Per object cost of the Point and Vector constructors, and what the fast paths save on operations that create them.
+
+Compares:
+- keyword: Point(x=.., y=.., z=.., logger=..) and Vector(Point(..), logger=..), as v3d used on its hot paths
+- positional: Point(x, y, z) and Vector(Point(x, y, z))
+- fast: Point._from_xyz and Vector.from_xyz, which skip __init__ and its keyword handling
+
+The operations are timed against a copy of how they were written with the keyword constructors.
+
+Usage:
+    python benchmarks/bench_constructors.py [--number 100000]  # with v3d installed
+"""
+import argparse
+import math
+import timeit
+
+from v3d import Point, Vector
+
+
+def constructors() -> dict:
+    logger = Point.logger
+    return {
+        "Point": (lambda: Point(x=1.0, y=2.0, z=3.0, logger=logger),
+                  lambda: Point(1.0, 2.0, 3.0),
+                  lambda: Point._from_xyz(1.0, 2.0, 3.0, logger)),
+        "Vector": (lambda: Vector(Point(x=1.0, y=2.0, z=3.0, logger=logger), logger=logger),
+                   lambda: Vector(Point(1.0, 2.0, 3.0)),
+                   lambda: Vector.from_xyz(1.0, 2.0, 3.0, logger)),
+    }
+
+
+def keyword_rotate(v: Vector, alpha: float, beta: float, gamma: float) -> Vector:
+    # Vector.rotate as it was, with a Vector for every step
+    alpha, beta, gamma = math.radians(alpha), math.radians(beta), math.radians(gamma)
+    vec = v.copy()
+    x = vec.point.x
+    y = vec.point.y * math.cos(alpha) - vec.point.z * math.sin(alpha)
+    z = vec.point.y * math.sin(alpha) + vec.point.z * math.cos(alpha)
+    vec = Vector(Point(x=x, y=y, z=z, logger=v.logger), logger=v.logger)
+    x = vec.point.x * math.cos(beta) + vec.point.z * math.sin(beta)
+    y = vec.point.y
+    z = -vec.point.x * math.sin(beta) + vec.point.z * math.cos(beta)
+    vec = Vector(Point(x=x, y=y, z=z, logger=v.logger), logger=v.logger)
+    x = vec.point.x * math.cos(gamma) - vec.point.y * math.sin(gamma)
+    y = vec.point.x * math.sin(gamma) + vec.point.y * math.cos(gamma)
+    z = vec.point.z
+    return Vector(Point(x=x, y=y, z=z, logger=v.logger), logger=v.logger)
+
+
+def operations() -> dict:
+    p = Point(1.3, 2.1, 0.7)
+    v, v2 = Vector(Point(1.3, 2.1, 0.7)), Vector(Point(0.2, -1.5, 3.3))
+    # Each operation with the keyword constructor version of it
+    return {
+        "Point.__neg__": (lambda: -p, lambda: Point(x=-p.x, y=-p.y, z=-p.z, logger=p.logger)),
+        "Point.copy": (lambda: p.copy(), lambda: Point(x=p.x, y=p.y, z=p.z, logger=p.logger)),
+        "Vector.__neg__": (lambda: -v, lambda: Vector(-v.point, logger=v.logger)),
+        "Vector.multiply": (lambda: v.multiply(v2),
+                            lambda: Vector(Point(x=v.point.y * v2.point.z - v.point.z * v2.point.y,
+                                                 y=v.point.z * v2.point.x - v.point.x * v2.point.z,
+                                                 z=v.point.x * v2.point.y - v.point.y * v2.point.x,
+                                                 logger=v.logger), logger=v.logger)),
+        "Vector.rotate": (lambda: v.rotate(30, 45, 60), lambda: keyword_rotate(v, 30, 45, 60)),
+    }
+
+
+def timed(function, number: int) -> float:
+    # Best time of one call in microseconds
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'constructor':<18}{'keyword (us)':>14}{'positional (us)':>17}{'fast (us)':>12}{'keyword/fast':>14}")
+    for name, (keyword, positional, fast) in constructors().items():
+        keyword_time = timed(keyword, args.number)
+        positional_time = timed(positional, args.number)
+        fast_time = timed(fast, args.number)
+        print(f"{name:<18}{keyword_time:>14.3f}{positional_time:>17.3f}{fast_time:>12.3f}"
+              f"{keyword_time / fast_time:>13.2f}x")
+
+    print()
+    print(f"{'operation':<18}{'keyword (us)':>14}{'fast (us)':>12}{'saved (us)':>12}")
+    for name, (operation, keyword) in operations().items():
+        keyword_time = timed(keyword, args.number)
+        fast_time = timed(operation, args.number)
+        print(f"{name:<18}{keyword_time:>14.3f}{fast_time:>12.3f}{keyword_time - fast_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per operation cost of logging on the Point/Vector hot path.
+
+Compares three modes with the default (disabled) 'dummy' logger:
+- eager: message built with str.format before every call, as v3d did before lazy logging
+- lazy: the default. The message is only built if the logger is enabled for INFO
+- off: v3d.disable_arithmetic_logging(). No logging calls at all
+
+Usage:
+    python benchmarks/bench_logging.py [--number 100000]  # with v3d installed
+"""
+import argparse
+import timeit
+
+import v3d
+from v3d import Point, Vector
+
+
+def operations() -> dict:
+    p, p2 = Point(1, 2, 3), Point(3, 1, 4)
+    v, v2 = Vector(Point(1, 2, 3)), Vector(Point(3, 1, 4))
+    # Each operation with the message v3d used to build eagerly for it
+    return {
+        "Point.add": (lambda: p.add(p2), lambda: "Calculating {} + {}".format(p, p2)),
+        "Point.scale": (lambda: p.scale(2), lambda: "Scaling the {}".format(p)),
+        "Point.dist": (lambda: p.dist(p2), lambda: "Calculating distance between {} and {}".format(p, p2)),
+        "Point.is_same": (lambda: p.is_same(p2), lambda: "Checking if {} and {} are same points".format(p, p2)),
+        "Vector.dot": (lambda: v.dot(v2), lambda: "Calculating dot product of {} and {}".format(v, v2)),
+        "Vector.multiply": (lambda: v.multiply(v2), lambda: "Calculating {} * {}".format(v, v2)),
+        "Vector.unit": (lambda: v.unit(), lambda: "Calculating unit vector of {}".format(v)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'operation':<18}{'eager (us)':>12}{'lazy (us)':>12}{'off (us)':>12}{'eager/lazy':>12}{'eager/off':>12}")
+    for name, (operation, message) in operations().items():
+        def eager():
+            message()
+            operation()
+
+        v3d.enable_arithmetic_logging()
+        eager_time = min(timeit.repeat(eager, number=args.number, repeat=3)) / args.number * 1e6
+        lazy_time = min(timeit.repeat(operation, number=args.number, repeat=3)) / args.number * 1e6
+        v3d.disable_arithmetic_logging()
+        off_time = min(timeit.repeat(operation, number=args.number, repeat=3)) / args.number * 1e6
+        v3d.enable_arithmetic_logging()
+
+        print(f"{name:<18}{eager_time:>12.3f}{lazy_time:>12.3f}{off_time:>12.3f}"
+              f"{eager_time / lazy_time:>11.2f}x{eager_time / off_time:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
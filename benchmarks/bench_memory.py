@@ -0,0 +1,69 @@
+"""
+Memory per instance of Point and Vector.
+
+Compares the __slots__ layout of v3d with the previous layout, where each instance had a __dict__
+and every Vector stored its logger.
+
+Usage:
+    python benchmarks/bench_memory.py [--count 100000]  # with v3d installed
+"""
+import argparse
+import tracemalloc
+from logging import getLogger
+
+from v3d import Point, Vector, PointArray
+
+
+class DictPoint:
+    # Previous Point layout
+    logger = getLogger('dummy')
+
+    def __init__(self, x=0, y=0, z=0, logger=None):
+        if logger is not None:
+            self.logger = logger
+
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class DictVector:
+    # Previous Vector layout
+    def __init__(self, point, logger=None):
+        self.logger = logger or getLogger('dummy')
+        self.point = point
+
+
+def per_instance(factory, count: int) -> float:
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Do not count the list holding the objects
+    return (size - objects.__sizeof__()) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Number of instances to create")
+    args = parser.parse_args()
+
+    # Coordinates are floats, as they are in real data. Their size is part of each figure
+    layouts = {
+        "Point (__dict__)": lambda i: DictPoint(i + 0.1, i + 0.2, i + 0.3),
+        "Point (__slots__)": lambda i: Point(i + 0.1, i + 0.2, i + 0.3),
+        "Vector (__dict__)": lambda i: DictVector(DictPoint(i + 0.1, i + 0.2, i + 0.3)),
+        "Vector (__slots__)": lambda i: Vector(Point(i + 0.1, i + 0.2, i + 0.3)),
+        "PointArray row": None,
+    }
+    print(f"{'layout':<22}{'bytes/instance':>16}")
+    for name, factory in layouts.items():
+        if factory is None:
+            size = PointArray([[0.1, 0.2, 0.3]] * args.count).data.nbytes / args.count
+        else:
+            size = per_instance(factory, args.count)
+        print(f"{name:<22}{size:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Benchmark suite for the Point and Vector APIs.
+
+Every public method and operator of Point and Vector is timed over several input sizes.
+The scaling command times ParallelMap over several worker counts.
+Results are written as JSON, and two result files can be compared to find regressions.
+
+Usage (with v3d installed):
+    python benchmarks/suite.py run -o results.json [--sizes 1 100 10000] [--filter Vector.]
+    python benchmarks/suite.py scaling -o scaling.json [--size 1000000] [--workers 1 2 4 8]
+    python benchmarks/suite.py compare old.json new.json [--threshold 0.1]
+
+compare exits with status 1 if any benchmark got slower than the threshold allows.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import timeit
+from importlib import metadata
+
+import numpy as np
+
+from v3d import Point, Vector, PointArray, VectorArray, ParallelMap
+
+# Names of the benchmarks and functions that build them.
+# A builder takes the input size and returns a function that runs the operation once on each of size inputs
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(builder):
+        BENCHMARKS[name] = builder
+        return builder
+
+    return register
+
+
+def points(size: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [Point(x, y, z) for x, y, z in (rng.random((size, 3)) + 0.1).tolist()]
+
+
+def vectors(size: int, seed: int = 0) -> list:
+    return [Vector(point) for point in points(size, seed)]
+
+
+def unary(make, operation):
+    # Runs operation on each input
+    def builder(size: int):
+        first = make(size)
+        return lambda: [operation(a) for a in first]
+
+    return builder
+
+
+def binary(make, operation):
+    # Runs operation on each pair of inputs
+    def builder(size: int):
+        first, second = make(size, 0), make(size, 1)
+        return lambda: [operation(a, b) for a, b in zip(first, second)]
+
+    return builder
+
+
+# Point methods
+benchmark("Point.__init__")(lambda size: (lambda: [Point(1.0, 2.0, 3.0) for _ in range(size)]))
+benchmark("Point.copy")(unary(points, lambda a: a.copy()))
+benchmark("Point.divide")(unary(points, lambda a: a.divide(2.0)))
+benchmark("Point.to_polar")(unary(points, lambda a: a.to_polar()))
+benchmark("Point.scale")(unary(points, lambda a: a.scale(2.0)))
+benchmark("Point.subtract")(binary(points, lambda a, b: a.subtract(b)))
+benchmark("Point.add")(binary(points, lambda a, b: a.add(b)))
+benchmark("Point.dist")(binary(points, lambda a, b: a.dist(b)))
+benchmark("Point.dist(origin)")(unary(points, lambda a: a.dist()))
+benchmark("Point.is_same")(binary(points, lambda a, b: a.is_same(b)))
+benchmark("Point.grid_key")(unary(points, lambda a: a.grid_key()))
+benchmark("Point.add_")(binary(points, lambda a, b: a.add_(b)))
+benchmark("Point.subtract_")(binary(points, lambda a, b: a.subtract_(b)))
+benchmark("Point.scale_")(unary(points, lambda a: a.scale_(1.0)))
+benchmark("Point.divide_")(unary(points, lambda a: a.divide_(1.0)))
+benchmark("Point.from_polar")(lambda size: (lambda: [Point.from_polar(1.0, 45.0, 30.0) for _ in range(size)]))
+benchmark("Point.from_sequence")(lambda size: (lambda: [Point.from_sequence((1.0, 2.0, 3.0)) for _ in range(size)]))
+# Point operators
+benchmark("Point.__str__")(unary(points, lambda a: str(a)))
+benchmark("Point.__add__")(binary(points, lambda a, b: a + b))
+benchmark("Point.__sub__")(binary(points, lambda a, b: a - b))
+benchmark("Point.__neg__")(unary(points, lambda a: -a))
+benchmark("Point.__mul__")(unary(points, lambda a: a * 2.0))
+benchmark("Point.__rmul__")(unary(points, lambda a: 2.0 * a))
+benchmark("Point.__truediv__")(unary(points, lambda a: a / 2.0))
+benchmark("Point.__eq__")(binary(points, lambda a, b: a == b))
+
+# Vector methods
+benchmark("Vector.__init__")(lambda size: (lambda: [Vector(Point(1.0, 2.0, 3.0)) for _ in range(size)]))
+benchmark("Vector.is_same")(binary(vectors, lambda a, b: a.is_same(b)))
+benchmark("Vector.grid_key")(unary(vectors, lambda a: a.grid_key()))
+benchmark("Vector.from_points")(binary(points, lambda a, b: Vector.from_points(a, b)))
+benchmark("Vector.from_xyz")(lambda size: (lambda: [Vector.from_xyz(1.0, 2.0, 3.0) for _ in range(size)]))
+benchmark("Vector.from_sequence")(lambda size: (lambda: [Vector.from_sequence((1.0, 2.0, 3.0)) for _ in range(size)]))
+benchmark("Vector.copy")(unary(vectors, lambda a: a.copy()))
+benchmark("Vector.dot")(binary(vectors, lambda a, b: a.dot(b)))
+benchmark("Vector.multiply(scalar)")(unary(vectors, lambda a: a.multiply(2.0)))
+benchmark("Vector.multiply(vector)")(binary(vectors, lambda a, b: a.multiply(b)))
+benchmark("Vector.mag")(unary(vectors, lambda a: a.mag()))
+benchmark("Vector.divide")(unary(vectors, lambda a: a.divide(2.0)))
+benchmark("Vector.add")(binary(vectors, lambda a, b: a.add(b)))
+benchmark("Vector.subtract")(binary(vectors, lambda a, b: a.subtract(b)))
+benchmark("Vector.add_")(binary(vectors, lambda a, b: a.add_(b)))
+benchmark("Vector.subtract_")(binary(vectors, lambda a, b: a.subtract_(b)))
+benchmark("Vector.multiply_")(unary(vectors, lambda a: a.multiply_(1.0)))
+benchmark("Vector.divide_")(unary(vectors, lambda a: a.divide_(1.0)))
+benchmark("Vector.heading")(unary(vectors, lambda a: a.heading()))
+benchmark("Vector.unit")(unary(vectors, lambda a: a.unit()))
+benchmark("Vector.angle_between")(binary(vectors, lambda a, b: a.angle_between(b)))
+benchmark("Vector.as_plt")(unary(vectors, lambda a: a.as_plt()))
+benchmark("Vector.normal")(binary(vectors, lambda a, b: a.normal(b)))
+benchmark("Vector.is_parallel")(binary(vectors, lambda a, b: a.is_parallel(b)))
+benchmark("Vector.is_perpendicular")(binary(vectors, lambda a, b: a.is_perpendicular(b)))
+benchmark("Vector.is_non_parallel")(binary(vectors, lambda a, b: a.is_non_parallel(b)))
+benchmark("Vector.rotate_about")(binary(vectors, lambda a, b: a.rotate_about(b, 30.0)))
+benchmark("Vector.rotate")(unary(vectors, lambda a: a.rotate(alpha=10.0, beta=20.0, gamma=30.0)))
+# Vector operators
+benchmark("Vector.__str__")(unary(vectors, lambda a: str(a)))
+benchmark("Vector.__neg__")(unary(vectors, lambda a: -a))
+benchmark("Vector.__add__")(binary(vectors, lambda a, b: a + b))
+benchmark("Vector.__sub__")(binary(vectors, lambda a, b: a - b))
+benchmark("Vector.__mul__")(binary(vectors, lambda a, b: a * b))
+benchmark("Vector.__rmul__")(unary(vectors, lambda a: 2.0 * a))
+benchmark("Vector.__truediv__")(unary(vectors, lambda a: a / 2.0))
+benchmark("Vector.__eq__")(binary(vectors, lambda a, b: a == b))
+benchmark("Vector.__abs__")(unary(vectors, lambda a: abs(a)))
+
+
+def version() -> str:
+    try:
+        return metadata.version("v3d")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def uncovered() -> list:
+    # Public methods of Point and Vector without a benchmark
+    names = {name.split("(")[0] for name in BENCHMARKS}
+    missing = []
+    for cls in (Point, Vector):
+        for name in dir(cls):
+            if not name.startswith("_") and callable(getattr(cls, name)) and f"{cls.__name__}.{name}" not in names:
+                missing.append(f"{cls.__name__}.{name}")
+
+    return missing
+
+
+def measure(builder, size: int, repeat: int, min_time: float) -> float:
+    # Returns the best time of one operation in seconds
+    function = builder(size)
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number / size
+
+
+def meta() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "v3d": version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write(path: str, results: dict) -> None:
+    with open(path, "w") as f:
+        json.dump({"meta": meta(), "results": results}, f, indent=2)
+
+
+def run(args) -> None:
+    missing = uncovered()
+    if missing:
+        print(f"Warning: no benchmark for {', '.join(missing)}", file=sys.stderr)
+
+    results = {}
+    for name, builder in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        for size in args.sizes:
+            seconds = measure(builder, size, args.repeat, args.min_time)
+            results[f"{name}[{size}]"] = {"name": name, "size": size, "seconds_per_op": seconds}
+            print(f"{name:<32}{size:>8}{seconds * 1e6:>12.3f} us/op")
+
+    write(args.output, results)
+
+
+# ParallelMap operations timed by scaling: name, whether they run on vectors, arguments and keyword arguments.
+# rotate has no batched method, so it calls Vector.rotate on each vector in the workers
+SCALING = [
+    ("dist", False, (), {}),
+    ("heading", True, (), {}),
+    ("angle_between", True, (Vector(Point(3.0, 1.0, 4.0)),), {}),
+    ("rotate", True, (), {"alpha": 10.0, "beta": 20.0, "gamma": 30.0}),
+]
+
+
+def scaling(args) -> None:
+    data = np.random.default_rng(0).random((args.size, 3)) + 0.1
+    points, vectors = PointArray(data), VectorArray(data)
+    results = {}
+    baseline = {}
+    for workers in args.workers:
+        with ParallelMap(workers=workers) as pm:
+            # Start the worker processes before timing
+            pm.map("dist", points)
+            for name, on_vectors, arguments, keywords in SCALING:
+                inputs = vectors if on_vectors else points
+                timer = timeit.Timer(lambda: pm.map(name, inputs, *arguments, **keywords))
+                seconds = min(timer.repeat(repeat=args.repeat, number=1)) / args.size
+                baseline.setdefault(name, seconds)
+                key = f"ParallelMap.{name}(workers={workers})"
+                results[f"{key}[{args.size}]"] = {"name": key, "size": args.size, "workers": workers,
+                                                  "seconds_per_op": seconds}
+                speedup = baseline[name] / seconds
+                print(f"{key:<40}{seconds * 1e6:>12.3f} us/op{speedup:>8.2f}x")
+
+    write(args.output, results)
+
+
+def compare(args) -> int:
+    with open(args.old) as f:
+        old = json.load(f)["results"]
+
+    with open(args.new) as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<42}{'old (us)':>12}{'new (us)':>12}{'ratio':>10}")
+    for key in sorted(set(old) & set(new)):
+        old_time = old[key]["seconds_per_op"]
+        new_time = new[key]["seconds_per_op"]
+        ratio = new_time / old_time if old_time > 0 else math.inf
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            flag = "  faster"
+
+        print(f"{key:<42}{old_time * 1e6:>12.3f}{new_time * 1e6:>12.3f}{ratio:>10.2f}{flag}")
+
+    for key in sorted(set(old) - set(new)):
+        print(f"{key:<42} only in {args.old}")
+
+    for key in sorted(set(new) - set(old)):
+        print(f"{key:<42} only in {args.new}")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write the results as JSON")
+    run_parser.add_argument("-o", "--output", default="bench_results.json", help="Result file")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10000], help="Input sizes")
+    run_parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Measurements per benchmark. The best is kept")
+    run_parser.add_argument("--min-time", type=float, default=0.01, help="Minimum seconds per measurement")
+
+    scaling_parser = commands.add_parser("scaling", help="Run ParallelMap over several worker counts")
+    scaling_parser.add_argument("-o", "--output", default="bench_scaling.json", help="Result file")
+    scaling_parser.add_argument("--size", type=int, default=1000000, help="Input size")
+    scaling_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts")
+    scaling_parser.add_argument("--repeat", type=int, default=3, help="Measurements per benchmark. The best is kept")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("old", help="Baseline result file")
+    compare_parser.add_argument("new", help="Result file to check")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="Relative slowdown reported as a regression. 0.1 is 10%%")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+
+    if args.command == "scaling":
+        scaling(args)
+        return 0
+
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
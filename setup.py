@@ -15,7 +15,7 @@ setup(
     packages=find_packages(exclude=["example.ipynb"]),
     long_description=long_description,
     long_description_content_type="text/markdown",
-    install_requires=[],
+    install_requires=['numpy>=1.23'],
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.6",
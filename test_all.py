@@ -1,5 +1,17 @@
+import logging
+import math
+import os
+import pickle
+import tempfile
 import unittest
-from v3d import Point, Vector
+import numpy as np
+
+import v3d
+from v3d import Point, Vector, PointArray, VectorArray, Rotation, Quaternion, KDTree, PointSet
+from v3d import PointFile, PointFileWriter, XYZReader, XYZWriter, CSVReader, CSVWriter, PLYReader, PLYWriter
+from v3d import ParallelMap, FrozenPoint, FrozenVector, Transform, AABB, BoundingSphere, TriangleMesh
+from v3d import Ray, Plane, Sphere, Triangle, BVH, RayArray
+from v3d import Distances, PointStatistics
 
 
 class TestPoint(unittest.TestCase):
@@ -35,6 +47,8 @@ class TestPoint(unittest.TestCase):
         self.assertAlmostEqual(polar[0], 1.7320508)
         self.assertAlmostEqual(polar[1], 54.7356103)
         self.assertEqual(polar[2], 45)
+        self.assertEqual(p.to_polar(radians=True), (polar[0], math.acos(1 / polar[0]), math.pi / 4))
+        self.assertEqual(Point().to_polar(radians=True), (0, 0, 0))
 
         p = Point(1, 1, 1)
         self.assertEqual(p.scale(2), Point(2, 2, 2))
@@ -60,6 +74,64 @@ class TestPoint(unittest.TestCase):
 
         new_p = Point.from_polar(1.7320508075688772, 54.735610317245346, 45.0)
         self.assertEqual(new_p, Point(1, 1, 1))
+        self.assertEqual(Point.from_polar(*Point(1, 2, 3).to_polar(radians=True), radians=True), Point(1, 2, 3))
+        # Subclasses get instances of themselves, with the logger of the class
+        class SubPoint(Point):
+            __slots__ = ()
+
+        self.assertIsInstance(SubPoint.from_polar(1, 0, 0), SubPoint)
+        self.assertIsInstance(SubPoint._from_xyz(1, 2, 3), SubPoint)
+        self.assertIs(Point.from_polar(1, 0, 0)._logger, Point.logger)
+        self.assertIsInstance(FrozenPoint._from_xyz(1, 2, 3), FrozenPoint)
+
+        class SubVector(Vector):
+            __slots__ = ()
+
+        self.assertIsInstance(SubVector.from_xyz(1, 2, 3), SubVector)
+        self.assertIsInstance(SubVector._from_point(Point(1, 2, 3)), SubVector)
+        self.assertIsInstance(FrozenVector._from_point(Point(1, 2, 3)), FrozenVector)
+        self.assertIsInstance(FrozenVector.from_xyz(1, 2, 3), FrozenVector)
+
+        p = Point(1, 2, 3)
+        p2 = Point(3, 1, 4)
+        p3 = p
+        p3 += p2
+        self.assertIs(p3, p)
+        self.assertEqual(p, Point(4, 3, 7))
+        p3 -= p2
+        self.assertEqual(p, Point(1, 2, 3))
+        p3 *= 2
+        self.assertEqual(p, Point(2, 4, 6))
+        p3 /= 4
+        self.assertEqual(p, Point(2, 4, 6).divide(4))
+        self.assertIs(p.add_(p2).subtract_(p2).scale_(1).divide_(1), p)
+        with self.assertRaises(ValueError):
+            p.add_(1)
+        with self.assertRaises(ValueError):
+            p.divide_(0)
+        self.assertEqual(p, Point(0.5, 1, 1.5))
+
+        p = Point(1, 1, 1)
+        self.assertFalse(hasattr(p, '__dict__'))
+        self.assertIs(p.logger, Point.logger)
+        logger = logging.getLogger('v3d_test')
+        p = Point(1, 1, 1, logger=logger)
+        self.assertIs(p.logger, logger)
+        self.assertIs(p.scale(2).logger, logger)
+
+        # Changing the default keeps the loggers given to instances
+        default = Point.logger
+        try:
+            Point.logger = logging.getLogger('v3d_default')
+            self.assertIs(p.logger, logger)
+            self.assertIs(Point(1, 1, 1).logger, Point.logger)
+            self.assertIs(Point.logger, logging.getLogger('v3d_default'))
+            p.logger = default
+            self.assertIs(p.logger, default)
+            self.assertIs(Vector(Point(), logger=logger).logger, logger)
+        finally:
+            Point.logger = default
+        self.assertIs(Point.logger, default)
 
 
 class TestVector(unittest.TestCase):
@@ -69,6 +141,9 @@ class TestVector(unittest.TestCase):
         self.assertEqual(v.point.y, 1)
         self.assertEqual(v.point.z, 1)
 
+        self.assertFalse(hasattr(v, '__dict__'))
+        self.assertIs(v.logger, Vector.logger)
+
         v2 = Vector(Point(1, 1, 2))
         self.assertEqual(v2.point.x, 1)
         self.assertEqual(v2.point.y, 1)
@@ -124,6 +199,14 @@ class TestVector(unittest.TestCase):
         v = Vector(Point(1, 1, 1))
         v2 = Vector(Point(3, 1, 4))
         self.assertAlmostEqual(v.angle_between(v2), 25.0658292)
+        self.assertAlmostEqual(v.angle_between(v2, radians=True), math.radians(25.0658292))
+        self.assertEqual(v.angle_between(-v), 180)
+        self.assertEqual(v.angle_between(v * 2), 0)
+        self.assertEqual(Vector(Point(1, 0, 0)).angle_between(Vector(Point(0, 1, 0)), radians=True), math.pi / 2)
+        with self.assertRaisesRegex(ValueError, "Point\\(x=0"):
+            Vector(Point()).angle_between(v)
+        with self.assertRaises(ValueError):
+            v.angle_between(Vector(Point()))
 
         v = Vector(Point(1, 1, 1))
         self.assertEqual(v.as_plt(), {'x': [0, 1], 'y': [0, 1], 'z': [0, 1]})
@@ -159,6 +242,1098 @@ class TestVector(unittest.TestCase):
         v = Vector(Point(1, 1, 1))
         self.assertEqual(v.rotate(alpha=180, beta=0, gamma=0), Vector(Point(1, -1, -1)))
 
+        p = Point(1, 1, 1)
+        v = Vector(p)
+        v2 = Vector(Point(3, 1, 4))
+        v3 = v
+        v3 += v2
+        self.assertIs(v3, v)
+        self.assertEqual(v, Vector(Point(4, 2, 5)))
+        self.assertEqual(p, Point(4, 2, 5))
+        v3 -= v2
+        self.assertEqual(v, Vector(Point(1, 1, 1)))
+        v3 *= 2
+        self.assertEqual(v, Vector(Point(2, 2, 2)))
+        v3 *= v2
+        self.assertEqual(v, Vector(Point(2, 2, 2)) * v2)
+        v3 /= 2
+        self.assertEqual(v, (Vector(Point(2, 2, 2)) * v2).divide(2))
+        v3 *= v3
+        self.assertEqual(v, Vector(Point(0, 0, 0)))
+        with self.assertRaises(ValueError):
+            v.divide_(v2)
+        with self.assertRaises(ValueError):
+            v.multiply_("a")
+
+
+class TestPointArray(unittest.TestCase):
+    def test_init(self):
+        points = [Point(1, 1, 1), Point(1, 2, 3), Point(2, 2, 2)]
+        pa = PointArray(points)
+        self.assertEqual(pa.data.shape, (3, 3))
+        self.assertEqual(pa.data.dtype, np.float64)
+        self.assertEqual(pa.to_points(), points)
+        self.assertEqual(pa[1], Point(1, 2, 3))
+        self.assertEqual(len(pa[1:]), 2)
+        self.assertEqual(len(PointArray()), 0)
+        self.assertEqual(len(PointArray.from_points([])), 0)
+        self.assertEqual(PointArray.from_points(Point(i, i, i) for i in range(3))[2], Point(2, 2, 2))
+        self.assertEqual(len(PointArray.from_points(point for point in [])), 0)
+
+        data = np.zeros((2, 3))
+        self.assertIs(PointArray(data).data, data)
+
+        with self.assertRaises(ValueError):
+            PointArray([[1, 2]])
+
+        other = Point(1, 2, 3)
+        pa2 = PointArray([Point(3, 1, 4), Point(0, 0, 0), Point(1, 1, 1)])
+        for i, point in enumerate(points):
+            self.assertEqual(pa.add(other)[i], point.add(other))
+            self.assertEqual((pa + pa2)[i], point + pa2[i])
+            self.assertEqual(pa.subtract(other)[i], point.subtract(other))
+            self.assertEqual(pa.scale(2)[i], point.scale(2))
+            self.assertEqual(pa.divide(2)[i], point.divide(2))
+            self.assertEqual(pa.dist()[i], point.dist())
+            self.assertEqual(pa.dist(pa2)[i], point.dist(pa2[i]))
+
+        self.assertEqual(pa.scale([1, 2, 3])[2], Point(6, 6, 6))
+        # numpy scalars, such as the results of reductions, are scalars too
+        self.assertTrue(np.array_equal(pa.scale(np.int64(2)).data, pa.scale(2).data))
+        self.assertTrue(np.array_equal(pa.divide(np.float32(2)).data, pa.divide(2).data))
+        self.assertTrue(np.array_equal(pa.scale(pa.data.max()).data, pa.scale(float(pa.data.max())).data))
+        with self.assertRaises(ValueError):
+            pa.divide(np.int64(0))
+        self.assertEqual(pa.is_same(Point(1, 1, 1)).tolist(), [True, False, False])
+        self.assertEqual((pa == pa.copy()).tolist(), [True, True, True])
+
+        r, theta, phi = pa.to_polar()
+        for i, point in enumerate(points):
+            self.assertEqual(tuple(np.array([r[i], theta[i], phi[i]])), point.to_polar())
+
+        self.assertEqual(PointArray([[0, 0, 0]]).to_polar(), (0, 0, 0))
+        self.assertTrue(np.all(PointArray.from_polar(r, theta, phi) == pa))
+
+        # Batched polar conversion matches the scalar one exactly, in degrees and radians
+        rng = np.random.default_rng(0)
+        catalogue = PointArray(rng.normal(size=(1000, 3)) * rng.choice([0.001, 1, 100000], size=(1000, 1)))
+        catalogue.data[0] = 0
+        for radians in (False, True):
+            r, theta, phi = catalogue.to_polar(radians=radians)
+            cartesian = PointArray.from_polar(r, theta, phi, radians=radians).data
+            for i, point in enumerate(catalogue):
+                self.assertEqual((r[i], theta[i], phi[i]), point.to_polar(radians=radians))
+                point = Point.from_polar(float(r[i]), float(theta[i]), float(phi[i]), radians=radians)
+                self.assertEqual(tuple(cartesian[i]), (point.x, point.y, point.z))
+
+            fast = catalogue.to_polar(radians=radians, exact=False)
+            self.assertTrue(np.allclose(fast, (r, theta, phi)))
+
+        with self.assertRaises(ValueError):
+            pa.add(1)
+
+        with self.assertRaises(ValueError):
+            pa.divide(0)
+
+        with self.assertRaises(ValueError):
+            pa.add(PointArray([[1, 1, 1], [1, 1, 1]]))
+
+
+class TestVectorArray(unittest.TestCase):
+    def test_init(self):
+        vectors = [Vector(Point(1, 1, 1)), Vector(Point(3, 1, 4)), Vector(Point(1, 0, 0))]
+        va = VectorArray(vectors)
+        self.assertEqual(va.to_vectors(), vectors)
+        self.assertEqual(va[1], Vector(Point(3, 1, 4)))
+        self.assertEqual(len(VectorArray.from_vectors([])), 0)
+        self.assertTrue(np.all(
+            VectorArray.from_points(PointArray([[1, 1, 1]]), Point(2, 2, 3)) == Vector(Point(-1, -1, -2))
+        ))
+
+        other = Vector(Point(1, 2, 0))
+        va2 = VectorArray([[0, 1, 2], [1, 1, 0], [2, 0, 1]])
+        for i, vector in enumerate(vectors):
+            self.assertEqual(va.dot(other)[i], vector.dot(other))
+            self.assertEqual(va.dot(va2)[i], vector.dot(va2[i]))
+            self.assertEqual(va.multiply(other)[i], vector.multiply(other))
+            self.assertEqual((va * va2)[i], vector * va2[i])
+            self.assertEqual(va.multiply(2)[i], vector.multiply(2))
+            self.assertEqual(va.divide(2)[i], vector.divide(2))
+            self.assertEqual(va.add(other)[i], vector.add(other))
+            self.assertEqual(va.subtract(other)[i], vector.subtract(other))
+            self.assertEqual(va.mag()[i], vector.mag())
+            self.assertEqual(va.unit()[i], vector.unit())
+            self.assertAlmostEqual(va.heading()[0][i], vector.heading()[0])
+            self.assertAlmostEqual(va.heading()[1][i], vector.heading()[1])
+            self.assertAlmostEqual(va.angle_between(other)[i], vector.angle_between(other))
+            self.assertEqual(va.normal(other)[i], vector.normal(other))
+
+        self.assertTrue(np.allclose(va.angle_between(other, radians=True), np.radians(va.angle_between(other))))
+        angles = va.angle_between(va2, all_pairs=True)
+        self.assertEqual(angles.shape, (3, 3))
+        for i, vector in enumerate(vectors):
+            for j, vector2 in enumerate(va2):
+                self.assertAlmostEqual(angles[i, j], vector.angle_between(vector2))
+                self.assertEqual(va.dot(va2, all_pairs=True)[i, j], vector.dot(vector2))
+
+        va3 = va.copy()
+        va3 += va2
+        va3 -= other
+        va3 *= 2
+        va3 *= other
+        va3 /= [1, 2, 4]
+        for i, vector in enumerate(vectors):
+            self.assertEqual(va3[i], ((vector + va2[i] - other) * 2 * other).divide([1, 2, 4][i]))
+
+        pa = PointArray([[1, 2, 3], [4, 5, 6]])
+        data = pa.data
+        pa += Point(1, 1, 1)
+        pa -= PointArray([[1, 1, 1], [2, 2, 2]])
+        pa *= 2
+        pa /= 2
+        self.assertIs(pa.data, data)
+        self.assertEqual(pa.to_points(), [Point(1, 2, 3), Point(3, 4, 5)])
+
+        zero = VectorArray([[1, 1, 1], [0, 0, 0]])
+        with self.assertRaises(ValueError):
+            zero.angle_between(other)
+        with self.assertRaises(ValueError):
+            va.angle_between(Vector(Point()))
+        # Nearly zero vectors are rejected with the same error as Vector.angle_between
+        tiny, up = Vector(Point(1e-5, 0.0, 0.0)), Vector(Point(1, 1, 0))
+        with self.assertRaises(ValueError) as scalar:
+            tiny.angle_between(up)
+        with self.assertRaises(ValueError) as batched:
+            VectorArray([[1e-5, 0, 0]]).angle_between(up)
+        self.assertEqual(str(batched.exception), str(scalar.exception))
+        with self.assertRaises(ValueError) as batched:
+            VectorArray([[1, 1, 0]]).angle_between(tiny)
+        self.assertEqual(str(batched.exception), str(scalar.exception))
+        with self.assertRaises(ValueError):
+            zero.unit()
+        with self.assertRaises(ZeroDivisionError):
+            zero.heading()
+        with self.assertRaises(ValueError):
+            va.dot(Point(1, 1, 1))
+        with self.assertRaises(ValueError):
+            va.multiply("a")
+        with self.assertRaises(ValueError):
+            va.divide(other)
+
+
+class TestRotation(unittest.TestCase):
+    def test_init(self):
+        vectors = [Vector(Point(1, 1, 1)), Vector(Point(3, 1, 4)), Vector(Point(-1, 0, 2))]
+        va = VectorArray(vectors)
+
+        r = Rotation.from_euler(alpha=30, beta=40, gamma=50)
+        rotated = r.apply(va)
+        for i, vector in enumerate(vectors):
+            expected = vector.rotate(alpha=30, beta=40, gamma=50)
+            self.assertEqual(r.apply(vector), expected)
+            self.assertEqual(r.apply(vector.point), expected.point)
+            self.assertEqual(rotated[i], expected)
+
+        axis = Vector(Point(0, 1, 0))
+        r = Rotation.from_axis_angle(axis * 3, 90)
+        for vector in vectors:
+            self.assertEqual(r.apply(vector), vector.rotate_about(axis, 90))
+
+        r = Rotation.from_quaternion(0, 1, 0, 0)
+        self.assertEqual(r.apply(Vector(Point(1, 1, 1))), Vector(Point(1, -1, -1)))
+        self.assertEqual(r.apply(Vector(Point(1, 1, 1))), Vector(Point(1, 1, 1)).rotate(alpha=180))
+
+        r = Rotation.from_euler(gamma=30) * Rotation.from_euler(alpha=20)
+        for vector in vectors:
+            self.assertEqual(r.apply(vector), vector.rotate(alpha=20).rotate(gamma=30))
+            self.assertEqual(r.inverse().apply(r.apply(vector)), vector)
+
+        data = np.array([[1.0, 2.0, 3.0]])
+        self.assertTrue(np.allclose(Rotation().apply(data), data))
+        self.assertIsInstance(Rotation().apply(PointArray(data)), PointArray)
+
+        with self.assertRaises(ValueError):
+            r.apply(1)
+        with self.assertRaises(ValueError):
+            Rotation.from_euler(alpha="a")
+        with self.assertRaises(ValueError):
+            Rotation.from_axis_angle(Vector(Point()), 90)
+        with self.assertRaises(ValueError):
+            Rotation.from_quaternion(0, 0, 0, 0)
+        with self.assertRaises(ValueError):
+            Rotation([[1, 0], [0, 1]])
+
+
+class TestQuaternion(unittest.TestCase):
+    def test_init(self):
+        vectors = [Vector(Point(1, 1, 1)), Vector(Point(3, 1, 4)), Vector(Point(-1, 0, 2))]
+        axis = Vector(Point(1, 2, 2)).unit()
+
+        q = Quaternion.from_axis_angle(axis, 70)
+        for vector in vectors:
+            self.assertEqual(q.rotate(vector), vector.rotate_about(axis, 70))
+
+        q = Quaternion.from_euler(alpha=30, beta=40, gamma=50)
+        rotated = q.rotate(VectorArray(vectors))
+        for i, vector in enumerate(vectors):
+            self.assertEqual(q.rotate(vector), vector.rotate(alpha=30, beta=40, gamma=50))
+            self.assertEqual(rotated[i], vector.rotate(alpha=30, beta=40, gamma=50))
+
+        for angles in [(30, 40, 50), (-120, 10, 170), (10, 90, 0)]:
+            euler = Quaternion.from_euler(*angles).to_euler()
+            for angle, expected in zip(euler, angles):
+                self.assertAlmostEqual(angle, expected)
+
+        self.assertEqual(Quaternion.from_matrix(q.to_matrix()), q)
+        self.assertEqual(Quaternion.from_matrix(q.to_rotation()), q)
+        for angles in [(180, 0, 0), (0, 180, 0), (0, 0, 180), (10, 170, 20)]:
+            q2 = Quaternion.from_euler(*angles)
+            q3 = Quaternion.from_matrix(q2.to_matrix())
+            self.assertTrue(q3 == q2 or q3 == -q2)
+
+        q2 = Quaternion.from_euler(gamma=30)
+        composed = q2 * q
+        for vector in vectors:
+            self.assertEqual(composed.rotate(vector), q2.rotate(q.rotate(vector)))
+            self.assertEqual((q.inverse() * q).rotate(vector), vector)
+
+        v = Vector(Point(1, 2, 3))
+        theta, phi = Quaternion.from_heading(*v.heading()).heading()
+        self.assertAlmostEqual(theta, v.heading()[0])
+        self.assertAlmostEqual(phi, v.heading()[1])
+
+        start = Quaternion()
+        end = Quaternion.from_axis_angle(axis, 120)
+        self.assertEqual(start.slerp(end, 0), start)
+        self.assertEqual(start.slerp(end, 1), end)
+        self.assertEqual(start.slerp(end, 0.25), Quaternion.from_axis_angle(axis, 30))
+        self.assertEqual(start.slerp(-end, 0.25), Quaternion.from_axis_angle(axis, 30))
+
+        self.assertAlmostEqual(Quaternion(1, 1, 1, 1).unit().norm(), 1)
+        with self.assertRaises(ValueError):
+            Quaternion(0, 0, 0, 0).unit()
+        with self.assertRaises(ValueError):
+            q.multiply(v)
+        with self.assertRaises(ValueError):
+            Quaternion.from_axis_angle(Vector(Point()), 10)
+
+
+class TestKDTree(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(0)
+        points = [Point(*xyz) for xyz in rng.random((500, 3)).tolist()]
+        tree = KDTree(points, leaf_size=8)
+        self.assertEqual(len(tree), 500)
+
+        query = Point(0.5, 0.5, 0.5)
+        expected = sorted(range(len(points)), key=lambda i: points[i].dist(query))
+        distances, indices = tree.query(query, k=10)
+        self.assertEqual(indices.tolist(), expected[:10])
+        self.assertEqual(distances.tolist(), [points[i].dist(query) for i in expected[:10]])
+
+        queries = PointArray(rng.random((20, 3)))
+        distances, indices = tree.query(queries, k=3)
+        self.assertEqual(indices.shape, (20, 3))
+        for i, query in enumerate(queries):
+            expected = sorted(range(len(points)), key=lambda j: points[j].dist(query))
+            self.assertEqual(indices[i].tolist(), expected[:3])
+
+        within = [i for i, point in enumerate(points) if point.dist(query) <= 0.2]
+        self.assertEqual(tree.query_radius(query, 0.2).tolist(), within)
+        self.assertEqual(tree.query_radius(queries, 0.2)[-1].tolist(), within)
+
+        low, high = Point(0.1, 0.2, 0.3), Point(0.5, 0.6, 0.7)
+        inside = [i for i, p in enumerate(points)
+                  if low.x <= p.x <= high.x and low.y <= p.y <= high.y and low.z <= p.z <= high.z]
+        self.assertEqual(tree.query_box(low, high).tolist(), inside)
+
+        index = tree.insert(Point(0.5, 0.5, 0.5))
+        self.assertEqual(index, 500)
+        self.assertEqual(tree.query(Point(0.5, 0.5, 0.5))[1].tolist(), [500])
+        tree.delete(500)
+        self.assertNotEqual(tree.query(Point(0.5, 0.5, 0.5))[1].tolist(), [500])
+
+        new = tree.insert(rng.random((200, 3)))
+        self.assertEqual(new.tolist(), list(range(501, 701)))
+        tree.delete(range(0, 500))
+        self.assertEqual(len(tree), 200)
+        self.assertTrue(set(tree.query(query, k=200)[1].tolist()) == set(new.tolist()))
+
+        # A tree without points finds no neighbours
+        tree.delete(new)
+        self.assertEqual(len(tree), 0)
+        distances, indices = tree.query(query, k=3)
+        self.assertEqual((distances.shape, indices.shape), ((0,), (0,)))
+        distances, indices = tree.query(queries, k=3)
+        self.assertEqual((distances.shape, indices.shape), ((20, 0), (20, 0)))
+        self.assertEqual(KDTree([]).query(query)[1].shape, (0,))
+
+        with self.assertRaises(ValueError):
+            tree.delete(0)
+        with self.assertRaises(ValueError):
+            tree.query(query, k=0)
+        with self.assertRaises(ValueError):
+            tree.query("a")
+
+
+class TestPointSet(unittest.TestCase):
+    def test_init(self):
+        self.assertEqual(Point(1, 2, 3).grid_key(), Point(1.00001, 2, 3).grid_key())
+        self.assertNotEqual(Point(1, 2, 3).grid_key(), Point(1.0001, 2, 3).grid_key())
+        self.assertEqual(Vector(Point(1, 2, 3)).grid_key(), Point(1, 2, 3).grid_key())
+        self.assertEqual({Point(1, 2, 3).grid_key(): 1}[Point(1, 2, 3).grid_key()], 1)
+        self.assertEqual(PointArray([[1, 2, 3]]).grid_keys().tolist(), [list(Point(1, 2, 3).grid_key())])
+        with self.assertRaises(ValueError):
+            Point().grid_key(0)
+
+        rng = np.random.default_rng(0)
+        data = rng.random((300, 3))
+        # Near copies that straddle grid cells
+        noisy = np.concatenate([data, data + rng.uniform(-0.00009, 0.00009, data.shape)])
+        unique, inverse = PointSet.weld(noisy)
+        self.assertEqual(len(unique), 300)
+        for point, index in zip(PointArray(noisy), inverse):
+            self.assertTrue(point.is_same(unique[int(index)]))
+
+        ps = PointSet(unique)
+        self.assertEqual(len(ps), 300)
+        self.assertIn(Point(*noisy[-1]), ps)
+        self.assertIn(Vector(Point(*noisy[-1])), ps)
+        self.assertNotIn(Point(2, 2, 2), ps)
+        self.assertEqual(ps.add(Point(2, 2, 2)), 300)
+        self.assertEqual(ps.add(Point(2, 2, 2.00005)), 300)
+        self.assertEqual(ps.index(Point(*data[5])), 5)
+        self.assertEqual(len(list(ps)), 301)
+
+        with self.assertRaises(ValueError):
+            PointSet(tolerance=0)
+        with self.assertRaises(ValueError):
+            ps.add(1)
+
+
+class TestPointFile(unittest.TestCase):
+    def test_init(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "cloud.v3d")
+        data = np.random.default_rng(0).random((1000, 3))
+        PointFile.write(path, data)
+        self.assertEqual(os.path.getsize(path), 64 + 1000 * 3 * 8)
+
+        pf = PointFile(path)
+        self.assertEqual(len(pf), 1000)
+        self.assertEqual(pf.kind, "points")
+        self.assertIsInstance(pf.data, np.memmap)
+        self.assertEqual(pf[5], Point(*data[5]))
+        self.assertTrue(np.array_equal(pf[10:20].data, data[10:20]))
+        # float64 rows are not copied out of the memory map
+        self.assertTrue(np.shares_memory(pf.to_array().data, pf.data))
+        self.assertEqual(len(list(pf)), 1000)
+        with self.assertRaises(ValueError):
+            pf.to_array().data[0] = 0
+        pf.close()
+
+        with PointFile(path, mode="r+") as pf:
+            pf.to_array().add_(Point(1, 1, 1))
+        self.assertEqual(PointFile(path)[0], Point(*data[0] + 1))
+
+        vectors = [Vector(Point(1, 2, 3)), Vector(Point(4, 5, 6))]
+        PointFile.write(path, vectors, dtype="float32")
+        pf = PointFile(path)
+        self.assertEqual(pf.kind, "vectors")
+        self.assertEqual(pf.dtype, np.float32)
+        self.assertEqual(pf[1], vectors[1])
+        self.assertEqual(pf.to_array().to_vectors(), vectors)
+
+        with PointFileWriter(path, kind="vectors") as writer:
+            for start in range(0, 1000, 300):
+                writer.append(VectorArray(data[start:start + 300]))
+        pf = PointFile(path)
+        self.assertEqual(len(pf), 1000)
+        self.assertTrue(np.array_equal(pf.to_array().data, data))
+
+        PointFile.write(path, [])
+        self.assertEqual(len(PointFile(path)), 0)
+
+        with open(path, "wb") as f:
+            f.write(b"x, y, z")
+        with self.assertRaises(ValueError):
+            PointFile(path)
+        with self.assertRaises(ValueError):
+            PointFileWriter(path, dtype="int32")
+        with self.assertRaises(ValueError):
+            PointFileWriter(path, kind="lines")
+
+
+class TestFormats(unittest.TestCase):
+    def test_init(self):
+        directory = tempfile.mkdtemp()
+        data = np.random.default_rng(0).normal(size=(1000, 3))
+        chunks = [data[start:start + 300] for start in range(0, 1000, 300)]
+
+        for name, writer, reader in (("cloud.xyz", XYZWriter, XYZReader), ("cloud.csv", CSVWriter, CSVReader),
+                                     ("cloud.ply", PLYWriter, PLYReader)):
+            path = os.path.join(directory, name)
+            writer.write(path, chunks)
+            read = list(reader(path, chunk_size=256))
+            self.assertEqual([len(chunk) for chunk in read], [256, 256, 256, 232])
+            self.assertTrue(np.array_equal(reader(path).to_array().data, data))
+            points = next(reader(path, chunk_size=2).read(as_points=True))
+            self.assertEqual(points, [Point(*data[0]), Point(*data[1])])
+
+        path = os.path.join(directory, "cloud.ply")
+        PLYWriter.write(path, PointArray(data), binary=False)
+        self.assertEqual(PLYReader(path).format, "ascii")
+        self.assertTrue(np.array_equal(PLYReader(path).to_array().data, data))
+        PLYWriter.write(path, data, dtype="float32")
+        self.assertTrue(np.array_equal(PLYReader(path).to_array().data, data.astype(np.float32)))
+
+        # Vertex properties other than x, y and z, and elements before and after the vertices
+        with open(path, "wb") as f:
+            f.write(b"ply\nformat binary_big_endian 1.0\ncomment test\nelement camera 1\nproperty int id\n"
+                    b"element vertex 2\nproperty uchar red\nproperty float z\nproperty float y\nproperty float x\n"
+                    b"element face 0\nproperty list uchar int vertex_indices\nend_header\n")
+            np.array([7], dtype=">i4").tofile(f)
+            np.array([(255, 3, 2, 1), (0, 6, 5, 4)],
+                     dtype=[("r", "u1"), ("z", ">f4"), ("y", ">f4"), ("x", ">f4")]).tofile(f)
+        self.assertEqual(PLYReader(path).to_array().to_points(), [Point(1, 2, 3), Point(4, 5, 6)])
+
+        with open(path, "w") as f:
+            f.write("ply\nformat ascii 1.0\nelement vertex 2\nproperty float x\nproperty float y\n"
+                    "property float z\nproperty uchar red\nelement face 1\nproperty list uchar int vertex_indices\n"
+                    "end_header\n1 2 3 255\n4 5 6 0\n3 0 1 1\n")
+        self.assertEqual(PLYReader(path).to_array().to_points(), [Point(1, 2, 3), Point(4, 5, 6)])
+
+        path = os.path.join(directory, "stars.csv")
+        with open(path, "w") as f:
+            f.write('name;dec;ra;dist\n"a";2;1;3\n"b";5;4;6\n')
+        self.assertEqual(CSVReader(path, columns=("ra", "dec", "dist"), delimiter=";").to_array().to_points(),
+                         [Point(1, 2, 3), Point(4, 5, 6)])
+        with open(path, "w") as f:
+            f.write('"a";2;1;3\n"b";5;4;6\n')
+        self.assertEqual(CSVReader(path, columns=(2, 1, 3), delimiter=";", header=False).to_array().to_points(),
+                         [Point(1, 2, 3), Point(4, 5, 6)])
+        with self.assertRaises(ValueError):
+            CSVReader(path, columns=("ra", "dec", "parallax"), delimiter=";").to_array()
+        with self.assertRaises(ValueError):
+            CSVReader(path, columns=("ra", "dec", "dist"), header=False)
+        with self.assertRaises(ValueError):
+            CSVReader(path, columns=("ra", "dec"))
+
+        path = os.path.join(directory, "cloud.xyz")
+        with open(path, "w") as f:
+            f.write("# x y z intensity\n1 2 3 0.5\n\n4 5 6 0.1\n")
+        self.assertEqual(XYZReader(path).to_array().to_points(), [Point(1, 2, 3), Point(4, 5, 6)])
+        with open(path, "w") as f:
+            f.write("1 2 a\n")
+        with self.assertRaises(ValueError):
+            XYZReader(path).to_array()
+        with self.assertRaises(ValueError):
+            PLYReader(path)
+        with self.assertRaises(ValueError):
+            XYZReader(path, chunk_size=0)
+
+
+def shifted_mag(vectors, shift):
+    # Module level, so worker processes can unpickle it
+    return (vectors + shift).mag()
+
+
+class TestParallelMap(unittest.TestCase):
+    def test_init(self):
+        data = np.random.default_rng(0).normal(size=(500, 3))
+        vectors = VectorArray(data).to_vectors()
+        points = PointArray(data).to_points()
+        other = Vector(Point(3, 1, 4))
+        for workers in (1, 3):
+            with ParallelMap(workers=workers) as pm:
+                self.assertEqual(pm.map("dist", points).tolist(), [point.dist() for point in points])
+                theta, phi = pm.map("heading", vectors)
+                self.assertTrue(np.allclose(np.column_stack([theta, phi]), [vector.heading() for vector in vectors]))
+                self.assertTrue(np.allclose(pm.map("angle_between", vectors, other),
+                                            [vector.angle_between(other) for vector in vectors]))
+                rotated = pm.map("rotate", vectors, alpha=10, beta=20, gamma=30)
+                self.assertIsInstance(rotated, VectorArray)
+                self.assertEqual([tuple(row) for row in rotated.data.tolist()],
+                                 [(v.point.x, v.point.y, v.point.z)
+                                  for v in (vector.rotate(alpha=10, beta=20, gamma=30) for vector in vectors)])
+                self.assertEqual(pm.map("is_parallel", vectors, other).tolist(),
+                                 [vector.is_parallel(other) for vector in vectors])
+                self.assertTrue(np.array_equal(pm.map(shifted_mag, vectors, other),
+                                               (VectorArray(data) + other).mag()))
+                with self.assertRaises(ValueError):
+                    pm.map("dist", [])
+
+        with self.assertRaises(ValueError):
+            ParallelMap(workers=0)
+
+
+class TestFrozen(unittest.TestCase):
+    def test_init(self):
+        p = Point(1, 2, 3)
+        fp = FrozenPoint.freeze(p)
+        self.assertIsInstance(fp, Point)
+        self.assertEqual(hash(fp), hash(FrozenPoint(1, 2, 3)))
+        self.assertEqual({fp: 1}[FrozenPoint(1.0, 2.0, 3.0)], 1)
+        # Frozen values compare exactly
+        self.assertNotEqual(fp, FrozenPoint(1, 2, 3.00001))
+        self.assertTrue(fp.is_same(FrozenPoint(1, 2, 3.00001)))
+        # A Point and a FrozenPoint compare with tolerance, both ways
+        self.assertEqual(Point(1, 2, 3), FrozenPoint(1, 2, 3.00001))
+        self.assertEqual(FrozenPoint(1, 2, 3.00001), Point(1, 2, 3))
+        self.assertNotEqual(Point(1, 2, 3), FrozenPoint(1, 2, 3.1))
+        self.assertEqual(fp + p, Point(2, 4, 6))
+        with self.assertRaises(AttributeError):
+            fp.x = 2
+        with self.assertRaises(AttributeError):
+            fp.add_(p)
+        fp2 = fp
+        fp2 += p
+        self.assertIsInstance(fp2, FrozenPoint)
+        self.assertEqual(fp2, FrozenPoint(2, 4, 6))
+        self.assertEqual(fp, FrozenPoint(1, 2, 3))
+        self.assertIs(FrozenPoint.freeze(fp), fp)
+
+        v = Vector(Point(1, 1, 1))
+        fv = FrozenVector.freeze(v)
+        self.assertIsInstance(fv.point, FrozenPoint)
+        # The Point is copied. Changing it does not change the frozen vector
+        v += v
+        self.assertEqual(fv, FrozenVector(Point(1, 1, 1)))
+        self.assertEqual(fv.mag(), Vector(Point(1, 1, 1)).mag())
+        self.assertEqual(fv.unit(), Vector(Point(1, 1, 1)).unit())
+        self.assertIs(fv.unit(), fv.unit())
+        self.assertIsInstance(fv.unit(), FrozenVector)
+        self.assertEqual(fv.heading(), Vector(Point(1, 1, 1)).heading())
+        self.assertIs(fv.heading(), fv.heading())
+        other = Vector(Point(3, 1, 4))
+        self.assertEqual(fv.angle_between(other), Vector(Point(1, 1, 1)).angle_between(other))
+        self.assertEqual(len({fv, FrozenVector(Point(1, 1, 1)), FrozenVector(Point(1, 1, 2))}), 2)
+        self.assertNotEqual(hash(fv), hash(fv.point))
+        # is_same has tolerance between FrozenVectors too. == is exact only between FrozenVectors
+        close = FrozenVector(Point(1, 1, 1.00001))
+        self.assertTrue(fv.is_same(close))
+        self.assertEqual(fv.is_same(close), Vector(Point(1, 1, 1)).is_same(Vector(Point(1, 1, 1.00001))))
+        self.assertNotEqual(fv, close)
+        self.assertEqual(Vector(Point(1, 1, 1)), close)
+        self.assertEqual(close, Vector(Point(1, 1, 1)))
+        self.assertTrue(Vector(Point(1, 1, 1)).is_same(close))
+        with self.assertRaises(AttributeError):
+            fv.point = Point()
+        with self.assertRaises(AttributeError):
+            fv.point.x = 2
+        with self.assertRaises(AttributeError):
+            fv *= 2
+            fv.multiply_(2)
+        self.assertEqual(fv, FrozenVector(Point(2, 2, 2)))
+        self.assertEqual(pickle.loads(pickle.dumps(fv)), fv)
+        self.assertEqual(FrozenVector.from_points(Point(1, 1, 1), Point()), fv / 2)
+
+
+class TestTransform(unittest.TestCase):
+    def test_init(self):
+        points = [Point(1, 2, 3), Point(-1, 0.5, 2), Point(0, 0, 0)]
+        offset = Point(1, -2, 0.5)
+        axis = Vector(Point(0, 0, 1))
+        t = Transform().translate(offset).rotate(alpha=10, beta=20, gamma=30).scale(2).rotate_about(axis, 45)
+        for point in points:
+            expected = Vector(point + offset).rotate(alpha=10, beta=20, gamma=30).multiply(2).rotate_about(axis, 45)
+            self.assertEqual(t.apply(point), expected.point)
+            self.assertEqual(t.inverse().apply(t.apply(point)), point)
+
+        batch = t.apply(PointArray(points))
+        self.assertIsInstance(batch, PointArray)
+        for i, point in enumerate(points):
+            self.assertEqual(batch[i], t.apply(point))
+
+        # Vectors are not translated
+        vector = Vector(Point(1, 2, 3))
+        self.assertEqual(Transform.from_translation(offset).apply(vector), vector)
+        self.assertEqual(t.apply(vector), Vector(Point(1, 2, 3)).rotate(alpha=10, beta=20, gamma=30).multiply(2)
+                         .rotate_about(axis, 45))
+        self.assertEqual(t.apply(VectorArray([vector]))[0], t.apply(vector))
+
+        self.assertEqual(Transform.from_rotation(Quaternion.from_euler(gamma=90)).apply(Point(1, 0, 0)), Point(0, 1, 0))
+        self.assertEqual((Transform.from_scale(2) * Transform.from_translation((1, 0, 0))).apply(Point()),
+                         Point(2, 0, 0))
+        self.assertTrue(np.allclose((t * t.inverse()).matrix, np.eye(4)))
+        with self.assertRaises(ValueError):
+            t.matrix[0, 0] = 1
+        with self.assertRaises(ValueError):
+            Transform.from_scale(0).inverse()
+        with self.assertRaises(ValueError):
+            Transform(np.ones((4, 4)))
+        with self.assertRaises(ValueError):
+            Transform.from_translation(1)
+        with self.assertRaises(ValueError):
+            t.apply(1)
+
+
+class TestFastConstructors(unittest.TestCase):
+    def test_init(self):
+        logger = logging.getLogger('fast')
+        v = Vector.from_xyz(1, 2, 3, logger=logger)
+        self.assertEqual(v, Vector(Point(1, 2, 3)))
+        self.assertIs(v.logger, logger)
+        self.assertIs(v.point.logger, logger)
+        self.assertIs(Vector.from_xyz(1, 2, 3).logger, Vector.logger)
+
+        self.assertEqual(Point.from_sequence(np.array([1.5, 2, 3])), Point(1.5, 2, 3))
+        self.assertEqual(Vector.from_sequence([1, 2, 3]), v)
+        self.assertIsInstance(FrozenPoint.from_sequence((1, 2, 3)), FrozenPoint)
+        self.assertIsInstance(FrozenVector.from_sequence((1, 2, 3)), FrozenVector)
+        self.assertIsInstance(FrozenVector.from_xyz(1, 2, 3), FrozenVector)
+        with self.assertRaises(ValueError):
+            Point.from_sequence((1, 2))
+        with self.assertRaises(ValueError):
+            Vector.from_sequence(1)
+
+        # Results keep the logger of the operand
+        p = Point(1, 2, 3, logger=logger)
+        for result in (-p, p.copy(), p * 2, p + p, p - p, p / 2):
+            self.assertIs(result.logger, logger)
+        for result in (-v, v.copy(), v * 2, v * v, v + v, v.unit(), v.rotate(alpha=30)):
+            self.assertIs(result.logger, logger)
+
+        # Same values as the rotation written with a Vector for each axis
+        rotated = Vector(Point(1, 1, 1)).rotate(alpha=30, beta=45, gamma=60)
+        step = Vector(Point(1, 1, 1)).rotate(alpha=30).rotate(beta=45).rotate(gamma=60)
+        self.assertEqual((rotated.point.x, rotated.point.y, rotated.point.z), (step.point.x, step.point.y, step.point.z))
+
+
+class TestPredicates(unittest.TestCase):
+    def test_init(self):
+        v = Vector(Point(0.1, 0.2, 0.3))
+        near = Vector(Point(0.1, 0.2, 0.3 + 1e-12)) * 3
+        self.assertFalse(v.is_parallel(near))
+        self.assertTrue(v.is_parallel(near, rel_tol=1e-9))
+        self.assertFalse(v.is_parallel(near, rel_tol=1e-15))
+        self.assertTrue(v.is_parallel(-v, rel_tol=1e-9))
+        side = Vector(Point(3, 0, -1 + 1e-12))
+        self.assertFalse(v.is_perpendicular(side))
+        self.assertTrue(v.is_perpendicular(side, rel_tol=1e-9))
+        self.assertFalse(v.is_non_parallel(side, rel_tol=1e-9))
+        self.assertTrue(v.is_non_parallel(side))
+        # A zero vector is parallel and perpendicular to any vector
+        self.assertTrue(Vector(Point()).is_parallel(v, rel_tol=1e-9))
+        self.assertTrue(Vector(Point()).is_perpendicular(v, rel_tol=1e-9))
+        with self.assertRaises(ValueError):
+            v.is_parallel(near, rel_tol=-1)
+        with self.assertRaises(ValueError):
+            v.is_perpendicular(near, rel_tol="1")
+
+        rng = np.random.default_rng(19)
+        data = rng.normal(size=(200, 3))
+        data[:50] = data[50:100] * rng.uniform(-2, 2, size=(50, 1)) + rng.normal(scale=1e-13, size=(50, 3))
+        first, second = VectorArray(data[:100]), VectorArray(data[100:][::-1].copy())
+        second.point.data[:50] = data[50:100]
+        for rel_tol in (0, 1e-9, 1e-3):
+            parallel = first.is_parallel(second, rel_tol=rel_tol)
+            perpendicular = first.is_perpendicular(second, rel_tol=rel_tol)
+            non_parallel = first.is_non_parallel(second, rel_tol=rel_tol)
+            for i, (a, b) in enumerate(zip(first, second)):
+                self.assertEqual(parallel[i], a.is_parallel(b, rel_tol=rel_tol))
+                self.assertEqual(perpendicular[i], a.is_perpendicular(b, rel_tol=rel_tol))
+                self.assertEqual(non_parallel[i], a.is_non_parallel(b, rel_tol=rel_tol))
+        self.assertTrue(first.is_parallel(second, rel_tol=1e-9)[:50].all())
+
+        pairs = first.is_parallel(first, all_pairs=True, rel_tol=1e-9)
+        self.assertEqual(pairs.shape, (100, 100))
+        self.assertTrue(np.array_equal(pairs, pairs.T))
+        self.assertTrue(pairs.diagonal().all())
+        self.assertTrue(np.array_equal(first.is_perpendicular(Vector(Point(1, 0, 0)), rel_tol=0.1),
+                                       np.abs(data[:100, 0]) <= 0.1 * np.linalg.norm(data[:100], axis=1)))
+        with self.assertRaises(ValueError):
+            first.is_parallel(second, rel_tol=-1e-9)
+        with self.assertRaises(ValueError):
+            first.is_parallel(Point(1, 0, 0))
+
+
+class TestBounds(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(20)
+        data = rng.normal(size=(1000, 3)) * [1, 2, 3] + [5, -1, 0]
+        points = PointArray(data)
+        box = AABB.from_points(points)
+        self.assertEqual(box.minimum, Point(*data.min(axis=0)))
+        self.assertEqual(box.maximum, Point(*data.max(axis=0)))
+        self.assertTrue(box.contains(points).all())
+        self.assertTrue(all(box.contains(point) for point in points))
+        self.assertEqual(box.contains(Point(*data.max(axis=0) + 0.1)), False)
+
+        # Incremental expansion gives the same box
+        grown = AABB()
+        self.assertTrue(grown.is_empty())
+        self.assertFalse(grown.contains(Point()))
+        for chunk in np.array_split(data, 7):
+            grown.expand_(chunk)
+        self.assertEqual((grown.minimum, grown.maximum), (box.minimum, box.maximum))
+        grown = AABB()
+        for point in points:
+            grown.expand_(point)
+        self.assertEqual((grown.minimum, grown.maximum), (box.minimum, box.maximum))
+        self.assertTrue(AABB.from_points([]).is_empty())
+        with self.assertRaises(ValueError):
+            AABB(Point(1, 0, 0), Point(0, 0, 0))
+        with self.assertRaises(ValueError):
+            AABB().center()
+
+        sphere = BoundingSphere.from_points(points)
+        self.assertTrue(sphere.contains(points).all())
+        self.assertTrue(all(sphere.contains(point) for point in points))
+        # Ritter's sphere is not much larger than the farthest point from the center of the box
+        self.assertLess(sphere.radius, 1.2 * np.max(np.linalg.norm(data - data.mean(axis=0), axis=1)))
+        grown = BoundingSphere()
+        for chunk in np.array_split(data, 7):
+            grown.expand_(chunk)
+        self.assertTrue(grown.contains(points).all())
+        grown = BoundingSphere()
+        for point in points:
+            grown.expand_(point)
+        self.assertTrue(grown.contains(points).all())
+        self.assertTrue(grown.expand(sphere).contains(sphere))
+        self.assertTrue(sphere.expand(box).contains(box))
+        self.assertTrue(box.expand(sphere).contains(sphere))
+        self.assertTrue(BoundingSphere.from_points([]).is_empty())
+        self.assertEqual(BoundingSphere.from_points([Point(1, 2, 3)] * 3).radius, 0)
+        with self.assertRaises(ValueError):
+            BoundingSphere(Point(), -1)
+
+        unit = AABB(Point(0, 0, 0), Point(1, 1, 1))
+        self.assertTrue(unit.overlaps(AABB(Point(1, 1, 1), Point(2, 2, 2))))
+        self.assertFalse(unit.overlaps(AABB(Point(1.1, 0, 0), Point(2, 1, 1))))
+        self.assertFalse(unit.overlaps(AABB()))
+        self.assertTrue(unit.overlaps(BoundingSphere(Point(2, 0.5, 0.5), 1)))
+        self.assertFalse(unit.overlaps(BoundingSphere(Point(2, 2, 2), 1.7)))
+        self.assertTrue(unit.overlaps(BoundingSphere(Point(2, 2, 2), 1.8)))
+        self.assertTrue(BoundingSphere(Point(2, 2, 2), 1.8).overlaps(unit))
+        self.assertTrue(BoundingSphere(Point(), 1).overlaps(BoundingSphere(Point(2, 0, 0), 1)))
+        self.assertFalse(BoundingSphere(Point(), 1).overlaps(BoundingSphere(Point(2.1, 0, 0), 1)))
+        self.assertTrue(BoundingSphere(Point(0.5, 0.5, 0.5), 0.9).contains(unit))
+        self.assertFalse(BoundingSphere(Point(0.5, 0.5, 0.5), 0.8).contains(unit))
+        with self.assertRaises(ValueError):
+            unit.overlaps(Point())
+
+
+class TestTriangleMesh(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(21)
+        vertices = rng.normal(size=(50, 3))
+        faces = rng.integers(0, 50, size=(200, 3))
+        mesh = TriangleMesh(vertices, faces)
+        self.assertEqual(len(mesh), 200)
+
+        normals = mesh.face_normals()
+        areas = mesh.face_areas()
+        for i in range(len(mesh)):
+            a, b, c = mesh.triangle(i)
+            first, second = Vector.from_points(b, a), Vector.from_points(c, a)
+            if a == b or a == c or b == c:
+                self.assertEqual(normals[i], Vector(Point()))
+                continue
+            # Exactly the same values as Vector.normal
+            normal = first.normal(second)
+            self.assertEqual((normal.point.x, normal.point.y, normal.point.z), tuple(normals.data[i].tolist()))
+            self.assertAlmostEqual(areas[i], (first * second).mag() / 2)
+        self.assertAlmostEqual(mesh.surface_area(), areas.sum())
+
+        # Vertex normals are the area weighted sums of the normals of the faces around each vertex
+        vertex_normals = mesh.vertex_normals()
+        for vertex in range(0, 50, 7):
+            total = Vector(Point())
+            for i in np.flatnonzero((faces == vertex).any(axis=1)):
+                for _ in range(int((faces[i] == vertex).sum())):
+                    total = total + normals[int(i)] * float(areas[i])
+            if total.mag() > 0:
+                self.assertEqual(vertex_normals[vertex], total.unit())
+
+        cube = TriangleMesh([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 2, 1], [0, 3, 2]])
+        self.assertEqual(cube.surface_area(), 1)
+        self.assertTrue(np.array_equal(cube.face_normals().data, [[0, 0, -1], [0, 0, -1]]))
+        self.assertEqual(TriangleMesh.from_triangles([cube.triangle(0)]).surface_area(), 0.5)
+        self.assertTrue(np.array_equal(TriangleMesh([[0, 0, 0]] * 3, [[0, 1, 2]]).face_normals().data, [[0, 0, 0]]))
+        self.assertEqual(TriangleMesh(vertices, np.empty((0, 3), dtype=int)).surface_area(), 0)
+        with self.assertRaises(ValueError):
+            TriangleMesh(vertices, [[0, 1, 50]])
+        with self.assertRaises(ValueError):
+            TriangleMesh(vertices, [[0, 1]])
+        with self.assertRaises(ValueError):
+            TriangleMesh(vertices, [[0.0, 1.0, 2.0]])
+
+
+class TestRaycast(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(22)
+        rays = RayArray(rng.normal(size=(100, 3)) * 3, rng.normal(size=(100, 3)))
+        scene = [Triangle(*[Point(*rng.normal(size=3).tolist()) for _ in range(3)]) for _ in range(40)]
+        scene += [Sphere(Point(*rng.normal(size=3).tolist()), float(rng.random())) for _ in range(40)]
+        scene += [Plane(Point(*rng.normal(size=3).tolist()), Vector(Point(*rng.normal(size=3).tolist())))]
+        t, index = rays.intersect(scene)
+        for i in range(len(rays)):
+            ray = rays[i]
+            hits = [primitive.intersect(ray) for primitive in scene]
+            hits = [hit for hit in hits if hit is not None]
+            # Exactly the same distances as a single ray with a single primitive
+            self.assertEqual(t[i], min(hits) if hits else np.inf)
+            if hits:
+                self.assertEqual(ray.intersect(scene[index[i]]), t[i])
+                self.assertEqual(rays.at(t)[i], ray.at(t[i]))
+            else:
+                self.assertEqual(index[i], -1)
+
+        # A BVH finds the same hits as testing every triangle
+        corners = rng.random((500, 3, 3)) * 10
+        corners[:, 1:] = corners[:, :1] + rng.normal(size=(500, 2, 3)) * 0.5
+        rays = RayArray(Point(5, 5, 5), rng.normal(size=(300, 3)))
+        bvh = BVH.from_triangles(corners, leaf_size=2)
+        self.assertEqual(len(bvh), 500)
+        t, index = rays.intersect(corners, bvh=bvh)
+        hits = np.isfinite(t)
+        self.assertTrue(hits.any())
+        for i in np.flatnonzero(hits)[:50]:
+            triangle = Triangle(*[Point(*corner.tolist()) for corner in corners[index[i]]])
+            self.assertEqual(triangle.intersect(rays[int(i)]), t[i])
+        brute = [min([hit for hit in (Triangle(*[Point(*corner.tolist()) for corner in triangle])
+                                      .intersect(rays[i]) for triangle in corners[:500]) if hit is not None],
+                     default=np.inf) for i in range(0, 300, 30)]
+        self.assertEqual(brute, t[::30].tolist())
+        self.assertTrue(np.array_equal(bvh.lower[0], corners.min(axis=(0, 1))))
+
+        ray = Ray(Point(0, 0, -5), Vector(Point(0, 0, 1)))
+        self.assertEqual(ray.intersect(Sphere(Point(0, 0, 0), 1)), 4)
+        self.assertEqual(ray.intersect(Sphere(Point(0, 0, -5), 1)), 1)
+        self.assertIsNone(ray.intersect(Sphere(Point(0, 0, -7), 1)))
+        self.assertIsNone(ray.intersect(Plane(Point(1, 0, 0), Vector(Point(1, 0, 0)))))
+        self.assertEqual(ray.intersect(Plane(Point(0, 0, 1), Vector(Point(0, 0, -2)))), 6)
+        self.assertEqual(ray.intersect(Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0))), 5)
+        self.assertEqual(RayArray(Point(), []).intersect(scene)[0].size, 0)
+        with self.assertRaises(ValueError):
+            Ray(Point(), Vector(Point()))
+        with self.assertRaises(ValueError):
+            Sphere(Point(), -1)
+        with self.assertRaises(ValueError):
+            ray.intersect(Point())
+        with self.assertRaises(ValueError):
+            RayArray(Point(), [[0, 0, 0]])
+        # Nearly zero directions are rejected by Ray and RayArray alike
+        with self.assertRaises(ValueError):
+            Ray(Point(), Vector(Point(1e-5, 0, 0)))
+        with self.assertRaises(ValueError):
+            RayArray(Point(), [[1e-5, 0, 0]])
+        with self.assertRaises(ValueError):
+            RayArray([[0, 0, 0]] * 2, [[1, 0, 0]])
+        with self.assertRaises(ValueError):
+            rays.intersect(corners, bvh=BVH.from_triangles(corners[:10]))
+        with self.assertRaises(ValueError):
+            rays.intersect(scene, bvh=bvh)
+
+
+class TestBVH(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(23)
+        points = rng.random((2000, 3))
+        queries = rng.random((200, 3)) * 1.2 - 0.1
+        for method in ("sah", "median"):
+            bvh = BVH.from_points(points, leaf_size=3, method=method)
+            self.assertEqual(len(bvh), 2000)
+            # Depth first layout: the left child is the next node and the children split the range of the parent
+            inner = np.flatnonzero(bvh.right >= 0)
+            self.assertTrue(np.array_equal(bvh.start[inner + 1], bvh.start[inner]))
+            self.assertTrue(np.array_equal(bvh.count[inner + 1] + bvh.count[bvh.right[inner]], bvh.count[inner]))
+            self.assertTrue((bvh.count[bvh.right < 0] <= 3).all())
+            self.assertTrue(np.array_equal(np.sort(bvh.order), np.arange(2000)))
+            for node in range(0, len(bvh.right), 97):
+                inside = points[bvh.order[bvh.start[node]:bvh.start[node] + bvh.count[node]]]
+                self.assertTrue(np.array_equal(inside.min(axis=0), bvh.lower[node]))
+                self.assertTrue(np.array_equal(inside.max(axis=0), bvh.upper[node]))
+
+            distances, index = bvh.closest(queries)
+            brute = np.sqrt(((queries[:, None] - points[None]) ** 2).sum(axis=2))
+            self.assertTrue(np.allclose(distances, brute.min(axis=1)))
+            self.assertTrue(np.allclose(brute[np.arange(200), index], distances))
+
+        # Overlaps are the same as testing every box
+        lower = rng.random((100, 3))
+        upper = lower + rng.random((100, 3)) * 0.2
+        boxes, primitives = bvh.overlaps(lower, upper)
+        inside = ((points[None] >= lower[:, None]) & (points[None] <= upper[:, None])).all(axis=2)
+        expected = np.nonzero(inside)
+        self.assertTrue(np.array_equal(boxes, expected[0]) and np.array_equal(primitives, expected[1]))
+
+        # A refit tree finds the same points as a new one
+        moved = points + rng.normal(size=points.shape) * 0.05
+        refit = bvh.refit(moved).closest(queries)[0]
+        self.assertTrue(np.array_equal(refit, BVH.from_points(moved).closest(queries)[0]))
+        self.assertTrue(np.array_equal(bvh.upper[0], moved.max(axis=0)))
+
+        segments = rng.random((300, 2, 3))
+        distances, index = BVH.from_segments(segments).closest(queries)
+        for i in range(0, 200, 20):
+            point = Point(*queries[i].tolist())
+            brute = []
+            for start, end in segments.tolist():
+                start, end = Point(*start), Point(*end)
+                direction = Vector.from_points(end, start)
+                t = min(max(Vector.from_points(point, start).dot(direction) / direction.dot(direction), 0), 1)
+                brute.append(point.dist(start + direction.point * t))
+            self.assertAlmostEqual(distances[i], min(brute))
+            self.assertAlmostEqual(distances[i], brute[index[i]])
+
+        corners = rng.random((300, 3, 3))
+        bvh = BVH.from_triangles(corners)
+        distances, index = bvh.closest(queries)
+        # The closest point on a triangle is not farther than any point sampled on it
+        weights = rng.random((2000, 2))
+        weights[weights.sum(axis=1) > 1] = 1 - weights[weights.sum(axis=1) > 1]
+        for i in range(0, 200, 40):
+            samples = corners[:, :1] + weights[None, :, :1] * (corners[:, 1:2] - corners[:, :1]) + \
+                      weights[None, :, 1:] * (corners[:, 2:] - corners[:, :1])
+            nearest = np.sqrt(((samples - queries[i]) ** 2).sum(axis=2)).min()
+            self.assertLessEqual(distances[i], nearest + 1e-12)
+            self.assertGreater(distances[i], nearest - 0.05)
+        mesh = TriangleMesh(corners.reshape(-1, 3), np.arange(900).reshape(-1, 3))
+        self.assertTrue(np.array_equal(BVH.from_triangles(mesh).closest(queries)[0], distances))
+        spheres = BVH.from_spheres([Sphere(Point(0, 0, 0), 1), Sphere(Point(5, 0, 0), 1)])
+        self.assertEqual(spheres.closest(Point(3, 0, 0)), (np.array([1.]), np.array([1])))
+        self.assertEqual(spheres.closest(Point(0.5, 0, 0))[0][0], 0)
+
+        empty = BVH.from_points(np.empty((0, 3)))
+        self.assertEqual(len(empty.right), 0)
+        self.assertEqual(empty.closest(Point(1, 2, 3))[1][0], -1)
+        self.assertEqual(empty.overlaps(Point(), Point(1, 1, 1))[0].size, 0)
+        with self.assertRaises(ValueError):
+            BVH.from_points(points, method="middle")
+        with self.assertRaises(ValueError):
+            BVH.from_points(points, leaf_size=0)
+        with self.assertRaises(ValueError):
+            BVH.from_points(points).refit(points[:10])
+        with self.assertRaises(ValueError):
+            BVH(points, points[:10])
+
+
+class TestDistances(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(24)
+        points = rng.random((300, 3))
+        other = rng.random((200, 3))
+        # Same distances as Point.dist, whatever the block size
+        matrix = Distances(points, memory=1000).matrix()
+        self.assertTrue(np.array_equal(matrix, Distances(points).matrix()))
+        for i in range(0, 300, 37):
+            for j in range(0, 300, 41):
+                self.assertEqual(matrix[i, j], Point(*points[i].tolist()).dist(Point(*points[j].tolist())))
+        cross = Distances(points, other, squared=True).matrix(out=np.empty((300, 200)))
+        self.assertTrue(np.allclose(cross, ((points[:, None] - other[None]) ** 2).sum(axis=2)))
+        with self.assertRaises(ValueError):
+            Distances(points, other).matrix(out=np.empty((300, 300)))
+
+        # Nearest neighbours are the smallest of each row, without the point itself
+        distances, indices = Distances(points, memory=5000).nearest(k=4)
+        np.fill_diagonal(matrix, np.inf)
+        self.assertTrue(np.array_equal(distances, np.sort(matrix, axis=1)[:, :4]))
+        self.assertTrue(np.array_equal(matrix[np.arange(300)[:, None], indices], distances))
+        self.assertEqual(Distances(points[:3]).nearest(k=10)[0].shape, (3, 2))
+        distances, indices = Distances(points, other).nearest()
+        self.assertTrue(np.array_equal(indices[:, 0], np.argmin(Distances(points, other).matrix(), axis=1)))
+
+        # Closest pair is the smallest distance of the matrix
+        distance, i, j = Distances(points).closest_pair()
+        self.assertEqual(distance, matrix.min())
+        self.assertEqual(matrix[i, j], distance)
+        self.assertLess(i, j)
+        clustered = np.vstack([points, points[:20] * 1e-6, [points[7]]])
+        self.assertEqual(Distances(clustered).closest_pair(), (0.0, 7, 320))
+        self.assertEqual(Distances(np.ones((4, 3))).closest_pair(), (0.0, 0, 1))
+        # Cells (22, 17, 13) and (56, 23, 45) have the same hash. The pair next to the second one is still found
+        colliding = [[0, 0, 0], [1, 0, 0], [114, 0, 0], [22.5, 17.5, 13.5], [56.99, 23.5, 45.5], [57.01, 23.5, 45.5],
+                     [0, 40, 45.5]]
+        distance, i, j = Distances(colliding).closest_pair()
+        self.assertEqual((i, j), (4, 5))
+        self.assertEqual(distance, Point(*colliding[4]).dist(Point(*colliding[5])))
+        distance, i, j = Distances(points, other).closest_pair()
+        self.assertEqual(distance, Distances(points, other).matrix().min())
+
+        with self.assertRaises(ValueError):
+            Distances(points[:1]).closest_pair()
+        with self.assertRaises(ValueError):
+            Distances(points).nearest(k=0)
+        with self.assertRaises(ValueError):
+            Distances(points, memory=0)
+
+
+class TestPointStatistics(unittest.TestCase):
+    def test_init(self):
+        rng = np.random.default_rng(25)
+        points = rng.normal(size=(5000, 3)) @ np.array([[3, 0, 0], [1, 2, 0], [0, 0, 0.1]]) + 1e6
+        weights = rng.random(5000)
+        # Chunks give the same as all points at once, and as numpy
+        statistics = PointStatistics.from_chunks((points[i:i + 700] for i in range(0, 5000, 700)),
+                                                 (weights[i:i + 700] for i in range(0, 5000, 700)))
+        self.assertEqual(statistics.count, 5000)
+        self.assertAlmostEqual(statistics.weight, weights.sum())
+        centroid = statistics.centroid()
+        self.assertTrue(np.allclose([centroid.x, centroid.y, centroid.z], np.average(points, axis=0, weights=weights),
+                                    rtol=0, atol=1e-8))
+        self.assertTrue(np.allclose(statistics.covariance(), np.cov(points.T, aweights=weights, bias=True)))
+        self.assertTrue(np.allclose(PointStatistics(points, weights).covariance(), statistics.covariance()))
+        self.assertTrue(np.allclose(PointStatistics(points).covariance(sample=True), np.cov(points.T)))
+        merged = PointStatistics(points[:100]).update(PointStatistics(points[100:]))
+        self.assertTrue(np.allclose(merged.covariance(), np.cov(points.T, bias=True)))
+        self.assertEqual(PointStatistics([Point(1, 2, 3), Point(3, 2, 1)]).centroid(), Point(2, 2, 2))
+
+        # Axes are orthogonal unit Vectors, largest spread first. The plane is perpendicular to the smallest
+        axes, variances = statistics.principal_axes()
+        self.assertTrue(all(isinstance(axis, Vector) for axis in axes))
+        self.assertTrue(np.all(np.diff(variances) <= 0))
+        for i in range(3):
+            self.assertAlmostEqual(axes[i].mag(), 1)
+            self.assertAlmostEqual(axes[i].dot(axes[(i + 1) % 3]), 0)
+        plane = statistics.plane()
+        self.assertEqual(plane.normal, axes[2])
+        self.assertGreater(abs(plane.normal.point.z), 0.99)
+
+        with self.assertRaises(ValueError):
+            PointStatistics().centroid()
+        with self.assertRaises(ValueError):
+            PointStatistics([[1, 2, 3]]).covariance(sample=True)
+        with self.assertRaises(ValueError):
+            PointStatistics(points, weights[:10])
+        with self.assertRaises(ValueError):
+            PointStatistics(points[:2], [1, -1])
+
+
+class TestSettings(unittest.TestCase):
+    def test_arithmetic_logging(self):
+        logger = logging.getLogger('v3d_test')
+        p = Point(1, 1, 1, logger=logger)
+        with self.assertLogs(logger, level='INFO') as logs:
+            p.add(Point(1, 2, 3))
+        self.assertIn("Calculating Point(x=1, y=1, z=1) + Point(x=1, y=2, z=3)", logs.output[0])
+
+        v3d.disable_arithmetic_logging()
+        try:
+            with self.assertNoLogs(logger, level='INFO'):
+                self.assertEqual(p.add(Point(1, 2, 3)), Point(2, 3, 4))
+                # Batched arithmetic is silent too
+                pa = PointArray([[1, 1, 1]], logger=logger)
+                pa.add(pa).scale_(2)
+                va = VectorArray(pa, logger=logger)
+                va.dot(va)
+                va.angle_between(va)
+                # So are the constructors and compositions of transforms
+                Transform(logger=logger).translate((1, 2, 3)).scale(2).rotate(10, 20, 30)
+                Rotation.from_euler(10, 20, 30, logger=logger) * Rotation.from_euler(1, 2, 3, logger=logger)
+                Quaternion.from_axis_angle(Vector(Point(0, 0, 1)), 90, logger=logger)
+        finally:
+            v3d.enable_arithmetic_logging()
+
+        with self.assertLogs(logger, level='INFO') as logs:
+            PointArray([[1, 1, 1]], logger=logger).add(Point(1, 2, 3))
+        self.assertIn("Calculating PointArray addition", logs.output[0])
+
+        with self.assertLogs(logger, level='ERROR'):
+            with self.assertRaises(ValueError):
+                p.add(1)
+
 
 if __name__ == '__main__':
     unittest.main()
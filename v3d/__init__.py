@@ -1,2 +1,21 @@
 from .point import Point
 from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+from .settings import enable_arithmetic_logging, disable_arithmetic_logging
+from .rotation import Rotation
+from .quaternion import Quaternion
+from .kdtree import KDTree
+from .point_set import PointSet
+from .storage import PointFile, PointFileWriter
+from .formats import XYZReader, XYZWriter, CSVReader, CSVWriter, PLYReader, PLYWriter
+from .parallel import ParallelMap
+from .frozen import FrozenPoint, FrozenVector
+from .transform import Transform
+from .bounds import AABB, BoundingSphere
+from .mesh import TriangleMesh
+from .primitives import Ray, Plane, Sphere, Triangle
+from .bvh import BVH
+from .raycast import RayArray
+from .distance import Distances
+from .stats import PointStatistics
@@ -0,0 +1,548 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import math
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+
+# Passes over the points to grow a bounding sphere. Each pass moves the sphere to the farthest point outside it
+_MAX_PASSES = 32
+
+
+def _rows(data, logger: Logger) -> np.ndarray:
+    # Returns points as an (N, 3) float64 array. Not copied if it is one already
+    return PointArray(data, logger=logger).data
+
+
+def _squared_distances(data: np.ndarray, center: Point) -> np.ndarray:
+    # Squared distances of the rows from the center. Same operations as the distance of a single Point below
+    dx = data[:, 0] - center.x
+    dy = data[:, 1] - center.y
+    dz = data[:, 2] - center.z
+    return dx * dx + dy * dy + dz * dz
+
+
+def _farthest(data: np.ndarray, center: Point) -> tuple:
+    # Index and distance of the row farthest from the center. Only one square root is taken
+    squared = _squared_distances(data, center)
+    index = int(np.argmax(squared))
+    return index, math.sqrt(squared[index])
+
+
+def _distance(point: Point, center: Point) -> float:
+    dx = point.x - center.x
+    dy = point.y - center.y
+    dz = point.z - center.z
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+class AABB:
+    logger = getLogger('dummy')
+
+    def __init__(self, minimum: Point = None, maximum: Point = None, logger: Logger = None) -> None:
+        """
+        Constructor method. An axis-aligned bounding box.
+        A box without minimum and maximum is empty. It contains nothing and takes the size of whatever
+        it is first expanded with
+
+        >>> box = AABB(Point(0, 0, 0), Point(2, 1, 1))
+        >>> box
+        AABB(minimum=Point(x=0, y=0, z=0), maximum=Point(x=2, y=1, z=1))
+        >>> box.contains(Point(1, 0.5, 0.5))
+        True
+        >>> AABB().expand(Point(1, 2, 3))
+        AABB(minimum=Point(x=1, y=2, z=3), maximum=Point(x=1, y=2, z=3))
+
+
+        :param minimum: Corner with the smallest x, y and z
+        :param maximum: Corner with the largest x, y and z
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        if minimum is None and maximum is None:
+            # An empty box. Any point expands it
+            self.minimum = Point._from_xyz(math.inf, math.inf, math.inf)
+            self.maximum = Point._from_xyz(-math.inf, -math.inf, -math.inf)
+            return
+
+        # Raise an error if the corners are not Points
+        if not isinstance(minimum, Point) or not isinstance(maximum, Point):
+            self.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+        # Raise an error if the corners are swapped
+        if minimum.x > maximum.x or minimum.y > maximum.y or minimum.z > maximum.z:
+            self.logger.error("Minimum must not be greater than maximum")
+            raise ValueError("Minimum must not be greater than maximum")
+
+        # Copies, so changing the given Points does not change the box
+        self.minimum = Point._from_xyz(minimum.x, minimum.y, minimum.z)
+        self.maximum = Point._from_xyz(maximum.x, maximum.y, maximum.z)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(minimum={self.minimum}, maximum={self.maximum})"
+
+    @classmethod
+    def from_points(cls, points, logger: Logger = None) -> AABB:
+        """
+        Returns the smallest box containing the points. Calculated with numpy, without a Point for each row
+
+        >>> AABB.from_points([Point(1, 5, 2), Point(3, 0, 4), Point(2, 2, -1)])
+        AABB(minimum=Point(x=1.0, y=0.0, z=-1.0), maximum=Point(x=3.0, y=5.0, z=4.0))
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :param logger: Logger to log
+        :return: The box. Empty if there are no points
+        """
+        cls.logger.info("Calculating bounding box")
+        box = cls(logger=logger)
+        box._expand_rows(_rows(points, box.logger))
+        return box
+
+    def copy(self) -> AABB:
+        """
+        Returns a copy of the box
+
+        :return: The copied AABB
+        """
+        box = AABB(logger=self.logger)
+        box.minimum = self.minimum.copy()
+        box.maximum = self.maximum.copy()
+        return box
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the box is empty
+
+        >>> AABB().is_empty()
+        True
+
+
+        :return: True if the box contains nothing
+        """
+        return self.minimum.x > self.maximum.x
+
+    def _check_not_empty(self) -> None:
+        # Raise an error if the box is empty
+        if self.is_empty():
+            self.logger.error("AABB is empty")
+            raise ValueError("AABB is empty")
+
+    def center(self) -> Point:
+        """
+        Returns the center of the box
+
+        >>> AABB(Point(0, 0, 0), Point(2, 1, 1)).center()
+        Point(x=1.0, y=0.5, z=0.5)
+
+
+        :return: Center of the box
+        """
+        self._check_not_empty()
+        return Point((self.minimum.x + self.maximum.x) / 2, (self.minimum.y + self.maximum.y) / 2,
+                     (self.minimum.z + self.maximum.z) / 2, logger=self.logger)
+
+    def size(self) -> Vector:
+        """
+        Returns the size of the box along each axis
+
+        >>> AABB(Point(0, 0, 0), Point(2, 1, 1)).size()
+        Vector(Point(x=2, y=1, z=1))
+
+
+        :return: A Vector from the minimum to the maximum corner
+        """
+        self._check_not_empty()
+        return Vector(self.maximum - self.minimum, logger=self.logger)
+
+    def _expand_xyz(self, x0: float, y0: float, z0: float, x1: float, y1: float, z1: float) -> None:
+        # Grows the box to contain the box from (x0, y0, z0) to (x1, y1, z1)
+        minimum, maximum = self.minimum, self.maximum
+        self.minimum = Point._from_xyz(min(minimum.x, x0), min(minimum.y, y0), min(minimum.z, z0))
+        self.maximum = Point._from_xyz(max(maximum.x, x1), max(maximum.y, y1), max(maximum.z, z1))
+
+    def _expand_rows(self, data: np.ndarray) -> None:
+        # Grows the box to contain the rows
+        if len(data) > 0:
+            # Column by column. Much faster than reducing the (N, 3) rows along axis 0
+            self._expand_xyz(*[float(data[:, axis].min()) for axis in range(3)],
+                             *[float(data[:, axis].max()) for axis in range(3)])
+
+    def expand_(self, other) -> AABB:
+        """
+        Grows the box in place to contain the other
+
+        >>> box = AABB()
+        >>> box.expand_(Point(1.0, 1.0, 1.0)).expand_(PointArray([[0, 2, 0]]))
+        AABB(minimum=Point(x=0.0, y=1.0, z=0.0), maximum=Point(x=1.0, y=2.0, z=1.0))
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: This box
+        """
+        if isinstance(other, Point):
+            self._expand_xyz(other.x, other.y, other.z, other.x, other.y, other.z)
+        elif isinstance(other, AABB):
+            self._expand_xyz(other.minimum.x, other.minimum.y, other.minimum.z,
+                             other.maximum.x, other.maximum.y, other.maximum.z)
+        elif isinstance(other, BoundingSphere):
+            if not other.is_empty():
+                c, r = other.center, other.radius
+                self._expand_xyz(c.x - r, c.y - r, c.z - r, c.x + r, c.y + r, c.z + r)
+        else:
+            self._expand_rows(_rows(other, self.logger))
+
+        return self
+
+    def expand(self, other) -> AABB:
+        """
+        Returns a box containing this box and the other
+
+        >>> AABB(Point(0, 0, 0), Point(1, 1, 1)).expand(Point(2, 0, 0))
+        AABB(minimum=Point(x=0, y=0, z=0), maximum=Point(x=2, y=1, z=1))
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: The new box
+        """
+        return self.copy().expand_(other)
+
+    def contains(self, other) -> Union[bool, np.ndarray]:
+        """
+        Checks if the other is inside the box. Points on the faces are inside
+
+        >>> box = AABB(Point(0, 0, 0), Point(2, 1, 1))
+        >>> box.contains(Point(2, 1, 1))
+        True
+        >>> box.contains(PointArray([[1, 1, 1], [1, 2, 1]]))
+        array([ True, False])
+        >>> box.contains(BoundingSphere(Point(1, 0.5, 0.5), 0.5))
+        True
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: True if the other is inside. A boolean mask for many points
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if %s contains %s", self, other)
+        minimum, maximum = self.minimum, self.maximum
+        if isinstance(other, Point):
+            return minimum.x <= other.x <= maximum.x and minimum.y <= other.y <= maximum.y and \
+                minimum.z <= other.z <= maximum.z
+        elif isinstance(other, AABB):
+            return self.contains(other.minimum) and self.contains(other.maximum)
+        elif isinstance(other, BoundingSphere):
+            c, r = other.center, other.radius
+            return not other.is_empty() and self.contains(Point._from_xyz(c.x - r, c.y - r, c.z - r)) and \
+                self.contains(Point._from_xyz(c.x + r, c.y + r, c.z + r))
+
+        data = _rows(other, self.logger)
+        low = np.array([minimum.x, minimum.y, minimum.z])
+        high = np.array([maximum.x, maximum.y, maximum.z])
+        return np.all((data >= low) & (data <= high), axis=1)
+
+    def _distance_to(self, point: Point) -> float:
+        # Distance of the point to the nearest point of the box. Zero inside
+        minimum, maximum = self.minimum, self.maximum
+        dx = max(minimum.x - point.x, 0.0, point.x - maximum.x)
+        dy = max(minimum.y - point.y, 0.0, point.y - maximum.y)
+        dz = max(minimum.z - point.z, 0.0, point.z - maximum.z)
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def overlaps(self, other: Union[AABB, BoundingSphere]) -> bool:
+        """
+        Checks if the box and the other have a common point. Touching boxes overlap
+
+        >>> box = AABB(Point(0, 0, 0), Point(1, 1, 1))
+        >>> box.overlaps(AABB(Point(1, 1, 1), Point(2, 2, 2)))
+        True
+        >>> box.overlaps(BoundingSphere(Point(2, 2, 2), 1))
+        False
+
+
+        :param other: An AABB or a BoundingSphere
+        :return: True if they overlap
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if %s overlaps %s", self, other)
+        if isinstance(other, AABB):
+            return self.minimum.x <= other.maximum.x and other.minimum.x <= self.maximum.x and \
+                self.minimum.y <= other.maximum.y and other.minimum.y <= self.maximum.y and \
+                self.minimum.z <= other.maximum.z and other.minimum.z <= self.maximum.z
+        elif isinstance(other, BoundingSphere):
+            return other.overlaps(self)
+        else:
+            # Raise an error if other is not a bounding volume
+            self.logger.error("Data must be AABB or BoundingSphere type")
+            raise ValueError("Data must be AABB or BoundingSphere type")
+
+
+class BoundingSphere:
+    logger = getLogger('dummy')
+
+    def __init__(self, center: Point = None, radius: float = None, logger: Logger = None) -> None:
+        """
+        Constructor method. A bounding sphere.
+        A sphere without center and radius is empty. It contains nothing and takes the size of whatever
+        it is first expanded with
+
+        >>> sphere = BoundingSphere(Point(0, 0, 0), 2)
+        >>> sphere
+        BoundingSphere(center=Point(x=0, y=0, z=0), radius=2)
+        >>> sphere.contains(Point(1, 1, 1))
+        True
+
+
+        :param center: Center of the sphere
+        :param radius: Radius of the sphere
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        if center is None and radius is None:
+            # An empty sphere. Any point expands it
+            self.center = Point._from_xyz(0.0, 0.0, 0.0)
+            self.radius = -math.inf
+            return
+
+        # Raise an error if center is not a Point
+        if not isinstance(center, Point):
+            self.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+        # Raise an error if radius is not a non-negative number
+        if not isinstance(radius, (int, float)) or not radius >= 0:
+            self.logger.error("Radius must not be negative")
+            raise ValueError("Radius must not be negative")
+
+        # A copy, so changing the given Point does not change the sphere
+        self.center = Point._from_xyz(center.x, center.y, center.z)
+        self.radius = radius
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(center={self.center}, radius={self.radius})"
+
+    @classmethod
+    def from_points(cls, points, logger: Logger = None) -> BoundingSphere:
+        """
+        Returns a sphere containing the points. Ritter's approximation: starts with the sphere between two far apart
+        points and moves it to the farthest point outside until all points are inside.
+        Each step is one vectorized pass over the points. The radius is usually within a few percent of the
+        minimal sphere
+
+        >>> BoundingSphere.from_points([Point(-1, 0, 0), Point(1, 0, 0), Point(0, 1, 0), Point(0, 0, 0.5)])
+        BoundingSphere(center=Point(x=0.0, y=0.0, z=0.0), radius=1.0)
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :param logger: Logger to log
+        :return: The sphere. Empty if there are no points
+        """
+        cls.logger.info("Calculating bounding sphere")
+        sphere = cls(logger=logger)
+        sphere._expand_rows(_rows(points, sphere.logger))
+        return sphere
+
+    def copy(self) -> BoundingSphere:
+        """
+        Returns a copy of the sphere
+
+        :return: The copied BoundingSphere
+        """
+        sphere = BoundingSphere(logger=self.logger)
+        sphere.center = self.center.copy()
+        sphere.radius = self.radius
+        return sphere
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the sphere is empty
+
+        >>> BoundingSphere().is_empty()
+        True
+
+
+        :return: True if the sphere contains nothing
+        """
+        return self.radius < 0
+
+    def _grow(self, target: Point, distance: float) -> None:
+        # Moves and grows the sphere so it touches the target and keeps its far side
+        radius = (self.radius + distance) / 2
+        scale = (distance - radius) / distance
+        c = self.center
+        self.center = Point._from_xyz(c.x + scale * (target.x - c.x), c.y + scale * (target.y - c.y),
+                                      c.z + scale * (target.z - c.z))
+        # Rounding may leave the target or the old sphere just outside. Round the radius up
+        self.radius = math.nextafter(max(radius, _distance(target, self.center)), math.inf)
+
+    def _expand_rows(self, data: np.ndarray) -> None:
+        # Grows the sphere to contain the rows
+        if len(data) == 0:
+            return
+
+        empty = self.is_empty()
+        if empty:
+            # Start with the sphere between a point far from the first point and the point farthest from that
+            index, _ = _farthest(data, Point._from_xyz(*data[0].tolist()))
+            a = Point._from_xyz(*data[index].tolist())
+            index, _ = _farthest(data, a)
+            b = Point._from_xyz(*data[index].tolist())
+            self.center = Point._from_xyz((a.x + b.x) / 2, (a.y + b.y) / 2, (a.z + b.z) / 2)
+            self.radius = _distance(a, self.center)
+
+        for _ in range(_MAX_PASSES):
+            index, farthest = _farthest(data, self.center)
+            if farthest <= self.radius:
+                break
+
+            self._grow(Point._from_xyz(*data[index].tolist()), farthest)
+        else:
+            _, farthest = _farthest(data, self.center)
+
+        # Points only need the farthest of them inside. The old sphere needs its grown radius
+        self.radius = farthest if empty else max(self.radius, farthest)
+
+    def expand_(self, other) -> BoundingSphere:
+        """
+        Grows the sphere in place to contain the other
+
+        >>> sphere = BoundingSphere(Point(0, 0, 0), 1)
+        >>> sphere.expand_(Point(3, 0, 0))
+        BoundingSphere(center=Point(x=1.0, y=0.0, z=0.0), radius=2.0000000000000004)
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: This sphere
+        """
+        if isinstance(other, Point):
+            if self.is_empty():
+                self.center, self.radius = Point._from_xyz(other.x, other.y, other.z), 0.0
+            else:
+                distance = _distance(other, self.center)
+                if distance > self.radius:
+                    self._grow(other, distance)
+        elif isinstance(other, BoundingSphere):
+            if other.is_empty():
+                return self
+
+            if self.is_empty():
+                self.center, self.radius = other.center.copy(), other.radius
+                return self
+
+            distance = _distance(other.center, self.center)
+            if distance + other.radius <= self.radius:
+                return self
+
+            if distance + self.radius <= other.radius:
+                self.center, self.radius = other.center.copy(), other.radius
+                return self
+
+            # Sphere touching the far sides of both
+            radius = (distance + self.radius + other.radius) / 2
+            scale = (radius - self.radius) / distance
+            c, o = self.center, other.center
+            self.center = Point._from_xyz(c.x + scale * (o.x - c.x), c.y + scale * (o.y - c.y),
+                                          c.z + scale * (o.z - c.z))
+            self.radius = math.nextafter(radius, math.inf)
+        elif isinstance(other, AABB):
+            if not other.is_empty():
+                # The corners of the box
+                low, high = other.minimum, other.maximum
+                self._expand_rows(np.array([[x, y, z] for x in (low.x, high.x) for y in (low.y, high.y)
+                                            for z in (low.z, high.z)]))
+        else:
+            self._expand_rows(_rows(other, self.logger))
+
+        return self
+
+    def expand(self, other) -> BoundingSphere:
+        """
+        Returns a sphere containing this sphere and the other
+
+        >>> BoundingSphere(Point(0, 0, 0), 1).expand(BoundingSphere(Point(4, 0, 0), 1))
+        BoundingSphere(center=Point(x=2.0, y=0.0, z=0.0), radius=3.0000000000000004)
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: The new sphere
+        """
+        return self.copy().expand_(other)
+
+    def contains(self, other) -> Union[bool, np.ndarray]:
+        """
+        Checks if the other is inside the sphere. Points on the surface are inside
+
+        >>> sphere = BoundingSphere(Point(0, 0, 0), 1)
+        >>> sphere.contains(Point(1, 0, 0))
+        True
+        >>> sphere.contains(PointArray([[0.5, 0.5, 0.5], [1, 1, 0]]))
+        array([ True, False])
+        >>> sphere.contains(AABB(Point(0, 0, 0), Point(0.5, 0.5, 0.5)))
+        True
+
+
+        :param other: A Point, an AABB, a BoundingSphere, a list of Points, a PointArray or an (N, 3) array
+        :return: True if the other is inside. A boolean mask for many points
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if %s contains %s", self, other)
+        if isinstance(other, Point):
+            return _distance(other, self.center) <= self.radius
+        elif isinstance(other, BoundingSphere):
+            return not other.is_empty() and _distance(other.center, self.center) + other.radius <= self.radius
+        elif isinstance(other, AABB):
+            if other.is_empty():
+                return False
+
+            # The corner farthest from the center
+            c, low, high = self.center, other.minimum, other.maximum
+            corner = Point._from_xyz(low.x if c.x - low.x > high.x - c.x else high.x,
+                                     low.y if c.y - low.y > high.y - c.y else high.y,
+                                     low.z if c.z - low.z > high.z - c.z else high.z)
+            return _distance(corner, c) <= self.radius
+
+        return np.sqrt(_squared_distances(_rows(other, self.logger), self.center)) <= self.radius
+
+    def overlaps(self, other: Union[AABB, BoundingSphere]) -> bool:
+        """
+        Checks if the sphere and the other have a common point. Touching spheres overlap
+
+        >>> sphere = BoundingSphere(Point(0, 0, 0), 1)
+        >>> sphere.overlaps(BoundingSphere(Point(2, 0, 0), 1))
+        True
+        >>> sphere.overlaps(AABB(Point(1, 1, 1), Point(2, 2, 2)))
+        False
+
+
+        :param other: An AABB or a BoundingSphere
+        :return: True if they overlap
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if %s overlaps %s", self, other)
+        if isinstance(other, BoundingSphere):
+            return _distance(other.center, self.center) <= self.radius + other.radius
+        elif isinstance(other, AABB):
+            return other._distance_to(self.center) <= self.radius
+        else:
+            # Raise an error if other is not a bounding volume
+            self.logger.error("Data must be AABB or BoundingSphere type")
+            raise ValueError("Data must be AABB or BoundingSphere type")
@@ -0,0 +1,636 @@
+from __future__ import annotations
+from typing import Callable
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from .point import Point
+from .point_array import PointArray
+from .vector_array import VectorArray
+from .mesh import TriangleMesh
+from .primitives import Sphere, Triangle
+
+# Rays or points traversed together. Bounds the memory of the traversal
+_CHUNK = 1 << 16
+# Ways to split a node
+_METHODS = ("sah", "median")
+# Bins along the split axis where the surface area heuristic is evaluated
+_BINS = 16
+# Smaller nodes are split at the median even for SAH. Cheaper, and they are near the leaves anyway
+_SAH_MIN = 64
+
+_dot = VectorArray._dot
+_cross = VectorArray._cross
+_mag = VectorArray._mag
+
+
+def _exclusive_cumsum(counts: np.ndarray) -> np.ndarray:
+    # Start of each run when runs of the given lengths are laid one after another
+    return np.cumsum(counts) - counts
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # All indices of the ranges [start, start + count) one after another
+    return np.repeat(starts - _exclusive_cumsum(counts), counts) + np.arange(counts.sum())
+
+
+def _half_area(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    # Half of the surface area of each box
+    size = upper - lower
+    return size[..., 0] * size[..., 1] + size[..., 1] * size[..., 2] + size[..., 2] * size[..., 0]
+
+
+def _segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Distances of the points to the segments, row by row
+    direction = ends - starts
+    length = _dot(direction, direction)
+    t = np.divide(_dot(points - starts, direction), length, out=np.zeros_like(length), where=length > 0)
+    t = np.clip(t, 0, 1)
+    return _mag(points - (starts + direction * t[:, None]))
+
+
+def _triangle_distances(points: np.ndarray, corners: np.ndarray) -> np.ndarray:
+    # Distances of the points to the triangles, row by row. The distance to the plane if the point is above the
+    # triangle, the distance to the nearest edge otherwise
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    normal = _cross(b - a, c - a)
+    length = _dot(normal, normal)
+    offset = points - a
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Barycentric coordinates of the point projected on the plane
+        u = _dot(_cross(offset, c - a), normal) / length
+        v = _dot(_cross(b - a, offset), normal) / length
+        plane = np.abs(_dot(offset, normal)) / np.sqrt(length)
+
+    above = (length > 0) & (u >= 0) & (v >= 0) & (u + v <= 1)
+    edges = np.minimum(np.minimum(_segment_distances(points, a, b), _segment_distances(points, b, c)),
+                       _segment_distances(points, c, a))
+    return np.where(above, plane, edges)
+
+
+class BVH:
+    logger = getLogger('dummy')
+
+    def __init__(self, lower, upper, leaf_size: int = 4, method: str = "sah", logger: Logger = None) -> None:
+        """
+        Constructor method. A bounding volume hierarchy over primitives given by their bounding boxes.
+        Each node is split along the axis its primitive centers spread the most,
+        where the surface area heuristic is lowest ("sah") or at the median ("median").
+        All nodes of a level are split at once.
+
+        The tree is stored as flat arrays in depth first order, one row for each node:
+        lower and upper corners of the node boxes, the right child of the node (-1 for leaves; the left child is
+        always the next node), the split axis and the range of the node in order,
+        the primitive indices sorted so that every node owns a contiguous run of them
+
+        >>> bvh = BVH([[0, 0, 0], [2, 0, 0], [4, 0, 0]], [[1, 1, 1], [3, 1, 1], [5, 1, 1]], leaf_size=1)
+        >>> bvh
+        BVH(primitives=3, nodes=5)
+        >>> bvh.lower[0], bvh.upper[0]
+        (array([0., 0., 0.]), array([5., 1., 1.]))
+        >>> bvh.right
+        array([ 2, -1,  4, -1, -1])
+
+
+        :param lower: Lower corners of the primitive boxes as an (M, 3) array
+        :param upper: Upper corners of the primitive boxes as an (M, 3) array
+        :param leaf_size: Maximum number of primitives in a leaf
+        :param method: "sah" or "median"
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        lower, upper = self._check_boxes(lower, upper)
+        # Raise an error if leaf_size is not a positive integer
+        if not isinstance(leaf_size, (int, np.integer)) or leaf_size < 1:
+            self.logger.error("Leaf size must be a positive integer")
+            raise ValueError("Leaf size must be a positive integer")
+
+        # Raise an error if the method is not known
+        if method not in _METHODS:
+            self.logger.error("Method must be one of {}".format(", ".join(_METHODS)))
+            raise ValueError("Method must be one of {}".format(", ".join(_METHODS)))
+
+        self.leaf_size = int(leaf_size)
+        self.method = method
+        self._primitive_lower, self._primitive_upper = lower, upper
+        # The primitives as arrays, how to get them and their boxes, and distances from points to them.
+        # Set by the class methods
+        self._data = None
+        self._pack = lambda boxes: self._check_boxes(*boxes)
+        self._bounds = lambda boxes: boxes
+        self._distances = None
+        self.logger.info("Building BVH over %d primitives", len(lower))
+        self._build()
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(primitives={len(self)}, nodes={len(self.right)})"
+
+    def __len__(self) -> int:
+        return len(self._primitive_lower)
+
+    @property
+    def lower(self) -> np.ndarray:
+        # Lower corners of the node boxes. Both corners of a node are stored in one row
+        return self._boxes[:, :3]
+
+    @property
+    def upper(self) -> np.ndarray:
+        # Upper corners of the node boxes
+        return self._boxes[:, 3:]
+
+    def _check_boxes(self, lower, upper) -> tuple:
+        # Boxes as two contiguous (M, 3) float64 arrays
+        lower = np.ascontiguousarray(lower, dtype=np.float64)
+        upper = np.ascontiguousarray(upper, dtype=np.float64)
+        if lower.size == 0 and upper.size == 0:
+            lower, upper = lower.reshape(0, 3), upper.reshape(0, 3)
+
+        # Raise an error if the boxes are not two (M, 3) arrays
+        if lower.ndim != 2 or lower.shape[1] != 3 or lower.shape != upper.shape:
+            self.logger.error("Boxes must be (M, 3) arrays of the same shape")
+            raise ValueError("Boxes must be (M, 3) arrays of the same shape")
+
+        return lower, upper
+
+    @classmethod
+    def _create(cls, primitives, pack: Callable, bounds: Callable, distances: Callable, leaf_size: int, method: str,
+                logger: Logger) -> BVH:
+        # A BVH that keeps its primitives packed into arrays, so it can be refit and measure distances to them
+        data = pack(primitives)
+        bvh = cls(*bounds(data), leaf_size=leaf_size, method=method, logger=logger)
+        bvh._data, bvh._pack, bvh._bounds, bvh._distances = data, pack, bounds, distances
+        return bvh
+
+    @classmethod
+    def from_points(cls, points, leaf_size: int = 4, method: str = "sah", logger: Logger = None) -> BVH:
+        """
+        Creates a BVH over points
+
+        >>> BVH.from_points([Point(0, 0, 0), Point(1, 2, 3), Point(5, 5, 5)]).closest(Point(4, 4, 4))
+        (array([1.73205081]), array([2]))
+
+
+        :param points: A list of Points, a PointArray or an (M, 3) array
+        :param leaf_size: Maximum number of primitives in a leaf
+        :param method: "sah" or "median"
+        :param logger: Logger to log
+        :return: The BVH
+        """
+        def pack(data) -> np.ndarray:
+            return PointArray(data, logger=logger).data
+
+        def bounds(data: np.ndarray) -> tuple:
+            return data, data
+
+        def distances(queries: np.ndarray, data: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return _mag(queries - data[primitives])
+
+        return cls._create(points, pack, bounds, distances, leaf_size, method, logger)
+
+    @classmethod
+    def from_segments(cls, segments, leaf_size: int = 4, method: str = "sah", logger: Logger = None) -> BVH:
+        """
+        Creates a BVH over line segments. Segments are given by their two end points,
+        as for Vector.from_points
+
+        >>> bvh = BVH.from_segments([(Point(0, 0, 0), Point(2, 0, 0)), (Point(0, 5, 0), Point(0, 5, 5))])
+        >>> bvh.closest(Point(1, 1, 0))
+        (array([1.]), array([0]))
+
+
+        :param segments: A list of (Point, Point) tuples or an (M, 2, 3) array of end points
+        :param leaf_size: Maximum number of primitives in a leaf
+        :param method: "sah" or "median"
+        :param logger: Logger to log
+        :return: The BVH
+        """
+        def pack(data) -> np.ndarray:
+            if isinstance(data, (list, tuple)) and len(data) > 0 and isinstance(data[0][0], Point):
+                data = [[[end.x, end.y, end.z] for end in segment] for segment in data]
+
+            return np.asarray(data, dtype=np.float64).reshape(-1, 2, 3)
+
+        def bounds(data: np.ndarray) -> tuple:
+            return np.minimum(data[:, 0], data[:, 1]), np.maximum(data[:, 0], data[:, 1])
+
+        def distances(queries: np.ndarray, data: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return _segment_distances(queries, data[primitives, 0], data[primitives, 1])
+
+        return cls._create(segments, pack, bounds, distances, leaf_size, method, logger)
+
+    @classmethod
+    def from_triangles(cls, triangles, leaf_size: int = 4, method: str = "sah", logger: Logger = None) -> BVH:
+        """
+        Creates a BVH over triangles
+
+        >>> BVH.from_triangles(TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]]))
+        BVH(primitives=1, nodes=1)
+
+
+        :param triangles: A TriangleMesh, a list of Triangles or an (M, 3, 3) array of corners
+        :param leaf_size: Maximum number of primitives in a leaf
+        :param method: "sah" or "median"
+        :param logger: Logger to log
+        :return: The BVH
+        """
+        def bounds(data: np.ndarray) -> tuple:
+            first, second, third = data[:, 0], data[:, 1], data[:, 2]
+            return np.minimum(np.minimum(first, second), third), np.maximum(np.maximum(first, second), third)
+
+        def distances(queries: np.ndarray, data: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return _triangle_distances(queries, data[primitives])
+
+        return cls._create(triangles, Triangle._pack, bounds, distances, leaf_size, method, logger)
+
+    @classmethod
+    def from_spheres(cls, spheres: list, leaf_size: int = 4, method: str = "sah", logger: Logger = None) -> BVH:
+        """
+        Creates a BVH over spheres
+
+        >>> BVH.from_spheres([Sphere(Point(0, 0, 0), 1), Sphere(Point(5, 0, 0), 2)]).upper[0]
+        array([7., 2., 2.])
+
+
+        :param spheres: A list of Spheres
+        :param leaf_size: Maximum number of primitives in a leaf
+        :param method: "sah" or "median"
+        :param logger: Logger to log
+        :return: The BVH
+        """
+        def bounds(data: tuple) -> tuple:
+            centers, radii = data
+            return centers - radii[:, None], centers + radii[:, None]
+
+        def distances(queries: np.ndarray, data: tuple, primitives: np.ndarray) -> np.ndarray:
+            centers, radii = data
+            return np.maximum(_mag(queries - centers[primitives]) - radii[primitives], 0)
+
+        return cls._create(spheres, Sphere._pack, bounds, distances, leaf_size, method, logger)
+
+    def _build(self) -> None:
+        # Split all nodes of a level at once. Each level sorts the primitives of every node being split
+        # along its own axis. Nodes keep their primitives as a contiguous run of order
+        count = len(self)
+        lower, upper = self._primitive_lower, self._primitive_upper
+        # Centers (and boxes for SAH) of the primitives in the order of the tree, moved along with order.
+        # One row for each coordinate, so reductions and gathers go over contiguous memory
+        columns = [(lower + upper) / 2] + ([lower, upper] if self.method == "sah" else [])
+        data = np.ascontiguousarray(np.concatenate(columns, axis=1).T)
+        order = np.arange(count)
+        starts, counts, levels = [np.zeros(1, dtype=np.int64)], [np.array([count])], []
+        total = 1
+        level = np.array([0]) if count > self.leaf_size else np.zeros(0, dtype=np.int64)
+        level_start, level_count = starts[0], counts[0]
+        while level.size > 0:
+            # Primitives of the nodes being split, node after node. Until leaves appear, that is all of them
+            segment = np.repeat(np.arange(level.size), level_count)
+            every = len(segment) == count
+            positions = None if every else _ranges(level_start, level_count)
+            offsets = _exclusive_cumsum(level_count)
+            block = data if every else data[:, positions]
+            low = np.minimum.reduceat(block[:3], offsets, axis=1)
+            extent = np.maximum.reduceat(block[:3], offsets, axis=1) - low
+            axis = np.argmax(extent, axis=0)
+            rows = np.arange(level.size)
+            # Position along the split axis scaled into [0, 0.5], so adding the node number keeps nodes apart
+            along = axis[segment]
+            key = np.where(along == 0, block[0], np.where(along == 1, block[1], block[2])) - low[axis, rows][segment]
+            width = 2 * extent[axis, rows][segment]
+            key = np.divide(key, width, out=np.zeros_like(key), where=width > 0)
+            sorting = np.argsort(segment + key)
+            key = key[sorting]
+            block = block[:, sorting]
+            if every:
+                order, data = order[sorting], block
+            else:
+                order[positions] = order[positions][sorting]
+                data[:, positions] = block
+
+            half = level_count // 2
+            large = level_count > _SAH_MIN
+            if self.method == "sah" and large.any():
+                chosen = large[segment]
+                if chosen.all():
+                    half = self._sah(block[3:6], block[6:], segment, key, level_count)
+                else:
+                    numbers = np.cumsum(large) - 1
+                    half[large] = self._sah(block[3:6, chosen], block[6:, chosen], numbers[segment[chosen]],
+                                            key[chosen], level_count[large])
+
+            # The primitives before the split go to the left child and the rest to the right one
+            child_start = np.stack([level_start, level_start + half], axis=1).reshape(-1)
+            child_count = np.stack([half, level_count - half], axis=1).reshape(-1)
+            child_ids = total + np.arange(2 * level.size)
+            levels.append((level, child_ids.reshape(-1, 2), axis))
+            starts.append(child_start)
+            counts.append(child_count)
+            total += 2 * level.size
+
+            split = child_count > self.leaf_size
+            level, level_start, level_count = child_ids[split], child_start[split], child_count[split]
+
+        self.order = order
+        self._depth = len(levels)
+        self._layout(np.concatenate(starts), np.concatenate(counts), levels, total if count > 0 else 0)
+        self._fit()
+
+    @staticmethod
+    def _sah(lower: np.ndarray, upper: np.ndarray, segment: np.ndarray, key: np.ndarray,
+             counts: np.ndarray) -> np.ndarray:
+        # Size of the left child of each node, where the surface area heuristic is lowest. Corners are given as rows.
+        # Primitives are sorted along the split axis, so the bins are runs of them. Splits between bins cost
+        # area of left box * primitives on the left + area of right box * primitives on the right
+        # No more bins than primitives in the largest node. Deep levels have many small nodes
+        nodes, width = len(counts), int(min(_BINS, counts.max()))
+        bins = segment * width + np.minimum((key * 2 * width).astype(np.int64), width - 1)
+        bin_counts = np.bincount(bins, minlength=nodes * width)
+        starts = np.minimum(_exclusive_cumsum(bin_counts), len(bins) - 1)
+        empty = (bin_counts == 0)[:, None]
+        bin_lower = np.where(empty, np.inf, np.minimum.reduceat(lower, starts, axis=1).T).reshape(nodes, width, 3)
+        bin_upper = np.where(empty, -np.inf, np.maximum.reduceat(upper, starts, axis=1).T).reshape(nodes, width, 3)
+
+        # Boxes and primitives on both sides of each split
+        left_area = _half_area(np.minimum.accumulate(bin_lower, axis=1), np.maximum.accumulate(bin_upper, axis=1))
+        right_area = _half_area(np.minimum.accumulate(bin_lower[:, ::-1], axis=1),
+                                np.maximum.accumulate(bin_upper[:, ::-1], axis=1))[:, ::-1]
+        left_count = np.cumsum(bin_counts.reshape(nodes, width), axis=1)
+        right_count = counts[:, None] - left_count
+        with np.errstate(invalid="ignore"):
+            cost = left_area[:, :-1] * left_count[:, :-1] + right_area[:, 1:] * right_count[:, :-1]
+
+        cost[(left_count[:, :-1] == 0) | (right_count[:, :-1] == 0)] = np.inf
+        split = np.argmin(cost, axis=1)
+        half = left_count[np.arange(nodes), split]
+        # All centers in one bin. Split at the median
+        return np.where(np.isfinite(cost.min(axis=1)), half, counts // 2)
+
+    def _layout(self, start: np.ndarray, count: np.ndarray, levels: list, total: int) -> None:
+        # Renumber the nodes in depth first order. A left child comes right after its parent,
+        # a right child after the whole left subtree
+        sizes = np.ones(len(start), dtype=np.int64)
+        for parents, children, _ in reversed(levels):
+            sizes[parents] += sizes[children[:, 0]] + sizes[children[:, 1]]
+
+        position = np.zeros(len(start), dtype=np.int64)
+        for parents, children, _ in levels:
+            position[children[:, 0]] = position[parents] + 1
+            position[children[:, 1]] = position[parents] + 1 + sizes[children[:, 0]]
+
+        self.start = np.empty(total, dtype=np.int64)
+        self.count = np.empty(total, dtype=np.int64)
+        self.right = np.full(total, -1, dtype=np.int64)
+        self.axis = np.full(total, -1, dtype=np.int64)
+        if total == 0:
+            # No primitives, no nodes
+            return
+
+        self.start[position] = start
+        self.count[position] = count
+        for parents, children, axis in levels:
+            self.right[position[parents]] = position[children[:, 1]]
+            self.axis[position[parents]] = axis
+
+    def _fit(self) -> None:
+        # Boxes of the nodes from the boxes of the primitives in their ranges
+        # reduceat over interleaved (start, end) indices reduces each range at the even positions.
+        # A sentinel row keeps the end of the last range a valid index
+        self._boxes = np.zeros((len(self.right), 6))
+        if len(self.right) == 0:
+            return
+
+        bounds = np.stack([self.start, self.start + self.count], axis=1).reshape(-1)
+        for columns, primitives, reduce in ((slice(0, 3), self._primitive_lower, np.minimum),
+                                            (slice(3, 6), self._primitive_upper, np.maximum)):
+            sorted_boxes = np.concatenate([primitives[self.order], np.zeros((1, 3))])
+            self._boxes[:, columns] = reduce.reduceat(sorted_boxes, bounds, axis=0)[::2]
+
+    def refit(self, primitives) -> BVH:
+        """
+        Updates the node boxes to primitives that moved, keeping the tree. Much faster than building it again.
+        The tree gets slower to walk as the primitives move far from where they were when it was built
+
+        >>> bvh = BVH.from_points([[0, 0, 0], [1, 1, 1]])
+        >>> bvh.refit([[0, 0, 0], [2, 2, 2]]).upper[0]
+        array([2., 2., 2.])
+
+
+        :param primitives: The moved primitives, in the same order and form as given to build the BVH.
+        A (lower, upper) tuple for a BVH built from boxes
+        :return: The BVH itself
+        """
+        self.logger.info("Refitting BVH")
+        data = self._pack(primitives)
+        lower, upper = self._bounds(data)
+        # Raise an error if the number of primitives changed
+        if lower.shape != self._primitive_lower.shape:
+            self.logger.error("Refit must keep the number of primitives")
+            raise ValueError("Refit must keep the number of primitives")
+
+        self._primitive_lower, self._primitive_upper = lower, upper
+        if self._distances is not None:
+            self._data = data
+
+        self._fit()
+        return self
+
+    def _traverse(self, total: int, enter: Callable, leaves: Callable, forward: Callable) -> None:
+        # Walk the tree for total items (rays or points) together, one node each at a step, depth first.
+        # enter(items, nodes) tells which nodes are worth going into, leaves(items, nodes) tests the primitives of
+        # the leaves reached and forward(items, nodes) tells which items go into the left child first
+        if len(self.right) == 0:
+            return
+
+        for first in range(0, total, _CHUNK):
+            items = np.arange(first, min(first + _CHUNK, total))
+            # Nodes still to visit of each item. The children skipped on the way down
+            stack = np.empty((len(items), self._depth + 1), dtype=np.int64)
+            size = np.zeros(len(items), dtype=np.int64)
+            nodes = np.zeros(len(items), dtype=np.int64)
+            slots = np.arange(len(items))
+            while slots.size > 0:
+                item = items[slots]
+                visit = enter(item, nodes)
+                right = self.right[nodes]
+                leaf = visit & (right < 0)
+                if leaf.any():
+                    leaves(item[leaf], nodes[leaf])
+
+                # Go down into the nearer child and keep the other one for later
+                down = visit & ~leaf
+                left, right = nodes[down] + 1, right[down]
+                ahead = forward(item[down], nodes[down])
+                down_slots = slots[down]
+                stack[down_slots, size[down_slots]] = np.where(ahead, right, left)
+                size[down_slots] += 1
+                nodes[down] = np.where(ahead, left, right)
+
+                # Go back to the last node kept. Items with no nodes left are done
+                back = np.flatnonzero(~down)
+                back = back[size[slots[back]] > 0]
+                size[slots[back]] -= 1
+                nodes[back] = stack[slots[back], size[slots[back]]]
+                down[back] = True
+                slots, nodes = slots[down], nodes[down]
+
+    def _keep_closest(self, items: np.ndarray, nodes: np.ndarray, measure: Callable, best: np.ndarray,
+                      best_index: np.ndarray) -> None:
+        # Measure the items against the primitives of the leaves they reached and keep the closer ones
+        counts = self.count[nodes]
+        pair_items = np.repeat(items, counts)
+        primitives = self.order[_ranges(self.start[nodes], counts)]
+        values = measure(pair_items, primitives)
+        closer = values < best[pair_items]
+        pair_items, primitives, values = pair_items[closer], primitives[closer], values[closer]
+        # An item may reach many primitives. Keep the closest one of each item
+        sorting = np.lexsort((values, pair_items))
+        sorted_items = pair_items[sorting]
+        first = np.ones(len(sorting), dtype=bool)
+        first[1:] = sorted_items[1:] != sorted_items[:-1]
+        chosen = sorting[first]
+        best[pair_items[chosen]] = values[chosen]
+        best_index[pair_items[chosen]] = primitives[chosen]
+
+    def cast(self, origins: np.ndarray, directions: np.ndarray,
+             intersect_pairs: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> tuple:
+        """
+        Returns the closest primitive each ray hits. All rays walk the tree together, depth first and into the
+        nearer child first. Nodes farther than the closest hit found so far are skipped.
+        RayArray.intersect uses it for spheres and triangles
+
+        >>> bvh = BVH([[0, -1, -1], [4, -1, -1]], [[1, 1, 1], [5, 1, 1]], leaf_size=1)
+        >>> only_second = lambda rays, primitives: np.where(primitives == 1, 4.0, np.inf)
+        >>> bvh.cast(np.zeros((1, 3)), np.array([[1., 0, 0]]), only_second)
+        (array([4.]), array([1]))
+
+
+        :param origins: Origins of the rays as an (R, 3) array
+        :param directions: Directions of the rays as an (R, 3) array
+        :param intersect_pairs: A function taking ray indices and primitive indices of the same length,
+        returning the distance of each ray to each primitive along the ray. inf for misses
+        :return: Distances as an (R,) array, inf for misses, and primitive indices as an (R,) array, -1 for misses
+        """
+        best_t = np.full(len(origins), np.inf)
+        best_index = np.full(len(origins), -1, dtype=np.int64)
+        with np.errstate(divide="ignore"):
+            inverse = 1 / directions
+
+        # The origin and inverse direction of a ray repeated to match both corners of a node box
+        frames = np.concatenate([origins, origins], axis=1)
+        scales = np.concatenate([inverse, inverse], axis=1)
+
+        def enter(rays: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+            # Slab test. An axis the ray does not move along gives nan or inf. fmin and fmax ignore nan
+            with np.errstate(invalid="ignore"):
+                planes = (self._boxes[nodes] - frames[rays]) * scales[rays]
+
+            lows, highs = np.fmin(planes[:, :3], planes[:, 3:]), np.fmax(planes[:, :3], planes[:, 3:])
+            near = np.fmax(np.fmax(lows[:, 0], lows[:, 1]), lows[:, 2])
+            far = np.fmin(np.fmin(highs[:, 0], highs[:, 1]), highs[:, 2])
+            return (far >= np.maximum(near, 0)) & (near <= best_t[rays])
+
+        def leaves(rays: np.ndarray, nodes: np.ndarray) -> None:
+            self._keep_closest(rays, nodes, intersect_pairs, best_t, best_index)
+
+        def forward(rays: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+            # The left child holds the lower part along the split axis
+            return directions[rays, self.axis[nodes]] >= 0
+
+        self._traverse(len(origins), enter, leaves, forward)
+        return best_t, best_index
+
+    def closest(self, points) -> tuple:
+        """
+        Returns the closest primitive to each point and its distance. For a BVH built from boxes,
+        the distance to the boxes of the primitives
+
+        >>> bvh = BVH.from_triangles(np.array([[[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 0, 5], [1, 0, 5], [0, 1, 5]]]))
+        >>> bvh.closest([[0.2, 0.2, 1], [3, 0, 4]])
+        (array([1.        , 2.23606798]), array([0, 1]))
+
+
+        :param points: A Point, a list of Points, a PointArray or an (N, 3) array
+        :return: Distances as an (N,) array and primitive indices as an (N,) array. inf and -1 if there are no
+        primitives
+        """
+        self.logger.info("Finding closest primitives")
+        queries = PointArray(points, logger=self.logger).data
+        best = np.full(len(queries), np.inf)
+        best_index = np.full(len(queries), -1, dtype=np.int64)
+        centers = self.lower + self.upper
+
+        def measure(items: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            if self._distances is not None:
+                return self._distances(queries[items], self._data, primitives)
+
+            gap = np.maximum(np.maximum(self._primitive_lower[primitives] - queries[items], 0),
+                             queries[items] - self._primitive_upper[primitives])
+            return _mag(gap)
+
+        def enter(items: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+            # Skip nodes whose box is farther than the closest primitive found so far
+            boxes, points = self._boxes[nodes], queries[items]
+            gap = np.maximum(np.maximum(boxes[:, :3] - points, 0), points - boxes[:, 3:])
+            return _dot(gap, gap) <= best[items] * best[items]
+
+        def leaves(items: np.ndarray, nodes: np.ndarray) -> None:
+            self._keep_closest(items, nodes, measure, best, best_index)
+
+        def forward(items: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+            # Points on the lower side of the middle of the two children go left first
+            axis = self.axis[nodes]
+            middle = centers[nodes + 1, axis] + centers[self.right[nodes], axis]
+            return 4 * queries[items, axis] <= middle
+
+        self._traverse(len(queries), enter, leaves, forward)
+        return best, best_index
+
+    def overlaps(self, lower, upper) -> tuple:
+        """
+        Returns the primitives whose boxes overlap the given boxes. Touching boxes overlap
+
+        >>> bvh = BVH.from_points([[0, 0, 0], [1, 1, 1], [5, 5, 5]])
+        >>> bvh.overlaps(Point(0.5, 0.5, 0.5), Point(6, 6, 6))
+        (array([0, 0]), array([1, 2]))
+
+
+        :param lower: Lower corners of the boxes. A Point, a PointArray or an (N, 3) array
+        :param upper: Upper corners of the boxes. A Point, a PointArray or an (N, 3) array
+        :return: Indices of the boxes and indices of the primitives of the overlapping pairs,
+        sorted by box and then by primitive
+        """
+        self.logger.info("Finding overlapping primitives")
+        lower, upper = self._check_boxes(PointArray(lower, logger=self.logger).data,
+                                         PointArray(upper, logger=self.logger).data)
+        found_boxes, found_primitives = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for first in range(0, len(lower) if len(self.right) > 0 else 0, _CHUNK):
+            # Every overlapping node is visited. Walk level by level, each box with all of its nodes at once
+            boxes = np.arange(first, min(first + _CHUNK, len(lower)))
+            nodes = np.zeros(len(boxes), dtype=np.int64)
+            while boxes.size > 0:
+                overlap = (lower[boxes] <= self.upper[nodes]).all(axis=1) & \
+                          (upper[boxes] >= self.lower[nodes]).all(axis=1)
+                boxes, nodes = boxes[overlap], nodes[overlap]
+                right = self.right[nodes]
+                leaf = right < 0
+                counts = self.count[nodes[leaf]]
+                pair_boxes = np.repeat(boxes[leaf], counts)
+                primitives = self.order[_ranges(self.start[nodes[leaf]], counts)]
+                overlap = (lower[pair_boxes] <= self._primitive_upper[primitives]).all(axis=1) & \
+                          (upper[pair_boxes] >= self._primitive_lower[primitives]).all(axis=1)
+                found_boxes.append(pair_boxes[overlap])
+                found_primitives.append(primitives[overlap])
+
+                inner = ~leaf
+                boxes = np.repeat(boxes[inner], 2)
+                nodes = np.stack([nodes[inner] + 1, right[inner]], axis=1).reshape(-1)
+
+        found_boxes, found_primitives = np.concatenate(found_boxes), np.concatenate(found_primitives)
+        sorting = np.lexsort((found_primitives, found_boxes))
+        return found_boxes[sorting], found_primitives[sorting]
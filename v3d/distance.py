@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from .point_array import PointArray
+from .bvh import BVH, _ranges
+
+# Arrays as large as a block that are alive while a block is calculated: the block, a temporary and the indices
+# of a top-k selection
+_BLOCK_ARRAYS = 3
+# Offsets of the neighbouring grid cells searched for the closest pair. Only half of them, so each pair of cells is
+# searched once, and the cell itself
+_NEIGHBOURS = np.array([(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)
+                        if (x, y, z) > (0, 0, 0)] + [(0, 0, 0)], dtype=np.int64)
+
+
+def _spread(values: np.ndarray) -> np.ndarray:
+    # Spreads the 21 low bits of the values so two zero bits follow each bit. Three spread values interleave
+    values = values.astype(np.uint64)
+    for shift, mask in ((32, 0x1f00000000ffff), (16, 0x1f0000ff0000ff), (8, 0x100f00f00f00f00f),
+                        (4, 0x10c30c30c30c30c3), (2, 0x1249249249249249)):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+
+    return values
+
+
+def _hash(cells: np.ndarray) -> np.ndarray:
+    # One integer for each grid cell. Different cells may get the same integer, so a match is checked cell by cell
+    return (cells[:, 0] * 73856093) ^ (cells[:, 1] * 19349663) ^ (cells[:, 2] * 83492791)
+
+
+def _find_cells(cells: np.ndarray, keys: np.ndarray, by_key: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    # Index of each target in the distinct cells, -1 if it is not one of them. keys are the sorted hashes of the
+    # cells and by_key the cells in that order. Cells with the same hash as a target are compared one after another
+    target_keys = _hash(targets)
+    # Sorted targets are found much faster, each search starts where the last one ended
+    order = np.argsort(target_keys)
+    positions = np.empty(len(targets), dtype=np.int64)
+    positions[order] = np.searchsorted(keys, target_keys[order])
+    found = np.full(len(targets), -1, dtype=np.int64)
+    pending = np.arange(len(targets))
+    while pending.size > 0:
+        positions_of = positions[pending]
+        # Stop at the end of the run of the same hash
+        inside = positions_of < len(keys)
+        pending, positions_of = pending[inside], positions_of[inside]
+        inside = keys[positions_of] == target_keys[pending]
+        pending, positions_of = pending[inside], positions_of[inside]
+        candidates = by_key[positions_of]
+        same = np.all(cells[candidates] == targets[pending], axis=1)
+        found[pending[same]] = candidates[same]
+        pending = pending[~same]
+        positions[pending] = positions_of[~same] + 1
+
+    return found
+
+
+class Distances:
+    logger = getLogger('dummy')
+
+    def __init__(self, points, other=None, squared: bool = False, memory: int = 64 * 1024 * 1024,
+                 logger: Logger = None) -> None:
+        """
+        Constructor method. Distances between all pairs of points, or from each point to each of the other points.
+        The distance matrix is calculated in blocks of rows, so the memory used never exceeds the given budget.
+        Distances are the same as Point.dist
+
+        >>> distances = Distances([[0, 0, 0], [3, 4, 0], [0, 0, 1]])
+        >>> distances
+        Distances(rows=3, columns=3, squared=False)
+        >>> distances.matrix()
+        array([[0.        , 5.        , 1.        ],
+               [5.        , 0.        , 5.09901951],
+               [1.        , 5.09901951, 0.        ]])
+        >>> distances.closest_pair()
+        (1.0, 0, 2)
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :param other: Points to measure the distances to, as anything PointArray accepts.
+        Distances between the points themselves if not given
+        :param squared: Return squared distances. Faster, no square roots
+        :param memory: Memory budget of a block in bytes
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if memory is not a positive integer
+        if not isinstance(memory, (int, np.integer)) or memory < 1:
+            self.logger.error("Memory must be a positive integer")
+            raise ValueError("Memory must be a positive integer")
+
+        self.points = PointArray(points, logger=self.logger)
+        self.other = None if other is None else PointArray(other, logger=self.logger)
+        self.squared = squared
+        self.memory = int(memory)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        rows, columns = self.shape
+        return f"{self.__class__.__name__}(rows={rows}, columns={columns}, squared={self.squared})"
+
+    @property
+    def shape(self) -> tuple:
+        # Shape of the distance matrix
+        return len(self.points), len(self._columns)
+
+    @property
+    def _columns(self) -> np.ndarray:
+        # Points of the columns of the matrix
+        return self.points.data if self.other is None else self.other.data
+
+    def _rows_per_block(self) -> int:
+        # Rows of a block that fit in the memory budget. At least one
+        return max(1, self.memory // (_BLOCK_ARRAYS * 8 * max(1, len(self._columns))))
+
+    def _block(self, rows: np.ndarray) -> np.ndarray:
+        # Distances from the rows to all columns. Same order of operations as Point.dist
+        columns = self._columns
+        block = np.subtract.outer(rows[:, 0], columns[:, 0])
+        np.multiply(block, block, out=block)
+        temporary = np.empty_like(block)
+        for axis in (1, 2):
+            np.subtract.outer(rows[:, axis], columns[:, axis], out=temporary)
+            np.multiply(temporary, temporary, out=temporary)
+            block += temporary
+
+        return block if self.squared else np.sqrt(block, out=block)
+
+    def blocks(self):
+        """
+        Yields the distance matrix block by block, each block a run of rows
+
+        >>> [(start, block.shape) for start, block in Distances(np.zeros((5, 3)), memory=100).blocks()]
+        [(0, (1, 5)), (1, (1, 5)), (2, (1, 5)), (3, (1, 5)), (4, (1, 5))]
+
+
+        :return: A generator of (first row, block) tuples. Blocks are (rows, M) arrays
+        """
+        self.logger.info("Calculating distances in blocks")
+        data, step = self.points.data, self._rows_per_block()
+        for start in range(0, len(data), step):
+            yield start, self._block(data[start:start + step])
+
+    def matrix(self, out: np.ndarray = None) -> np.ndarray:
+        """
+        Returns the whole distance matrix. Give a numpy.memmap as out for matrices larger than the memory
+
+        >>> Distances([[0, 0, 0], [1, 0, 0]], [[0, 2, 0]], squared=True).matrix()
+        array([[4.],
+               [5.]])
+
+
+        :param out: An (N, M) array to write the matrix in
+        :return: The (N, M) matrix
+        """
+        if out is None:
+            out = np.empty(self.shape)
+
+        # Raise an error if out can not hold the matrix
+        if out.shape != self.shape:
+            self.logger.error("Output must be an array of shape {}".format(self.shape))
+            raise ValueError("Output must be an array of shape {}".format(self.shape))
+
+        for start, block in self.blocks():
+            out[start:start + len(block)] = block
+
+        return out
+
+    def nearest(self, k: int = 1) -> tuple:
+        """
+        Returns the k closest columns of each row, closest first. Only k of each row are kept while the blocks
+        stream by. Between the points themselves, a point is not its own neighbour
+
+        >>> Distances([[0, 0, 0], [1, 0, 0], [5, 0, 0]]).nearest(k=2)
+        (array([[1., 5.],
+               [1., 4.],
+               [4., 5.]]), array([[1, 2],
+               [0, 2],
+               [1, 0]]))
+
+
+        :param k: Number of neighbours
+        :return: Distances and indices as (N, k) arrays. k is at most the number of possible neighbours
+        """
+        self.logger.info("Finding nearest neighbours")
+        # Raise an error if k is not a positive integer
+        if not isinstance(k, (int, np.integer)) or k < 1:
+            self.logger.error("k must be a positive integer")
+            raise ValueError("k must be a positive integer")
+
+        rows, columns = self.shape
+        own = self.other is None
+        k = max(0, min(k, columns - 1 if own else columns))
+        distances = np.empty((rows, k))
+        indices = np.empty((rows, k), dtype=np.int64)
+        if k == 0:
+            return distances, indices
+
+        for start, block in self.blocks():
+            lines = np.arange(len(block))
+            if own:
+                # A point is at zero distance to itself
+                block[lines, start + lines] = np.inf
+
+            chosen = np.argpartition(block, k - 1, axis=1)[:, :k] if k < columns else \
+                np.broadcast_to(np.arange(columns), block.shape)
+            values = np.take_along_axis(block, chosen, axis=1)
+            # Closest first. Equal distances by index
+            order = np.lexsort((chosen, values), axis=1)
+            distances[start:start + len(block)] = np.take_along_axis(values, order, axis=1)
+            indices[start:start + len(block)] = np.take_along_axis(chosen, order, axis=1)
+
+        return distances, indices
+
+    def closest_pair(self) -> tuple:
+        """
+        Returns the closest pair. Between the points themselves, the two closest different points in
+        O(N log N) expected time: points consecutive along a space filling curve give an upper bound of the distance,
+        and only points in neighbouring cells of a grid that fine are compared. Between the points and the other
+        points, the closest other point of each point through a BVH
+
+        >>> Distances([[0, 0, 0], [5, 5, 5], [1, 1, 1], [5, 5, 6]]).closest_pair()
+        (1.0, 1, 3)
+        >>> Distances([[0, 0, 0], [5, 5, 5]], [[9, 9, 9], [1, 1, 1]], squared=True).closest_pair()
+        (3.0, 0, 1)
+
+
+        :return: Distance, row index and column index of the closest pair. Row index is the smaller one
+        between the points themselves
+        """
+        self.logger.info("Finding the closest pair")
+        rows, columns = self.shape
+        own = self.other is None
+        # Raise an error if there is no pair
+        if rows == 0 or columns < (2 if own else 1):
+            self.logger.error("Not enough points for a pair")
+            raise ValueError("Not enough points for a pair")
+
+        if own:
+            first, second = self._closest_own_pair()
+        else:
+            distances, indices = BVH.from_points(self._columns, logger=self.logger).closest(self.points.data)
+            first = int(np.argmin(distances))
+            second = int(indices[first])
+
+        x, y, z = (self.points.data[first] - self._columns[second]).tolist()
+        distance = x * x + y * y + z * z
+        return (distance if self.squared else float(np.sqrt(distance))), first, second
+
+    def _closest_own_pair(self) -> tuple:
+        # Indices of the closest pair of different points
+        data = self.points.data
+        low = data.min(axis=0)
+        span = float((data.max(axis=0) - low).max())
+        if span == 0:
+            # All points are the same
+            return 0, 1
+
+        # Upper bound: the closest of the points consecutive along a Morton curve
+        cells = ((data - low) * ((2 ** 21 - 1) / span)).astype(np.int64)
+        curve = np.argsort(_spread(cells[:, 0]) | (_spread(cells[:, 1]) << np.uint64(1)) |
+                           (_spread(cells[:, 2]) << np.uint64(2)))
+        best, pair = self._closest_of(curve[:-1], curve[1:], np.inf, None)
+        if best == 0:
+            return pair
+
+        # Any closer pair is in the same or in neighbouring cells of a grid with cells as large as the bound.
+        # A little larger, so rounding can not move a pair two cells apart
+        cells = np.floor((data - low) / (np.sqrt(best) * (1 + 1e-9))).astype(np.int64)
+        # Points sorted by cell. Each run of the same cell is a group
+        order = np.lexsort((cells[:, 2], cells[:, 1], cells[:, 0]))
+        sorted_cells = cells[order]
+        first_of_cell = np.ones(len(order), dtype=bool)
+        first_of_cell[1:] = np.any(sorted_cells[1:] != sorted_cells[:-1], axis=1)
+        starts = np.flatnonzero(first_of_cell)
+        counts = np.diff(np.append(starts, len(order)))
+        occupied = sorted_cells[starts]
+        hashes = _hash(occupied)
+        by_key = np.argsort(hashes, kind="stable")
+        keys = hashes[by_key]
+        for offset in _NEIGHBOURS:
+            if not offset.any():
+                # Pairs in the same cell. Each point with the points after it
+                sizes = np.repeat(counts, counts)
+                first = np.repeat(np.arange(len(order)), sizes)
+                second = _ranges(np.repeat(starts, counts), sizes)
+                keep = second > first
+                first, second = first[keep], second[keep]
+            else:
+                # Pairs of a cell and its neighbour
+                found = _find_cells(occupied, keys, by_key, occupied + offset)
+                cell = np.flatnonzero(found >= 0)
+                neighbour = found[cell]
+                # Every point of the cell with every point of the neighbour
+                points = _ranges(starts[cell], counts[cell])
+                partners = np.repeat(counts[neighbour], counts[cell])
+                first = np.repeat(points, partners)
+                second = _ranges(np.repeat(starts[neighbour], counts[cell]), partners)
+
+            best, pair = self._closest_of(order[first], order[second], best, pair)
+
+        return pair
+
+    def _closest_of(self, first: np.ndarray, second: np.ndarray, best: float, pair) -> tuple:
+        # The closest of the given pairs if it is closer than best, in chunks within the memory budget
+        data, step = self.points.data, max(1, self.memory // (_BLOCK_ARRAYS * 8 * 3))
+        for start in range(0, len(first), step):
+            a, b = first[start:start + step], second[start:start + step]
+            difference = data[a] - data[b]
+            distances = difference[:, 0] * difference[:, 0] + difference[:, 1] * difference[:, 1] + \
+                difference[:, 2] * difference[:, 2]
+            if distances.size > 0 and distances.min() < best:
+                closest = int(np.argmin(distances))
+                best = float(distances[closest])
+                pair = tuple(sorted((int(a[closest]), int(b[closest]))))
+
+        return best, pair
@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+from logging import getLogger
+from logging import Logger
+
+import itertools
+import warnings
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .point import Point
+from .point_array import PointArray
+
+# PLY property types and their numpy types
+_PLY_TYPES = {"char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+              "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+              "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+              "float": "f4", "float32": "f4", "double": "f8", "float64": "f8"}
+# Byte order of each PLY format. None for text
+_PLY_FORMATS = {"ascii": None, "binary_little_endian": "<", "binary_big_endian": ">"}
+# Width the vertex count is padded to, so a streamed PLY header can be rewritten in place
+_PLY_COUNT_WIDTH = 20
+# Rows formatted at once by the writers. Bounds the memory of the text of a large chunk
+_WRITE_CHUNK_SIZE = 65536
+
+
+class _Reader(ABC):
+    logger = getLogger('dummy')
+
+    def __init__(self, path: str, chunk_size: int = 65536, logger: Logger = None) -> None:
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if chunk size is not positive
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            self.logger.error("Chunk size must be a positive integer")
+            raise ValueError("Chunk size must be a positive integer")
+
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}', chunk_size={self.chunk_size})"
+
+    def __iter__(self):
+        return self.read()
+
+    @abstractmethod
+    def _chunks(self):
+        # Yields (N, 3) float64 arrays of at most chunk_size rows
+        ...
+
+    def _parse(self, lines: list, **kwargs) -> np.ndarray:
+        # Parses text lines to an (N, 3) float64 array
+        try:
+            with warnings.catch_warnings():
+                # Chunks of only comments or empty lines are not an error
+                warnings.simplefilter("ignore", UserWarning)
+                return np.loadtxt(lines, dtype=np.float64, ndmin=2, **kwargs).reshape(-1, 3)
+        except ValueError as error:
+            # Raise an error if a line is not numeric
+            self.logger.error("Could not parse {}: {}".format(self.path, error))
+            raise ValueError("Could not parse {}: {}".format(self.path, error))
+
+    def read(self, as_points: bool = False):
+        """
+        Reads the file chunk by chunk. Only one chunk is kept in memory
+
+        :param as_points: If True, yield lists of Points instead of PointArrays
+        :return: Generator of PointArrays, or of lists of Points, of at most chunk_size points
+        """
+        self.logger.info("Reading {}".format(self.path))
+        for data in self._chunks():
+            if len(data) == 0:
+                continue
+
+            points = PointArray(data, logger=self.logger)
+            yield points.to_points() if as_points else points
+
+    def to_array(self) -> PointArray:
+        """
+        Reads all points of the file into one PointArray
+
+        :return: The points
+        """
+        chunks = [points.data for points in self.read()]
+        return PointArray(np.concatenate(chunks) if chunks else None, logger=self.logger)
+
+
+class _Writer(ABC):
+    logger = getLogger('dummy')
+    binary = False
+
+    def __init__(self, path: str, logger: Logger = None) -> None:
+        if logger is not None:
+            self.logger = logger
+
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb" if self.binary else "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _data(self, data) -> np.ndarray:
+        # Converts a chunk to an (N, 3) float64 array
+        return PointArray(data, logger=self.logger).data
+
+    @abstractmethod
+    def _write(self, data: np.ndarray) -> None:
+        # Writes an (N, 3) array to the file
+        ...
+
+    def append(self, data) -> None:
+        """
+        Appends points to the end of the file
+
+        :param data: A list of Points, a PointArray or an (N, 3) array
+        """
+        data = self._data(data)
+        for start in range(0, len(data), _WRITE_CHUNK_SIZE):
+            self._write(data[start:start + _WRITE_CHUNK_SIZE])
+
+        self.count += len(data)
+
+    def close(self) -> None:
+        """
+        Closes the file
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    @classmethod
+    def write(cls, path: str, data, **kwargs) -> None:
+        """
+        Writes points to a file at once
+
+        :param path: Path of the file
+        :param data: A list of Points, a PointArray, an (N, 3) array or an iterable of any of them
+        :param kwargs: Options of the writer
+        """
+        with cls(path, **kwargs) as writer:
+            # A single chunk. Anything else is an iterable of chunks
+            if isinstance(data, (PointArray, np.ndarray)) or \
+                    (isinstance(data, (list, tuple)) and (len(data) == 0 or isinstance(data[0], Point))):
+                writer.append(data)
+            else:
+                for chunk in data:
+                    writer.append(chunk)
+
+    @staticmethod
+    def _lines(data: np.ndarray, delimiter: str) -> str:
+        # Shortest text that reads back to the same float, for each value
+        return "".join(f"{x!r}{delimiter}{y!r}{delimiter}{z!r}\n" for x, y, z in data.tolist())
+
+
+class XYZReader(_Reader):
+    def __init__(self, path: str, chunk_size: int = 65536, logger: Logger = None) -> None:
+        """
+        Constructor method. Reads XYZ text files: one point per line as whitespace separated x, y and z.
+        Columns after z are ignored. Lines starting with # are comments
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.xyz")
+        >>> XYZWriter.write(path, [Point(1, 2, 3), Point(4, 5, 6)])
+        >>> for chunk in XYZReader(path, chunk_size=1):
+        ...     chunk
+        PointArray([[1., 2., 3.]])
+        PointArray([[4., 5., 6.]])
+
+
+        :param path: Path of the file
+        :param chunk_size: Points in each chunk
+        :param logger: Logger to log
+        """
+        super().__init__(path, chunk_size=chunk_size, logger=logger)
+
+    def _chunks(self):
+        with open(self.path) as f:
+            while True:
+                lines = list(itertools.islice(f, self.chunk_size))
+                if not lines:
+                    return
+
+                yield self._parse(lines, usecols=(0, 1, 2), comments="#")
+
+
+class XYZWriter(_Writer):
+    def __init__(self, path: str, logger: Logger = None) -> None:
+        """
+        Constructor method. Writes XYZ text files.
+        Values are written with as many digits as needed to read them back exactly
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.xyz")
+        >>> with XYZWriter(path) as writer:
+        ...     writer.append(PointArray([[0.1, 2, 3]]))
+        >>> print(open(path).read())
+        0.1 2.0 3.0
+        <BLANKLINE>
+
+
+        :param path: Path of the file
+        :param logger: Logger to log
+        """
+        super().__init__(path, logger=logger)
+
+    def _write(self, data: np.ndarray) -> None:
+        self._file.write(self._lines(data, " "))
+
+
+class CSVReader(_Reader):
+    def __init__(self, path: str, columns: tuple = ("x", "y", "z"), delimiter: str = ",", header: bool = True,
+                 chunk_size: int = 65536, logger: Logger = None) -> None:
+        """
+        Constructor method. Reads CSV files. Columns are mapped to x, y and z by their names in the header or by index
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "stars.csv")
+        >>> with open(path, "w") as f:
+        ...     _ = f.write("id,ra_x,ra_y,ra_z\\n7,1,2,3\\n")
+        >>> CSVReader(path, columns=("ra_x", "ra_y", "ra_z")).to_array()
+        PointArray([[1., 2., 3.]])
+
+
+        :param path: Path of the file
+        :param columns: Names (if the file has a header) or indices of the x, y and z columns
+        :param delimiter: Column separator
+        :param header: If True, the first line holds the column names
+        :param chunk_size: Points in each chunk
+        :param logger: Logger to log
+        """
+        super().__init__(path, chunk_size=chunk_size, logger=logger)
+        # Raise an error if columns are not three names or indices
+        if len(columns) != 3 or not (all(isinstance(column, str) for column in columns) and header or
+                                     all(isinstance(column, int) for column in columns)):
+            self.logger.error("Columns must be three indices, or three names if the file has a header")
+            raise ValueError("Columns must be three indices, or three names if the file has a header")
+
+        self.columns = columns
+        self.delimiter = delimiter
+        self.header = header
+
+    def _indices(self, line: str) -> tuple:
+        # Returns indices of the x, y and z columns for the header line
+        if all(isinstance(column, int) for column in self.columns):
+            return tuple(self.columns)
+
+        names = [name.strip().strip('"') for name in line.rstrip("\r\n").split(self.delimiter)]
+        for column in self.columns:
+            # Raise an error if a column is not in the header
+            if column not in names:
+                self.logger.error("{} is not a column of {}".format(column, self.path))
+                raise ValueError("{} is not a column of {}".format(column, self.path))
+
+        return tuple(names.index(column) for column in self.columns)
+
+    def _chunks(self):
+        with open(self.path, newline="") as f:
+            columns = self._indices(f.readline()) if self.header else tuple(self.columns)
+            while True:
+                lines = list(itertools.islice(f, self.chunk_size))
+                if not lines:
+                    return
+
+                yield self._parse(lines, usecols=columns, delimiter=self.delimiter, quotechar='"')
+
+
+class CSVWriter(_Writer):
+    def __init__(self, path: str, columns: tuple = ("x", "y", "z"), delimiter: str = ",", header: bool = True,
+                 logger: Logger = None) -> None:
+        """
+        Constructor method. Writes CSV files with x, y and z columns
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.csv")
+        >>> CSVWriter.write(path, [Point(1, 2, 3)])
+        >>> print(open(path).read())
+        x,y,z
+        1.0,2.0,3.0
+        <BLANKLINE>
+
+
+        :param path: Path of the file
+        :param columns: Names of the x, y and z columns
+        :param delimiter: Column separator
+        :param header: If True, write the column names as the first line
+        :param logger: Logger to log
+        """
+        super().__init__(path, logger=logger)
+        self.delimiter = delimiter
+        if header:
+            self._file.write(delimiter.join(columns) + "\n")
+
+    def _write(self, data: np.ndarray) -> None:
+        self._file.write(self._lines(data, self.delimiter))
+
+
+class PLYReader(_Reader):
+    def __init__(self, path: str, chunk_size: int = 65536, logger: Logger = None) -> None:
+        """
+        Constructor method. Reads vertices of ASCII and binary PLY files. Other elements, such as faces, are ignored
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.ply")
+        >>> PLYWriter.write(path, [Point(1, 2, 3)])
+        >>> PLYReader(path).format
+        'binary_little_endian'
+        >>> PLYReader(path).to_array()
+        PointArray([[1., 2., 3.]])
+
+
+        :param path: Path of the file
+        :param chunk_size: Points in each chunk
+        :param logger: Logger to log
+        """
+        super().__init__(path, chunk_size=chunk_size, logger=logger)
+        self._read_header()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}', vertices={self.count}, format={self.format})"
+
+    def _error(self, message: str) -> None:
+        self.logger.error("{} {}".format(self.path, message))
+        raise ValueError("{} {}".format(self.path, message))
+
+    def _read_header(self) -> None:
+        # Reads format, elements and where the vertices start
+        with open(self.path, "rb") as f:
+            if f.readline().strip() != b"ply":
+                self._error("is not a PLY file")
+
+            self.format = None
+            # Name, count and properties ((name, type) or None for a list) of each element
+            elements = []
+            for line in f:
+                words = line.decode("ascii", errors="replace").split()
+                if not words or words[0] in ("comment", "obj_info"):
+                    continue
+                elif words[0] == "end_header":
+                    break
+                elif words[0] == "format" and len(words) > 1 and words[1] in _PLY_FORMATS:
+                    self.format = words[1]
+                elif words[0] == "element" and len(words) == 3:
+                    elements.append((words[1], int(words[2]), []))
+                elif words[0] == "property" and elements and len(words) > 2:
+                    if words[1] == "list":
+                        elements[-1][2].append(None)
+                    elif words[1] in _PLY_TYPES:
+                        elements[-1][2].append((words[2], _PLY_TYPES[words[1]]))
+                    else:
+                        self._error("has an unknown property type {}".format(words[1]))
+                else:
+                    self._error("has an invalid header line {}".format(line.strip()))
+            else:
+                self._error("has no end_header")
+
+            self._offset = f.tell()
+
+        if self.format is None:
+            self._error("has no format")
+
+        # Elements before the vertices are skipped. It is only possible if their size is known
+        self._skip = 0
+        for name, count, properties in elements:
+            if name == "vertex":
+                break
+
+            if self.format == "ascii":
+                self._skip += count
+            elif None in properties:
+                self._error("has list properties before vertices")
+            else:
+                self._skip += count * sum(np.dtype(kind).itemsize for _, kind in properties)
+        else:
+            self._error("has no vertex element")
+
+        names = [prop[0] if prop else None for prop in properties]
+        if not all(axis in names for axis in ("x", "y", "z")):
+            self._error("has no x, y or z vertex property")
+
+        self.count = count
+        self._columns = tuple(names.index(axis) for axis in ("x", "y", "z"))
+        if self.format != "ascii":
+            if None in properties:
+                self._error("has list vertex properties")
+
+            order = _PLY_FORMATS[self.format]
+            self._dtype = np.dtype([(f"f{i}", order + kind) for i, (_, kind) in enumerate(properties)])
+
+    def _chunks(self):
+        if self.format == "ascii":
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                lines = (line.decode("ascii") for line in f)
+                # Skip lines of the elements before the vertices
+                for _ in itertools.islice(lines, self._skip):
+                    pass
+
+                for start in range(0, self.count, self.chunk_size):
+                    chunk = list(itertools.islice(lines, min(self.chunk_size, self.count - start)))
+                    yield self._parse(chunk, usecols=self._columns)
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset + self._skip)
+                for start in range(0, self.count, self.chunk_size):
+                    count = min(self.chunk_size, self.count - start)
+                    records = np.fromfile(f, dtype=self._dtype, count=count)
+                    # Raise an error if the file ends before all vertices are read
+                    if len(records) != count:
+                        self._error("ends before all vertices")
+
+                    data = np.empty((count, 3))
+                    for axis, column in enumerate(self._columns):
+                        data[:, axis] = records[f"f{column}"]
+
+                    yield data
+
+
+class PLYWriter(_Writer):
+    binary = True
+
+    def __init__(self, path: str, binary: bool = True, dtype: str = "float64", logger: Logger = None) -> None:
+        """
+        Constructor method. Writes vertices to PLY files.
+        The vertex count in the header is written when the writer is closed
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.ply")
+        >>> with PLYWriter(path, binary=False) as writer:
+        ...     writer.append([Point(1, 2, 3)])
+        >>> print(open(path).read().replace(" " * 19, ""))
+        ply
+        format ascii 1.0
+        element vertex 1
+        property double x
+        property double y
+        property double z
+        end_header
+        1.0 2.0 3.0
+        <BLANKLINE>
+
+
+        :param path: Path of the file
+        :param binary: If True, write binary little endian vertices. Otherwise text
+        :param dtype: Type of the written values. "float64" or "float32"
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if dtype is not supported
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        if self.dtype.str not in ("<f4", "<f8"):
+            self.logger.error("Dtype must be float32 or float64")
+            raise ValueError("Dtype must be float32 or float64")
+
+        super().__init__(path, logger=logger)
+        self.format = "binary_little_endian" if binary else "ascii"
+        self._write_header()
+
+    def _write_header(self) -> None:
+        kind = "double" if self.dtype.itemsize == 8 else "float"
+        header = (f"ply\nformat {self.format} 1.0\n"
+                  f"element vertex {self.count:<{_PLY_COUNT_WIDTH}}\n"
+                  f"property {kind} x\nproperty {kind} y\nproperty {kind} z\nend_header\n")
+        self._file.seek(0)
+        self._file.write(header.encode("ascii"))
+
+    def _write(self, data: np.ndarray) -> None:
+        if self.format == "ascii":
+            if self.dtype.itemsize == 4:
+                data = data.astype(np.float32).astype(np.float64)
+
+            self._file.write(self._lines(data, " ").encode("ascii"))
+        else:
+            data.astype(self.dtype, copy=False).tofile(self._file)
+
+    def close(self) -> None:
+        """
+        Writes the vertex count to the header and closes the file
+        """
+        if not self._file.closed:
+            self._write_header()
+            self._file.close()
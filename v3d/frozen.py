@@ -0,0 +1,333 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import Logger
+
+from .point import Point
+from .vector import Vector
+
+
+class FrozenPoint(Point):
+    # Hash is calculated once
+    __slots__ = ("_hash",)
+
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0, logger: Logger = None) -> None:
+        """
+        Constructor method. An immutable Point that can be a dict key or a set member.
+        Unlike Point, two FrozenPoints are equal only if their coordinates are exactly equal,
+        so equal points always have the same hash. Use is_same to compare with tolerance.
+        A FrozenPoint and a Point are compared with tolerance, as two Points are
+
+        >>> p = FrozenPoint(1, 2, 3)
+        >>> {p: "a"}[FrozenPoint(1, 2, 3)]
+        'a'
+        >>> p.x = 2
+        Traceback (most recent call last):
+        ...
+        AttributeError: FrozenPoint is immutable
+
+
+        :param x: X value of a 3D Point. 0 by default
+        :param y: Y value of a 3D Point. 0 by default
+        :param z: Z value of a 3D Point. 0 by default
+        :param logger: Logger to log
+        """
+        # Point.__init__ would set the attributes through __setattr__
+        object.__setattr__(self, "_logger", logger)
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "z", z)
+        object.__setattr__(self, "_hash", hash((x, y, z)))
+
+    @classmethod
+    def _from_xyz(cls, x: float, y: float, z: float, logger: Logger = None) -> FrozenPoint:
+        # Point._from_xyz would set the attributes through __setattr__
+        return cls(x, y, z, logger=logger)
+
+    def __setattr__(self, name: str, value) -> None:
+        # Raise an error on any change
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __delattr__(self, name: str) -> None:
+        # Raise an error on any change
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __reduce__(self) -> tuple:
+        # Pickle by coordinates. The default would restore the attributes through __setattr__
+        return self.__class__, (self.x, self.y, self.z)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Point) -> bool:
+        # Exactly equal coordinates between FrozenPoints. Consistent with the hash
+        if not isinstance(other, Point):
+            return NotImplemented
+
+        if not isinstance(other, FrozenPoint):
+            # A Point is compared with tolerance, as Point does
+            return self.is_same(other)
+
+        return self.x == other.x and self.y == other.y and self.z == other.z
+
+    # In place operators return a new FrozenPoint, like they do for a tuple
+    def __iadd__(self, other: Point) -> FrozenPoint:
+        return self.freeze(self.add(other))
+
+    def __isub__(self, other: Point) -> FrozenPoint:
+        return self.freeze(self.subtract(other))
+
+    def __imul__(self, scalar: float) -> FrozenPoint:
+        return self.freeze(self.scale(scalar))
+
+    def __itruediv__(self, scalar: float) -> FrozenPoint:
+        return self.freeze(self.divide(scalar))
+
+    def _immutable(self, *args, **kwargs) -> None:
+        # In place methods can not change a FrozenPoint
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    add_ = subtract_ = scale_ = divide_ = _immutable
+
+    @classmethod
+    def freeze(cls, point: Point) -> FrozenPoint:
+        """
+        Returns an immutable copy of a Point. A FrozenPoint is returned as is
+
+        >>> FrozenPoint.freeze(Point(1, 2, 3))
+        FrozenPoint(x=1, y=2, z=3)
+
+
+        :param point: The Point to freeze
+        :return: The FrozenPoint
+        """
+        if isinstance(point, FrozenPoint):
+            return point
+
+        if not isinstance(point, Point):
+            # Raise an error if point is not a Point
+            cls.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+        return cls(point.x, point.y, point.z, logger=point._logger)
+
+    @classmethod
+    def from_polar(cls, r: float, theta: float, phi: float, radians: bool = False) -> FrozenPoint:
+        """
+        Returns a frozen point from given polar values. Same as Point.from_polar
+
+        >>> FrozenPoint.from_polar(1, 0, 0)
+        FrozenPoint(x=0.0, y=0.0, z=1.0)
+
+
+        :param r: Distance from origin
+        :param theta: Theta angle
+        :param phi: Phi angle
+        :param radians: If True, theta and phi are in radians instead of degrees
+        :return: The created FrozenPoint
+        """
+        return cls.freeze(Point.from_polar(r, theta, phi, radians=radians))
+
+
+class FrozenVector(Vector):
+    # Magnitude, unit vector and heading are calculated on first use and kept
+    __slots__ = ("_hash", "_mag", "_unit", "_heading")
+
+    def __init__(self, point: Point = None, logger: Logger = None) -> None:
+        """
+        Constructor method. An immutable Vector that can be a dict key or a set member.
+        The point is copied into a FrozenPoint, so changing the given Point does not change the vector.
+        mag, unit and heading are calculated once, on first use.
+        Unlike Vector, two FrozenVectors are equal only if their coordinates are exactly equal.
+        Use is_same to compare with tolerance. A FrozenVector and a Vector are compared with tolerance
+
+        >>> v = FrozenVector(Point(1, 1, 1))
+        >>> v.mag()
+        1.7320508075688772
+        >>> v.unit() is v.unit()
+        True
+        >>> {v: "up"}[FrozenVector(Point(1, 1, 1))]
+        'up'
+
+
+        :param point: Point value of a vector
+        :param logger: Logger to log
+        """
+        # Vector.__init__ would set the attributes through __setattr__
+        point = FrozenPoint() if point is None else FrozenPoint.freeze(point)
+        object.__setattr__(self, "_logger", logger)
+        object.__setattr__(self, "point", point)
+        # Different from the hash of a FrozenPoint of the same coordinates
+        object.__setattr__(self, "_hash", hash((Vector, point)))
+        object.__setattr__(self, "_mag", None)
+        object.__setattr__(self, "_unit", None)
+        object.__setattr__(self, "_heading", None)
+
+    @classmethod
+    def _from_point(cls, point: Point, logger: Logger = None) -> FrozenVector:
+        # Vector._from_point would set the attributes through __setattr__
+        return cls(point, logger=logger)
+
+    def __setattr__(self, name: str, value) -> None:
+        # Raise an error on any change
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __delattr__(self, name: str) -> None:
+        # Raise an error on any change
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    def __reduce__(self) -> tuple:
+        # Pickle by point. The default would restore the attributes through __setattr__
+        return self.__class__, (self.point,)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Vector) -> bool:
+        # Exactly equal coordinates between FrozenVectors. Consistent with the hash
+        if not isinstance(other, Vector):
+            return NotImplemented
+
+        if not isinstance(other, FrozenVector):
+            # A Vector is compared with tolerance, as Vector does
+            return self.is_same(other)
+
+        return self.point.x == other.point.x and self.point.y == other.point.y and self.point.z == other.point.z
+
+    def is_same(self, other: Vector) -> bool:
+        """
+        Checks if two vectors are the same with tolerance, as Vector.is_same. Also between two FrozenVectors
+
+        >>> FrozenVector(Point(1, 1, 1)).is_same(FrozenVector(Point(1, 1, 1.00001)))
+        True
+
+
+        :param other: The other Vector to compair with this.
+        :return: True if the two vectors are the same, False if otherwise.
+        """
+        # The points are FrozenPoints. Their == is exact, is_same is not
+        return self.point.is_same(other.point)
+
+    # In place operators return a new FrozenVector, like they do for a tuple
+    def __iadd__(self, other: Vector) -> FrozenVector:
+        return self.freeze(self.add(other))
+
+    def __isub__(self, other: Vector) -> FrozenVector:
+        return self.freeze(self.subtract(other))
+
+    def __imul__(self, other: Union[Vector, float, int]) -> FrozenVector:
+        return self.freeze(self.multiply(other))
+
+    def __itruediv__(self, scalar: float) -> FrozenVector:
+        return self.freeze(self.divide(scalar))
+
+    def _immutable(self, *args, **kwargs) -> None:
+        # In place methods can not change a FrozenVector
+        self.logger.error("{} is immutable".format(self.__class__.__name__))
+        raise AttributeError("{} is immutable".format(self.__class__.__name__))
+
+    add_ = subtract_ = multiply_ = divide_ = _immutable
+
+    @classmethod
+    def freeze(cls, vector: Vector) -> FrozenVector:
+        """
+        Returns an immutable copy of a Vector. A FrozenVector is returned as is
+
+        >>> FrozenVector.freeze(Vector(Point(1, 2, 3)))
+        FrozenVector(FrozenPoint(x=1, y=2, z=3))
+
+
+        :param vector: The Vector to freeze
+        :return: The FrozenVector
+        """
+        if isinstance(vector, FrozenVector):
+            return vector
+
+        if not isinstance(vector, Vector):
+            # Raise an error if vector is not a Vector
+            cls.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+        return cls(vector.point, logger=vector._logger)
+
+    @classmethod
+    def from_points(cls, point1: Point, point2: Point) -> FrozenVector:
+        """
+        Creates a FrozenVector from given two points. Same as Vector.from_points
+
+        >>> FrozenVector.from_points(Point(1, 1, 1), Point(2, 2, 3))
+        FrozenVector(FrozenPoint(x=-1, y=-1, z=-2))
+
+
+        :param point1: First point. To be translated to the origin
+        :param point2: Second Point
+        :return: The FrozenVector
+        """
+        return cls.freeze(Vector.from_points(point1, point2))
+
+    @classmethod
+    def from_xyz(cls, x: float, y: float, z: float, logger: Logger = None) -> FrozenVector:
+        """
+        Creates a FrozenVector from x, y and z values. Same as Vector.from_xyz
+
+        >>> FrozenVector.from_xyz(1, 2, 3)
+        FrozenVector(FrozenPoint(x=1, y=2, z=3))
+
+
+        :param x: X value of the vector
+        :param y: Y value of the vector
+        :param z: Z value of the vector
+        :param logger: Logger to log
+        :return: The FrozenVector
+        """
+        return cls(FrozenPoint(x, y, z, logger=logger), logger=logger)
+
+    def mag(self) -> float:
+        """
+        Returns the length of the vector. Calculated on first use
+
+        >>> FrozenVector(Point(1, 1, 1)).mag()
+        1.7320508075688772
+
+
+        :return: The length of the vector
+        """
+        if self._mag is None:
+            object.__setattr__(self, "_mag", super().mag())
+
+        return self._mag
+
+    def unit(self) -> FrozenVector:
+        """
+        Returns unit vector. Calculated on first use
+
+        >>> FrozenVector(Point(1, 1, 1)).unit()
+        FrozenVector(FrozenPoint(x=0.5773502691896258, y=0.5773502691896258, z=0.5773502691896258))
+
+
+        :return: The unit vector of this vector
+        """
+        if self._unit is None:
+            object.__setattr__(self, "_unit", self.freeze(super().unit()))
+
+        return self._unit
+
+    def heading(self) -> tuple[float, float]:
+        """
+        Returns heading angle of the vector. Calculated on first use
+
+        >>> FrozenVector(Point(1, 1, 1)).heading()
+        (54.735610317245346, 45.0)
+
+
+        :return: Angles of the vector
+        """
+        if self._heading is None:
+            object.__setattr__(self, "_heading", super().heading())
+
+        return self._heading
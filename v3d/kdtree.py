@@ -0,0 +1,367 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import heapq
+
+import numpy as np
+
+from .point import Point
+from .point_array import PointArray
+
+
+class KDTree:
+    logger = getLogger('dummy')
+
+    def __init__(self, points=None, leaf_size: int = 32, logger: Logger = None) -> None:
+        """
+        Constructor method. Builds a k-d tree over the points.
+        Query results are indices of the points as given here. Inserted points get the next free indices
+
+        >>> tree = KDTree([Point(0, 0, 0), Point(1, 1, 1), Point(5, 5, 5)])
+        >>> tree
+        KDTree(points=3, nodes=1)
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :param leaf_size: Maximum number of points in a leaf
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if leaf_size is not a positive integer
+        if not isinstance(leaf_size, int) or leaf_size < 1:
+            self.logger.error("leaf_size must be a positive integer")
+            raise ValueError("leaf_size must be a positive integer")
+
+        self.leaf_size = leaf_size
+        data = PointArray(points, logger=self.logger).data
+        self._build(data, np.arange(len(data)))
+        self._next_index = len(data)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(points={len(self)}, nodes={len(self._start)})"
+
+    def __len__(self) -> int:
+        return self._alive_count + len(self._extra_indices)
+
+    def _build(self, data: np.ndarray, indices: np.ndarray) -> None:
+        # Reorders a copy of the points so each node holds a contiguous range of them
+        self._data = np.array(data, dtype=np.float64)
+        self._indices = np.array(indices, dtype=np.int64)
+        self._alive = np.ones(len(self._data), dtype=bool)
+        self._alive_count = len(self._data)
+        # Points inserted after the build. Searched by brute force until the next rebuild
+        self._extra_data = np.empty((0, 3))
+        self._extra_indices = np.empty(0, dtype=np.int64)
+
+        # Flat node layout. Python lists are faster than numpy for indexing one element at a time
+        self._start, self._end, self._left, self._right, self._low, self._high = [], [], [], [], [], []
+
+        if len(self._data) == 0:
+            return
+
+        stack = [(0, len(self._data), None, None)]
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(self._start)
+            if parent is not None:
+                (self._left if side == 0 else self._right)[parent] = node
+
+            chunk = self._data[start:end]
+            low = chunk.min(axis=0)
+            high = chunk.max(axis=0)
+            self._start.append(start)
+            self._end.append(end)
+            self._left.append(-1)
+            self._right.append(-1)
+            self._low.append(tuple(low.tolist()))
+            self._high.append(tuple(high.tolist()))
+
+            if end - start <= self.leaf_size:
+                continue
+
+            # Split at the median of the widest axis
+            axis = int(np.argmax(high - low))
+            middle = (end - start) // 2
+            order = np.argpartition(chunk[:, axis], middle)
+            self._data[start:end] = chunk[order]
+            self._indices[start:end] = self._indices[start:end][order]
+
+            stack.append((start + middle, end, node, 1))
+            stack.append((start, start + middle, node, 0))
+
+    @staticmethod
+    def _box_distance(point: tuple, low: tuple, high: tuple) -> float:
+        # Squared distance from the point to the closest point of the box
+        distance = 0.0
+        for value, box_low, box_high in zip(point, low, high):
+            if value < box_low:
+                distance += (box_low - value) * (box_low - value)
+            elif value > box_high:
+                distance += (value - box_high) * (value - box_high)
+
+        return distance
+
+    @staticmethod
+    def _squared_distances(data: np.ndarray, point: tuple) -> np.ndarray:
+        # Same summation order as Point.dist, so square roots are identical to it
+        dx = data[:, 0] - point[0]
+        dy = data[:, 1] - point[1]
+        dz = data[:, 2] - point[2]
+        return dx * dx + dy * dy + dz * dz
+
+    def _queries(self, points) -> tuple:
+        # Returns the query points as a list of tuples and whether a single Point was given
+        if isinstance(points, Point):
+            return [(points.x, points.y, points.z)], True
+
+        try:
+            return [tuple(row) for row in PointArray(points, logger=self.logger).data.tolist()], False
+        except ValueError:
+            # Raise an error if the points are not Points
+            self.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+    def _rebuild(self) -> None:
+        # Moves the inserted points into the tree and drops the deleted ones
+        self.logger.info("Rebuilding KDTree")
+        data = np.concatenate([self._data[self._alive], self._extra_data])
+        indices = np.concatenate([self._indices[self._alive], self._extra_indices])
+        self._build(data, indices)
+
+    def _knn(self, point: tuple, k: int) -> tuple:
+        best_distances = self._squared_distances(self._extra_data, point)
+        best_indices = self._extra_indices
+        if len(best_distances) > k:
+            order = np.argsort(best_distances, kind="stable")[:k]
+            best_distances, best_indices = best_distances[order], best_indices[order]
+
+        worst = best_distances.max() if len(best_distances) == k else np.inf
+
+        # Best first search. Visit nodes in order of their distance to the point
+        heap = [(0.0, 0)] if self._start else []
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > worst:
+                break
+
+            left = self._left[node]
+            if left == -1:
+                start, end = self._start[node], self._end[node]
+                alive = self._alive[start:end]
+                distances = self._squared_distances(self._data[start:end][alive], point)
+                distances = np.concatenate([best_distances, distances])
+                indices = np.concatenate([best_indices, self._indices[start:end][alive]])
+                order = np.argsort(distances, kind="stable")[:k]
+                best_distances, best_indices = distances[order], indices[order]
+                if len(best_distances) == k:
+                    worst = best_distances[-1]
+                continue
+
+            for child in (left, self._right[node]):
+                child_distance = self._box_distance(point, self._low[child], self._high[child])
+                if child_distance <= worst:
+                    heapq.heappush(heap, (child_distance, child))
+
+        order = np.argsort(best_distances, kind="stable")
+        return np.sqrt(best_distances[order]), best_indices[order]
+
+    def _collect(self, inside_node, inside_points) -> np.ndarray:
+        # Returns indices of the alive points for which inside_points is True.
+        # inside_node tells if a node's box is out (-1), partly in (0) or completely in (1) the query region
+        found = [self._extra_indices[inside_points(self._extra_data)]]
+        stack = [0] if self._start else []
+        while stack:
+            node = stack.pop()
+            state = inside_node(self._low[node], self._high[node])
+            if state == -1:
+                continue
+
+            start, end = self._start[node], self._end[node]
+            if state == 1:
+                found.append(self._indices[start:end][self._alive[start:end]])
+            elif self._left[node] == -1:
+                mask = self._alive[start:end] & inside_points(self._data[start:end])
+                found.append(self._indices[start:end][mask])
+            else:
+                stack.append(self._right[node])
+                stack.append(self._left[node])
+
+        return np.sort(np.concatenate(found))
+
+    def query(self, points: Union[Point, PointArray], k: int = 1) -> tuple:
+        """
+        Finds the k nearest neighbours of the points.
+        Distances are the same as Point.dist
+
+        >>> tree = KDTree([Point(0, 0, 0), Point(1, 1, 1), Point(5, 5, 5)])
+        >>> tree.query(Point(1, 1, 2), k=2)
+        (array([1.        , 2.44948974]), array([1, 0]))
+        >>> distances, indices = tree.query([[0, 0, 1], [4, 4, 4]])
+        >>> indices
+        array([[0],
+               [2]])
+
+
+        :param points: A Point or many query points as anything PointArray accepts
+        :param k: Number of neighbours
+        :return: tuple of distances and indices, closest first. (k,) arrays for a Point, (M, k) arrays for many points
+        """
+        self.logger.info("Querying KDTree for nearest neighbours")
+        # Raise an error if k is not a positive integer
+        if not isinstance(k, (int, np.integer)) or k < 1:
+            self.logger.error("k must be a positive integer")
+            raise ValueError("k must be a positive integer")
+
+        queries, single = self._queries(points)
+        k = min(k, len(self))
+        if k == 0:
+            # An empty tree has no neighbours
+            empty = (np.empty(0), np.empty(0, dtype=np.int64))
+            return empty if single else (np.empty((len(queries), 0)), np.empty((len(queries), 0), dtype=np.int64))
+
+        results = [self._knn(query, k) for query in queries]
+        if single:
+            return results[0]
+
+        distances = np.array([distance for distance, _ in results]).reshape(len(results), k)
+        indices = np.array([index for _, index in results], dtype=np.int64).reshape(len(results), k)
+        return distances, indices
+
+    def query_radius(self, points: Union[Point, PointArray], radius: float):
+        """
+        Finds the points within the radius of the query points. Distance equal to the radius counts as within
+
+        >>> tree = KDTree([Point(0, 0, 0), Point(1, 1, 1), Point(5, 5, 5)])
+        >>> tree.query_radius(Point(0, 0, 0), 2)
+        array([0, 1])
+        >>> tree.query_radius([[0, 0, 0], [5, 5, 4]], 1)
+        [array([0]), array([2])]
+
+
+        :param points: A Point or many query points as anything PointArray accepts
+        :param radius: The radius
+        :return: Sorted indices for a Point, a list of them for many points
+        """
+        self.logger.info("Querying KDTree within radius")
+        # Raise an error if radius is not numeric
+        if not isinstance(radius, (int, float)) or radius < 0:
+            self.logger.error("Radius must be a non negative number")
+            raise ValueError("Radius must be a non negative number")
+
+        queries, single = self._queries(points)
+        squared = radius * radius
+        results = []
+        for query in queries:
+            def inside_node(low, high):
+                if self._box_distance(query, low, high) > squared:
+                    return -1
+
+                # Farthest corner of the box is within the radius
+                farthest = sum(max(value - box_low, box_high - value) ** 2
+                               for value, box_low, box_high in zip(query, low, high))
+                return 1 if farthest <= squared else 0
+
+            results.append(self._collect(inside_node, lambda data: self._squared_distances(data, query) <= squared))
+
+        return results[0] if single else results
+
+    def query_box(self, low: Point, high: Point) -> np.ndarray:
+        """
+        Finds the points in an axis aligned box. Points on the faces of the box count as in
+
+        >>> tree = KDTree([Point(0, 0, 0), Point(1, 1, 1), Point(5, 5, 5)])
+        >>> tree.query_box(Point(0.5, 0.5, 0.5), Point(6, 6, 6))
+        array([1, 2])
+
+
+        :param low: Corner of the box with the smallest x, y and z
+        :param high: Corner of the box with the largest x, y and z
+        :return: Sorted indices of the points in the box
+        """
+        self.logger.info("Querying KDTree within box")
+        # Check if low and high are Points
+        if not isinstance(low, Point) or not isinstance(high, Point):
+            self.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+        box_low = (low.x, low.y, low.z)
+        box_high = (high.x, high.y, high.z)
+
+        def inside_node(node_low, node_high):
+            if any(nl > bh or nh < bl for nl, nh, bl, bh in zip(node_low, node_high, box_low, box_high)):
+                return -1
+
+            if all(nl >= bl and nh <= bh for nl, nh, bl, bh in zip(node_low, node_high, box_low, box_high)):
+                return 1
+
+            return 0
+
+        def inside_points(data):
+            return np.all((data >= box_low) & (data <= box_high), axis=1)
+
+        return self._collect(inside_node, inside_points)
+
+    def insert(self, points: Union[Point, PointArray]):
+        """
+        Inserts points into the tree
+
+        >>> tree = KDTree([Point(0, 0, 0)])
+        >>> tree.insert(Point(1, 1, 1))
+        1
+        >>> tree.query(Point(1, 1, 1.5))
+        (array([0.5]), array([1]))
+
+
+        :param points: A Point or many points as anything PointArray accepts
+        :return: Index of the inserted Point, or an array of indices for many points
+        """
+        self.logger.info("Inserting into KDTree")
+        single = isinstance(points, Point)
+        data = PointArray(points, logger=self.logger).data
+        indices = np.arange(self._next_index, self._next_index + len(data))
+        self._next_index += len(data)
+
+        self._extra_data = np.concatenate([self._extra_data, data])
+        self._extra_indices = np.concatenate([self._extra_indices, indices])
+        # Brute force search of the inserted points gets slow. Move them into the tree
+        if len(self._extra_indices) > max(self.leaf_size, len(self._data) // 8):
+            self._rebuild()
+
+        return int(indices[0]) if single else indices
+
+    def delete(self, indices) -> None:
+        """
+        Deletes points from the tree
+
+        >>> tree = KDTree([Point(0, 0, 0), Point(1, 1, 1)])
+        >>> tree.delete(1)
+        >>> tree.query(Point(1, 1, 1))
+        (array([1.73205081]), array([0]))
+
+
+        :param indices: Index or indices of the points to delete
+        """
+        self.logger.info("Deleting from KDTree")
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        in_tree = np.isin(self._indices, indices) & self._alive
+        in_extra = np.isin(self._extra_indices, indices)
+        # Raise an error if any of the indices is not in the tree
+        if in_tree.sum() + in_extra.sum() != len(np.unique(indices)):
+            self.logger.error("Index is not in the tree")
+            raise ValueError("Index is not in the tree")
+
+        self._alive &= ~in_tree
+        self._alive_count -= int(in_tree.sum())
+        self._extra_data = self._extra_data[~in_extra]
+        self._extra_indices = self._extra_indices[~in_extra]
+        # Too many dead points slow down the search. Rebuild without them
+        if self._alive_count < len(self._data) // 2:
+            self._rebuild()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from .point import Point
+from .point_array import PointArray
+from .vector_array import VectorArray
+
+
+class TriangleMesh:
+    logger = getLogger('dummy')
+
+    def __init__(self, vertices, faces, logger: Logger = None) -> None:
+        """
+        Constructor method. An indexed triangle mesh: a vertex buffer and an (M, 3) array of vertex indices,
+        one row for each triangle. Vertices are shared by the triangles that use them.
+        Normals, areas and vertex normals are calculated for all triangles at once
+
+        >>> mesh = TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], [[0, 1, 2], [0, 2, 3]])
+        >>> mesh
+        TriangleMesh(vertices=4, faces=2)
+        >>> mesh.surface_area()
+        1.0
+
+
+        :param vertices: A list of Points, a PointArray or an (N, 3) array
+        :param faces: Vertex indices of the triangles as an (M, 3) array of integers.
+        Counter-clockwise seen from the side the normal points to
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        self.vertices = PointArray(vertices, logger=self.logger)
+        faces = np.asarray(faces)
+        if faces.size == 0:
+            faces = faces.reshape(0, 3)
+
+        # Raise an error if faces is not an (M, 3) array of integers
+        if faces.ndim != 2 or faces.shape[1] != 3 or not np.issubdtype(faces.dtype, np.integer):
+            self.logger.error("Faces must be an (M, 3) array of integers")
+            raise ValueError("Faces must be an (M, 3) array of integers")
+
+        # Raise an error if a face uses a vertex that does not exist
+        if faces.size > 0 and (faces.min() < 0 or faces.max() >= len(self.vertices)):
+            self.logger.error("Face indices must be within the vertices")
+            raise ValueError("Face indices must be within the vertices")
+
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(vertices={len(self.vertices)}, faces={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self.faces)
+
+    def triangle(self, index: int) -> tuple:
+        """
+        Returns the corners of a triangle
+
+        >>> TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]]).triangle(0)
+        (Point(x=0.0, y=0.0, z=0.0), Point(x=1.0, y=0.0, z=0.0), Point(x=0.0, y=1.0, z=0.0))
+
+
+        :param index: Index of the triangle
+        :return: The three corners as Points
+        """
+        a, b, c = self.faces[index].tolist()
+        return self.vertices[a], self.vertices[b], self.vertices[c]
+
+    def _cross(self) -> np.ndarray:
+        # Cross products of the two edges from the first corner of each triangle. Twice the area long
+        # Corners of all triangles as one (M, 3, 3) gather. Faster than indexing the vertices once for each corner
+        corners = np.take(self.vertices.data, self.faces, axis=0)
+        first = corners[:, 0]
+        # Same as Vector.from_points(b, a) and Vector.from_points(c, a) of a single triangle
+        return VectorArray._cross(corners[:, 1] - first, corners[:, 2] - first)
+
+    @staticmethod
+    def _unit(data: np.ndarray) -> np.ndarray:
+        # Unit vectors of the rows. Zero for zero rows
+        magnitudes = VectorArray._mag(data)
+        # Vector.unit divides by the magnitude as Point.divide does, multiplying with its inverse
+        inverse = np.divide(1, magnitudes, out=np.zeros_like(magnitudes), where=magnitudes != 0)
+        return data * inverse[:, None]
+
+    def face_normals(self) -> VectorArray:
+        """
+        Returns the unit normal of each triangle. Same as Vector.normal of the two edges from the first corner.
+        Degenerate (zero area) triangles have a zero normal instead of raising an error
+
+        >>> TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]]).face_normals()
+        VectorArray(PointArray([[0., 0., 1.]]))
+
+
+        :return: Normals as a VectorArray
+        """
+        self.logger.info("Calculating face normals")
+        return VectorArray(PointArray(self._unit(self._cross()), logger=self.logger), logger=self.logger)
+
+    def face_areas(self) -> np.ndarray:
+        """
+        Returns the area of each triangle
+
+        >>> TriangleMesh([[0, 0, 0], [2, 0, 0], [0, 1, 0]], [[0, 1, 2]]).face_areas()
+        array([1.])
+
+
+        :return: Areas as an (M,) array
+        """
+        self.logger.info("Calculating face areas")
+        return VectorArray._mag(self._cross()) / 2
+
+    def surface_area(self) -> float:
+        """
+        Returns the total area of the triangles
+
+        >>> TriangleMesh([[0, 0, 0], [2, 0, 0], [0, 1, 0]], [[0, 1, 2]]).surface_area()
+        1.0
+
+
+        :return: The surface area
+        """
+        return float(self.face_areas().sum())
+
+    def vertex_normals(self) -> VectorArray:
+        """
+        Returns the unit normal of each vertex: the sum of the normals of the triangles using it,
+        weighted by their areas. Vertices used by no triangle, or whose normals cancel out, have a zero normal
+
+        >>> mesh = TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], [[0, 1, 2], [0, 3, 1]])
+        >>> mesh.vertex_normals()
+        VectorArray(PointArray([[0.        , 0.70710678, 0.70710678],
+                                [0.        , 0.70710678, 0.70710678],
+                                [0.        , 0.        , 1.        ],
+                                [0.        , 1.        , 0.        ]]))
+
+
+        :return: Normals as a VectorArray, one for each vertex
+        """
+        self.logger.info("Calculating vertex normals")
+        # A cross product is as long as twice the area. Summing them weights the normals by area
+        cross = self._cross()
+        corners = self.faces.reshape(-1)
+        count = len(self.vertices)
+        sums = np.empty((count, 3))
+        for axis in range(3):
+            sums[:, axis] = np.bincount(corners, weights=np.repeat(cross[:, axis], 3), minlength=count)
+
+        return VectorArray(PointArray(self._unit(sums), logger=self.logger), logger=self.logger)
+
+    @classmethod
+    def from_triangles(cls, triangles: list, logger: Logger = None) -> TriangleMesh:
+        """
+        Creates a mesh from triangles given as three Points each. Vertices are not shared between triangles
+
+        >>> TriangleMesh.from_triangles([(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0))])
+        TriangleMesh(vertices=3, faces=1)
+
+
+        :param triangles: A list of (Point, Point, Point) tuples
+        :param logger: Logger to log
+        :return: The mesh
+        """
+        corners = [corner for triangle in triangles for corner in triangle]
+        # Raise an error if a triangle does not have three Points
+        if len(corners) != 3 * len(triangles) or not all(isinstance(corner, Point) for corner in corners):
+            cls.logger.error("Triangles must have three Points")
+            raise ValueError("Triangles must have three Points")
+
+        return cls(PointArray(corners), np.arange(len(corners)).reshape(-1, 3), logger=logger)
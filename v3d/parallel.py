@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import Union, Callable
+
+from logging import getLogger
+from logging import Logger
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+
+
+def _wrap(data: np.ndarray, kind: str) -> Union[PointArray, VectorArray]:
+    # float64 rows are not copied
+    points = PointArray(data)
+    return points if kind == "points" else VectorArray(points)
+
+
+def _pack(results: list):
+    # Packs results of a Point or Vector method into arrays, so a shard is sent back as a few buffers
+    if results and isinstance(results[0], Vector):
+        return VectorArray.from_vectors(results)
+    elif results and isinstance(results[0], Point):
+        return PointArray.from_points(results)
+    elif results and isinstance(results[0], tuple):
+        return tuple(np.array(column) for column in zip(*results))
+
+    return np.array(results)
+
+
+def _apply(data: np.ndarray, kind: str, operation: Union[str, Callable], args: tuple, kwargs: dict):
+    # Runs the operation on a shard of rows
+    shard = _wrap(data, kind)
+    if callable(operation):
+        return operation(shard, *args, **kwargs)
+
+    # Use the batched method if there is one. Otherwise call the method of each Point or Vector
+    if hasattr(shard, operation):
+        return getattr(shard, operation)(*args, **kwargs)
+
+    items = shard.to_points() if kind == "points" else shard.to_vectors()
+    return _pack([getattr(item, operation)(*args, **kwargs) for item in items])
+
+
+def _detach(result, data: np.ndarray):
+    # Copies results that are views of the shared buffer. The buffer is closed before the result is sent
+    if isinstance(result, VectorArray):
+        return VectorArray(_detach(result.point, data))
+    elif isinstance(result, PointArray):
+        return PointArray(_detach(result.data, data))
+    elif isinstance(result, tuple):
+        return tuple(_detach(item, data) for item in result)
+    elif isinstance(result, np.ndarray) and np.shares_memory(result, data):
+        return result.copy()
+
+    return result
+
+
+def _run_shard(name: str, shape: tuple, kind: str, start: int, stop: int,
+               operation: Union[str, Callable], args: tuple, kwargs: dict):
+    # Runs in a worker process. Reads its rows from the shared buffer instead of receiving them pickled
+    buffer = shared_memory.SharedMemory(name=name)
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=buffer.buf)[start:stop]
+        result = _detach(_apply(data, kind, operation, args, kwargs), data)
+        del data
+        return result
+    finally:
+        buffer.close()
+
+
+class ParallelMap:
+    logger = getLogger('dummy')
+
+    def __init__(self, workers: int = None, shards_per_worker: int = 4, logger: Logger = None) -> None:
+        """
+        Constructor method. Runs a Point or Vector operation on many points or vectors in a pool of processes.
+        The input is copied once into shared memory. Each worker reads its shard from there,
+        so millions of Points or Vectors are never pickled. The pool is started on first use and reused
+
+        >>> with ParallelMap(workers=2) as pm:
+        ...     pm.map("heading", VectorArray([[1, 1, 1], [0, 0, 1]]))
+        (array([54.73561032,  0.        ]), array([45.,  0.]))
+
+
+        :param workers: Number of processes. Number of CPUs by default
+        :param shards_per_worker: Shards the input is split into for each worker. More shards balance the load better
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        # Raise an error if workers or shards_per_worker is not positive
+        if not isinstance(workers, int) or workers < 1 or not isinstance(shards_per_worker, int) or \
+                shards_per_worker < 1:
+            self.logger.error("Workers and shards per worker must be positive integers")
+            raise ValueError("Workers and shards per worker must be positive integers")
+
+        self.workers = workers
+        self.shards_per_worker = shards_per_worker
+        self._executor = None
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(workers={self.workers})"
+
+    def __enter__(self) -> ParallelMap:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _rows(self, data) -> tuple:
+        # Returns rows of the data as an (N, 3) float64 array and whether they are points or vectors
+        if isinstance(data, VectorArray):
+            return data.data, "vectors"
+        elif isinstance(data, (list, tuple)) and len(data) > 0 and isinstance(data[0], Vector):
+            return VectorArray(data).data, "vectors"
+
+        return PointArray(data, logger=self.logger).data, "points"
+
+    def _merge(self, results: list):
+        # Joins results of the shards in order
+        first = results[0]
+        if isinstance(first, VectorArray):
+            return VectorArray(self._merge([result.point for result in results]), logger=self.logger)
+        elif isinstance(first, PointArray):
+            return PointArray(np.concatenate([result.data for result in results]), logger=self.logger)
+        elif isinstance(first, tuple):
+            return tuple(self._merge(list(parts)) for parts in zip(*results))
+        elif isinstance(first, list):
+            return [item for result in results for item in result]
+
+        return np.concatenate([np.asarray(result) for result in results])
+
+    def map(self, operation: Union[str, Callable], data, *args, **kwargs):
+        """
+        Runs the operation on every point or vector of the data and returns the results in order
+
+        >>> pm = ParallelMap(workers=2)
+        >>> pm.map("dist", PointArray([[3, 4, 0], [1, 0, 0]]))
+        array([5., 1.])
+        >>> pm.map("angle_between", [Vector(Point(1, 0, 0))], Vector(Point(0, 1, 0)))
+        array([90.])
+        >>> pm.map("rotate", VectorArray([[1, 0, 0]]), gamma=90)
+        VectorArray(PointArray([[6.123234e-17, 1.000000e+00, 0.000000e+00]]))
+        >>> pm.close()
+
+
+        :param operation: Name of a Point or Vector method, such as "dist", "heading", "rotate" or "angle_between".
+        The PointArray or VectorArray method of the same name is used if there is one.
+        Or a module level function that takes a PointArray (or VectorArray) shard and returns
+        an array, a PointArray, a VectorArray, a list or a tuple of them
+        :param data: A list of Points or Vectors, a PointArray, a VectorArray or an (N, 3) array of points
+        :param args: Arguments of the operation, after the point or vector
+        :param kwargs: Keyword arguments of the operation
+        :return: Results in the order of the data. Arrays for numbers, a PointArray or a VectorArray for Points or
+        Vectors and a tuple of arrays for tuples
+        """
+        self.logger.info("Running {} in parallel".format(getattr(operation, "__name__", operation)))
+        data, kind = self._rows(data)
+        # Raise an error if there is nothing to run on
+        if len(data) == 0:
+            self.logger.error("Data must not be empty")
+            raise ValueError("Data must not be empty")
+
+        shards = min(len(data), self.workers * self.shards_per_worker)
+        bounds = np.linspace(0, len(data), shards + 1).astype(int).tolist()
+        if self.workers == 1:
+            # No need for processes
+            return self._merge([_apply(data[start:stop], kind, operation, args, kwargs)
+                                for start, stop in zip(bounds, bounds[1:])])
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        buffer = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        try:
+            np.ndarray(data.shape, dtype=np.float64, buffer=buffer.buf)[:] = data
+            futures = [self._executor.submit(_run_shard, buffer.name, data.shape, kind, start, stop,
+                                             operation, args, kwargs)
+                       for start, stop in zip(bounds, bounds[1:])]
+            return self._merge([future.result() for future in futures])
+        finally:
+            buffer.close()
+            buffer.unlink()
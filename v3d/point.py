@@ -5,9 +5,64 @@ from logging import Logger
 
 import math
 
+from . import settings
 
-class Point:
-    logger = getLogger('dummy')
+# Creates an instance without calling __init__
+_new = object.__new__
+
+
+class _LoggerAttribute:
+    """
+    The logger attribute of Point and Vector.
+    Returns the logger given to the instance, or the default logger if none was given.
+    Instances only keep a reference to a logger that was given to them.
+    """
+
+    def __init__(self, default: Logger) -> None:
+        self.default = default
+
+    def __get__(self, instance, owner=None) -> Logger:
+        # Class access such as cls.logger in class methods
+        if instance is None:
+            return self.default
+
+        logger = instance._logger
+        if logger is None:
+            return self.default
+
+        return logger
+
+    def __set__(self, instance, value: Logger) -> None:
+        instance._logger = value
+
+
+class _LoggerOwner(type):
+    """
+    Metaclass of the classes with a _LoggerAttribute.
+    Assigning the logger on the class, such as Point.logger = logger, changes the default logger
+    instead of replacing the attribute. Instances given their own logger keep it.
+    A subclass gets its own default, so its parents are not changed.
+    """
+
+    def __setattr__(cls, name: str, value) -> None:
+        if name == "logger":
+            # The closest class that has the attribute
+            attribute = next((klass.__dict__["logger"] for klass in cls.__mro__ if "logger" in klass.__dict__), None)
+            if isinstance(attribute, _LoggerAttribute):
+                if "logger" in cls.__dict__:
+                    attribute.default = value
+                    return
+
+                value = _LoggerAttribute(value)
+
+        super().__setattr__(name, value)
+
+
+class Point(metaclass=_LoggerOwner):
+    # No per instance __dict__. Keeps a Point at the size of its coordinates
+    __slots__ = ("x", "y", "z", "_logger")
+
+    logger = _LoggerAttribute(getLogger('dummy'))
 
     def __init__(self, x: float = 0, y: float = 0, z: float = 0, logger: Logger = None) -> None:
         """
@@ -24,14 +79,26 @@ class Point:
         :param z: Z value of a 3D Point. 0 by default
         :param logger: Logger to log
         """
-        if logger is not None:
-            self.logger = logger
+        # Only store the logger if it is given
+        self._logger = logger
 
         # Set given x, y and z values for global usage
         self.x = x
         self.y = y
         self.z = z
 
+    @classmethod
+    def _from_xyz(cls, x: float, y: float, z: float, logger: Logger = None) -> Point:
+        # Trusted constructor for the hot paths of v3d. Skips __init__ and its keyword handling.
+        # Nothing is checked. The logger is stored as given, None means the default logger.
+        # Returns an instance of the class it is called on
+        point = _new(cls)
+        point.x = x
+        point.y = y
+        point.z = z
+        point._logger = logger
+        return point
+
     def __repr__(self) -> str:
         return self.__str__()
 
@@ -50,7 +117,7 @@ class Point:
 
     def __neg__(self) -> Point:
         # Change x, y and z's sign on -a
-        return Point(x=-self.x, y=-self.y, z=-self.z, logger=self.logger)
+        return Point._from_xyz(-self.x, -self.y, -self.z, self._logger)
 
     def __mul__(self, scalar: float) -> Point:
         # Call self.scale on a * b
@@ -68,6 +135,22 @@ class Point:
         # Call self.is_same on a == b
         return self.is_same(other)
 
+    def __iadd__(self, other: Point) -> Point:
+        # Call self.add_ on a += b
+        return self.add_(other)
+
+    def __isub__(self, other: Point) -> Point:
+        # Call self.subtract_ on a -= b
+        return self.subtract_(other)
+
+    def __imul__(self, scalar: float) -> Point:
+        # Call self.scale_ on a *= b
+        return self.scale_(scalar)
+
+    def __itruediv__(self, scalar: float) -> Point:
+        # Call self.divide_ on a /= b
+        return self.divide_(scalar)
+
     def copy(self) -> Point:
         """
         Makes a copy of the given point
@@ -80,7 +163,7 @@ class Point:
 
         :return: The copied Point
         """
-        return Point(x=self.x, y=self.y, z=self.z, logger=self.logger)
+        return Point._from_xyz(self.x, self.y, self.z, self._logger)
 
     def divide(self, scalar: float) -> Point:
         """
@@ -98,21 +181,26 @@ class Point:
         if scalar == 0:
             raise ValueError("Cannot divide by zero")
         # Call self.scale for 1/scalar
-        self.logger.info("Calling Point.scale")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Point.scale")
         return self.scale(1 / scalar)
 
-    def to_polar(self) -> tuple:
+    def to_polar(self, radians: bool = False) -> tuple:
         """
         Returns Polar coordinates of the point
 
         >>> p = Point(1, 1, 1)
         >>> p.to_polar()
         (1.7320508075688772, 54.735610317245346, 45.0)
+        >>> p.to_polar(radians=True)
+        (1.7320508075688772, 0.9553166181245092, 0.7853981633974483)
 
 
+        :param radians: If True, return theta and phi in radians instead of degrees
         :return: tuple of r, theta and phi
         """
-        self.logger.info("Converting from cartesian to polar")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Converting from cartesian to polar")
         # Calculate distance from zero point. It will be the radius of the polar coordinate
         r = self.dist()
         # If r is zero no need to calculate angles.
@@ -122,6 +210,9 @@ class Point:
         # Normal cartesian to polar conversion
         phi = math.atan2(self.y, self.x)
         theta = math.acos(self.z / r)
+        if radians:
+            return r, theta, phi
+
         return r, math.degrees(theta), math.degrees(phi)
 
     def scale(self, scalar: float) -> Point:
@@ -136,13 +227,12 @@ class Point:
         :param scalar: Scalar to up scale
         :return: The new up scaled Point
         """
-        self.logger.info("Scaling the {}".format(self))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Scaling the %s", self)
         # If scalar is float or int (in short if it's numeric)
         if isinstance(scalar, (int, float)):
             # Multiply each x, y and z values by scalar.
-            return Point(x=self.x * scalar,
-                         y=self.y * scalar,
-                         z=self.z * scalar, logger=self.logger)
+            return Point._from_xyz(self.x * scalar, self.y * scalar, self.z * scalar, self._logger)
         else:
             # Raise an error if scalar is not numeric
             self.logger.error("Scalar must be float or int type")
@@ -161,7 +251,8 @@ class Point:
         :param other: The point to subtract from this point
         :return: The subtraction result as a Point
         """
-        self.logger.info("Calling Point.add")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Point.add")
         # Call add with negative value of other point
         return self.add(-other)
 
@@ -178,19 +269,116 @@ class Point:
         :param other: The point to add to this point
         :return: The addition result as a Point
         """
-        self.logger.info(f"Calculating {self} + {other}")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s + %s", self, other)
         # Check if the other is a Point
         if isinstance(other, Point):
             # Add other's x, y and z values to Point's each x, y and z values.
-            return Point(x=self.x + other.x,
-                         y=self.y + other.y,
-                         z=self.z + other.z, logger=self.logger)
+            return Point._from_xyz(self.x + other.x, self.y + other.y, self.z + other.z, self._logger)
 
         else:
             # Raise an error if other is not a Point
             self.logger.error("Data must be a Point type")
             raise ValueError("Data must be a Point type")
 
+    def add_(self, other: Point) -> Point:
+        """
+        Adds the other point to this point in place. Same as add without creating a new Point.
+        Notice a Vector does not copy its Point. Changing the Point changes the Vector too
+
+        >>> p = Point(1, 2, 3)
+        >>> p.add_(Point(1, 1, 1))
+        Point(x=2, y=3, z=4)
+        >>> p
+        Point(x=2, y=3, z=4)
+
+
+        :param other: The point to add to this point
+        :return: This point
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s += %s", self, other)
+        # Check if the other is a Point
+        if isinstance(other, Point):
+            self.x += other.x
+            self.y += other.y
+            self.z += other.z
+            return self
+        else:
+            # Raise an error if other is not a Point
+            self.logger.error("Data must be a Point type")
+            raise ValueError("Data must be a Point type")
+
+    def subtract_(self, other: Point) -> Point:
+        """
+        Subtracts the other point from this point in place. Same as subtract without creating a new Point
+
+        >>> p = Point(1, 2, 3)
+        >>> p.subtract_(Point(1, 1, 1))
+        Point(x=0, y=1, z=2)
+
+
+        :param other: The point to subtract from this point
+        :return: This point
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s -= %s", self, other)
+        # Check if the other is a Point
+        if isinstance(other, Point):
+            self.x -= other.x
+            self.y -= other.y
+            self.z -= other.z
+            return self
+        else:
+            # Raise an error if other is not a Point
+            self.logger.error("Data must be a Point type")
+            raise ValueError("Data must be a Point type")
+
+    def scale_(self, scalar: float) -> Point:
+        """
+        Scales this point in place. Same as scale without creating a new Point
+
+        >>> p = Point(1, 1, 1)
+        >>> p.scale_(2)
+        Point(x=2, y=2, z=2)
+
+
+        :param scalar: Scalar to up scale
+        :return: This point
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Scaling the %s in place", self)
+        # If scalar is float or int (in short if it's numeric)
+        if isinstance(scalar, (int, float)):
+            self.x *= scalar
+            self.y *= scalar
+            self.z *= scalar
+            return self
+        else:
+            # Raise an error if scalar is not numeric
+            self.logger.error("Scalar must be float or int type")
+            raise ValueError("Scalar must be float or int type")
+
+    def divide_(self, scalar: float) -> Point:
+        """
+        Down scales this point in place. Same as divide without creating a new Point
+
+        >>> p = Point(2, 2, 2)
+        >>> p.divide_(2)
+        Point(x=1.0, y=1.0, z=1.0)
+
+
+        :param scalar: Scalar to down scale
+        :return: This point
+        """
+        # Raise an error if scalar is zero
+        if scalar == 0:
+            raise ValueError("Cannot divide by zero")
+        # Call self.scale_ for 1/scalar. Same as divide
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Point.scale_")
+        return self.scale_(1 / scalar)
+
     def dist(self, other: Point = None) -> float:
         """
         Returns distance between two Points if the other is given.
@@ -207,7 +395,8 @@ class Point:
         :param other: Point to calculate distance between this point.
         :return: The distance
         """
-        self.logger.info("Calculating distance between {} and {}".format(self, other))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating distance between %s and %s", self, other)
         # Check if the other is None.
         # If it is create a zero point and assign it to other.
         # This way if other is not given, distance from origin will be calculated.
@@ -219,8 +408,11 @@ class Point:
         if isinstance(other, Point):
             # Calculate r for 3D.
             # r^2 = (x1 - x2)^2 + (y1 - y2)^2 + (z1 - z2)^2
-            return math.sqrt(math.pow(self.x - other.x, 2) + math.pow(self.y - other.y, 2) +
-                             math.pow(self.z - other.z, 2))
+            # Squares as products. math.pow may round differently than numpy, which PointArray.dist uses
+            dx = self.x - other.x
+            dy = self.y - other.y
+            dz = self.z - other.z
+            return math.sqrt(dx * dx + dy * dy + dz * dz)
         else:
             # Raise an error if other is not a Point
             self.logger.error("Data must be Point type")
@@ -244,7 +436,8 @@ class Point:
         :param tolerance: Tolerance for equality
         :return: True if the two points are the same, False if otherwise.
         """
-        self.logger.info(f"Checking if {self} and {other} are same points")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if %s and %s are same points", self, other)
         # Check if other is a Point
         if isinstance(other, Point):
             # Check if each element of each Point is equal to each element of other
@@ -255,34 +448,87 @@ class Point:
             self.logger.error("Data must be Point type")
             raise ValueError("Data must be Point type")
 
+    def grid_key(self, tolerance: float = 0.0001) -> tuple:
+        """
+        Returns a hashable key of the point snapped to a grid of tolerance sized cells.
+        Points with the same key are within tolerance of each other.
+        Same points (see is_same) may fall into neighbouring cells. Use PointSet for tolerance aware set membership.
+
+        >>> Point(1, 2, 3).grid_key()
+        (10000, 20000, 30000)
+        >>> Point(1.00001, 2, 3).grid_key() == Point(1, 2, 3).grid_key()
+        True
+
+
+        :param tolerance: Tolerance for equality. Size of the grid cells
+        :return: tuple of x, y and z cell numbers
+        """
+        # Raise an error if tolerance is not positive
+        if tolerance <= 0:
+            self.logger.error("Tolerance must be positive")
+            raise ValueError("Tolerance must be positive")
+
+        return round(self.x / tolerance), round(self.y / tolerance), round(self.z / tolerance)
+
     @classmethod
-    def from_polar(cls, r: float, theta: float, phi: float) -> Point:
+    def from_polar(cls, r: float, theta: float, phi: float, radians: bool = False) -> Point:
         """
         Returns a point from given polar values.
 
         >>> Point.from_polar(1.7320508075688772, 54.735610317245346, 45.0)
         Point(x=1.0, y=0.9999999999999998, z=0.9999999999999999)
+        >>> Point.from_polar(1, math.pi / 2, 0, radians=True)
+        Point(x=1.0, y=0.0, z=6.123233995736766e-17)
 
 
         :param r: Distance from origin
         :param theta: Theta angle
         :param phi: Phi angle
+        :param radians: If True, theta and phi are in radians instead of degrees
         :return: The created Point
         """
-        cls.logger.info("Calculating polar to cartesian")
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Calculating polar to cartesian")
         # Check if r, theta and phi are float or it (in short if they're numeric)
         if isinstance(r, (int, float)) and isinstance(theta, (int, float)) and isinstance(phi, (int, float)):
             # Convert from degrees to radians
-            theta = math.radians(theta)
-            phi = math.radians(phi)
+            if not radians:
+                theta = math.radians(theta)
+                phi = math.radians(phi)
 
             # Jacobian x, y and z calculation
             x = r * math.sin(theta) * math.cos(phi)
             y = r * math.sin(theta) * math.sin(phi)
             z = r * math.cos(theta)
 
-            return Point(x=x, y=y, z=z, logger=cls.logger)
+            return cls._from_xyz(x, y, z, cls.logger)
         else:
             # Raise an error if r, theta or phi is not numeric
             cls.logger.error("Data must be numeric type")
             raise ValueError("Data must be numeric type")
+
+    @classmethod
+    def from_sequence(cls, values, logger: Logger = None) -> Point:
+        """
+        Returns a point from a sequence of x, y and z values, such as a tuple, a list or a row of an array
+
+        >>> Point.from_sequence((1, 2, 3))
+        Point(x=1, y=2, z=3)
+        >>> Point.from_sequence([1, 2])
+        Traceback (most recent call last):
+        ...
+        ValueError: Data must have three values
+
+
+        :param values: x, y and z values
+        :param logger: Logger to log
+        :return: The created Point
+        """
+        try:
+            x, y, z = values
+        except (TypeError, ValueError):
+            # Raise an error if values is not a sequence of three values
+            cls.logger.error("Data must have three values")
+            raise ValueError("Data must have three values")
+
+        return cls(x, y, z, logger)
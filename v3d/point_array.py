@@ -0,0 +1,530 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import math
+import numbers
+
+import numpy as np
+
+from . import settings
+from .point import Point
+
+# Rows converted at once by the exact (math module) path of to_polar. Bounds the memory of the temporary lists
+_CHUNK_SIZE = 65536
+
+
+class PointArray:
+    logger = getLogger('dummy')
+
+    def __init__(self, data=None, logger: Logger = None) -> None:
+        """
+        Constructor method. Stores N points in one contiguous (N, 3) float64 buffer
+
+        >>> PointArray([Point(1, 1, 1), Point(1, 2, 3)])
+        PointArray([[1., 1., 1.],
+                    [1., 2., 3.]])
+
+        >>> PointArray([[1, 1, 1]])
+        PointArray([[1., 1., 1.]])
+
+
+        :param data: A list of Points, a PointArray, a Point or anything numpy can convert to an (N, 3) array
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # If the data is not given. Create an empty array
+        if data is None:
+            data = np.empty((0, 3))
+        elif isinstance(data, PointArray):
+            data = data.data
+        elif isinstance(data, Point):
+            data = [[data.x, data.y, data.z]]
+        elif isinstance(data, (list, tuple)) and len(data) > 0 and isinstance(data[0], Point):
+            data = self._points_to_array(data)
+
+        # Do not copy if the data is already a contiguous float64 array
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim == 1 and data.shape[0] == 0:
+            data = data.reshape(0, 3)
+
+        # Raise an error if the data is not an (N, 3) array
+        if data.ndim != 2 or data.shape[1] != 3:
+            self.logger.error("Data must be an (N, 3) array")
+            raise ValueError("Data must be an (N, 3) array")
+
+        self.data = data
+
+    @staticmethod
+    def _points_to_array(points: list) -> np.ndarray:
+        # Check if each element is a Point
+        if not all(isinstance(point, Point) for point in points):
+            raise ValueError("Data must be Point type")
+
+        # Fill the buffer at once instead of creating a (x, y, z) list for each Point
+        return np.fromiter((coordinate for point in points for coordinate in (point.x, point.y, point.z)),
+                           dtype=np.float64, count=3 * len(points)).reshape(-1, 3)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        prefix = f"{self.__class__.__name__}("
+        return f"{prefix}{np.array2string(self.data, separator=', ', prefix=prefix)})"
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, index) -> Union[Point, PointArray]:
+        # Return a Point for an integer index and a PointArray for slices and masks
+        if isinstance(index, (int, np.integer)):
+            x, y, z = self.data[index].tolist()
+            return Point._from_xyz(x, y, z, self.logger)
+
+        return PointArray(self.data[index], logger=self.logger)
+
+    def __iter__(self):
+        for x, y, z in self.data.tolist():
+            yield Point._from_xyz(x, y, z, self.logger)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None:
+            return self.data
+
+        return self.data.astype(dtype)
+
+    # From https://docs.python.org/3/library/operator.html
+    def __sub__(self, other: Union[Point, PointArray]) -> PointArray:
+        # Call self.subtract on a - b
+        return self.subtract(other)
+
+    def __add__(self, other: Union[Point, PointArray]) -> PointArray:
+        # Call self.add on a + b
+        return self.add(other)
+
+    def __neg__(self) -> PointArray:
+        # Change x, y and z's sign on -a
+        return PointArray(-self.data, logger=self.logger)
+
+    def __mul__(self, scalar) -> PointArray:
+        # Call self.scale on a * b
+        return self.scale(scalar)
+
+    def __rmul__(self, scalar) -> PointArray:
+        # Call self.scale on b * a
+        return self.scale(scalar)
+
+    def __truediv__(self, scalar) -> PointArray:
+        # Call self.divide on a / b
+        return self.divide(scalar)
+
+    def __eq__(self, other: Union[Point, PointArray]) -> np.ndarray:
+        # Call self.is_same on a == b
+        return self.is_same(other)
+
+    def __iadd__(self, other: Union[Point, PointArray]) -> PointArray:
+        # Call self.add_ on a += b
+        return self.add_(other)
+
+    def __isub__(self, other: Union[Point, PointArray]) -> PointArray:
+        # Call self.subtract_ on a -= b
+        return self.subtract_(other)
+
+    def __imul__(self, scalar) -> PointArray:
+        # Call self.scale_ on a *= b
+        return self.scale_(scalar)
+
+    def __itruediv__(self, scalar) -> PointArray:
+        # Call self.divide_ on a /= b
+        return self.divide_(scalar)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    def _coordinates(self, other: Union[Point, PointArray]) -> np.ndarray:
+        # Returns other as an array that broadcasts against self.data
+        if isinstance(other, Point):
+            return np.array([other.x, other.y, other.z], dtype=np.float64)
+        elif isinstance(other, PointArray):
+            # Raise an error if the lengths cannot be broadcast
+            if len(other) not in (1, len(self)):
+                self.logger.error("PointArrays must have the same length")
+                raise ValueError("PointArrays must have the same length")
+
+            return other.data
+        else:
+            # Raise an error if other is not a Point
+            self.logger.error("Data must be Point or PointArray type")
+            raise ValueError("Data must be Point or PointArray type")
+
+    def _scalars(self, scalar) -> Union[float, np.ndarray]:
+        # Returns scalar as a float or as an (N, 1) column that broadcasts against self.data.
+        # numpy scalars, such as the results of reductions, are numbers too
+        if isinstance(scalar, numbers.Real):
+            return float(scalar)
+
+        scalar = np.asarray(scalar)
+        if scalar.ndim == 0 and np.issubdtype(scalar.dtype, np.number) and \
+                not np.issubdtype(scalar.dtype, np.complexfloating):
+            return float(scalar)
+
+        # Check if scalar is a numeric array with one value for each point
+        if scalar.ndim == 1 and scalar.shape[0] in (1, len(self)) and np.issubdtype(scalar.dtype, np.number):
+            return scalar.astype(np.float64)[:, None]
+
+        # Raise an error if scalar is not numeric
+        self.logger.error("Scalar must be float or int type")
+        raise ValueError("Scalar must be float or int type")
+
+    @classmethod
+    def from_points(cls, points: list, logger: Logger = None) -> PointArray:
+        """
+        Creates a PointArray from a list of Points
+
+        >>> PointArray.from_points([Point(1, 2, 3)])
+        PointArray([[1., 2., 3.]])
+
+
+        :param points: List of Points
+        :param logger: Logger to log
+        :return: The created PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating PointArray from Points")
+        # Generators have no length. Make a list once
+        points = list(points)
+        return cls(cls._points_to_array(points) if len(points) > 0 else None, logger=logger)
+
+    def to_points(self) -> list:
+        """
+        Returns the points as a list of Points
+
+        >>> PointArray([[1, 2, 3]]).to_points()
+        [Point(x=1.0, y=2.0, z=3.0)]
+
+
+        :return: List of Points
+        """
+        return list(self)
+
+    def copy(self) -> PointArray:
+        """
+        Makes a copy of the PointArray
+
+        >>> PointArray([[1, 1, 1]]).copy()
+        PointArray([[1., 1., 1.]])
+
+
+        :return: The copied PointArray
+        """
+        return PointArray(self.data.copy(), logger=self.logger)
+
+    def add(self, other: Union[Point, PointArray]) -> PointArray:
+        """
+        Returns addition of the points with a Point or with another PointArray, element by element
+
+        >>> pa = PointArray([[1, 2, 3], [0, 0, 0]])
+        >>> pa.add(Point(1, 1, 1))
+        PointArray([[2., 3., 4.],
+                    [1., 1., 1.]])
+
+
+        :param other: A Point to add to each point or a PointArray of the same length
+        :return: The addition result as a PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating PointArray addition")
+        return PointArray(self.data + self._coordinates(other), logger=self.logger)
+
+    def subtract(self, other: Union[Point, PointArray]) -> PointArray:
+        """
+        Returns subtraction of a Point or of another PointArray from the points, element by element
+
+        >>> pa = PointArray([[1, 2, 3], [0, 0, 0]])
+        >>> pa.subtract(Point(1, 1, 1))
+        PointArray([[ 0.,  1.,  2.],
+                    [-1., -1., -1.]])
+
+
+        :param other: A Point to subtract from each point or a PointArray of the same length
+        :return: The subtraction result as a PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating PointArray subtraction")
+        return PointArray(self.data - self._coordinates(other), logger=self.logger)
+
+    def scale(self, scalar) -> PointArray:
+        """
+        Returns up scaled points
+
+        >>> pa = PointArray([[1, 1, 1], [1, 2, 3]])
+        >>> pa.scale(2)
+        PointArray([[2., 2., 2.],
+                    [2., 4., 6.]])
+        >>> pa.scale([1, 2])
+        PointArray([[1., 1., 1.],
+                    [2., 4., 6.]])
+
+
+        :param scalar: Scalar to up scale or a sequence of one scalar for each point
+        :return: The new up scaled PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Scaling PointArray")
+        return PointArray(self.data * self._scalars(scalar), logger=self.logger)
+
+    def divide(self, scalar) -> PointArray:
+        """
+        Returns down scaled points
+
+        >>> pa = PointArray([[2, 2, 2]])
+        >>> pa.divide(2)
+        PointArray([[1., 1., 1.]])
+
+
+        :param scalar: Scalar to down scale or a sequence of one scalar for each point
+        :return: The new down scaled PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Dividing PointArray")
+        scalar = self._scalars(scalar)
+        # Raise an error if scalar is zero
+        if np.any(np.asarray(scalar) == 0):
+            self.logger.error("Cannot divide by zero")
+            raise ValueError("Cannot divide by zero")
+
+        return PointArray(self.data / scalar, logger=self.logger)
+
+    def add_(self, other: Union[Point, PointArray]) -> PointArray:
+        """
+        Adds a Point or another PointArray to the points in place, writing into the buffer.
+        Notice the buffer is not copied from an array given to the constructor. That array changes too
+
+        >>> pa = PointArray([[1, 2, 3]])
+        >>> pa.add_(Point(1, 1, 1))
+        PointArray([[2., 3., 4.]])
+
+
+        :param other: A Point to add to each point or a PointArray of the same length
+        :return: This PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating PointArray addition in place")
+        np.add(self.data, self._coordinates(other), out=self.data)
+        return self
+
+    def subtract_(self, other: Union[Point, PointArray]) -> PointArray:
+        """
+        Subtracts a Point or another PointArray from the points in place, writing into the buffer
+
+        >>> pa = PointArray([[1, 2, 3]])
+        >>> pa.subtract_(Point(1, 1, 1))
+        PointArray([[0., 1., 2.]])
+
+
+        :param other: A Point to subtract from each point or a PointArray of the same length
+        :return: This PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating PointArray subtraction in place")
+        np.subtract(self.data, self._coordinates(other), out=self.data)
+        return self
+
+    def scale_(self, scalar) -> PointArray:
+        """
+        Scales the points in place, writing into the buffer
+
+        >>> pa = PointArray([[1, 2, 3]])
+        >>> pa.scale_(2)
+        PointArray([[2., 4., 6.]])
+
+
+        :param scalar: Scalar to up scale or a sequence of one scalar for each point
+        :return: This PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Scaling PointArray in place")
+        np.multiply(self.data, self._scalars(scalar), out=self.data)
+        return self
+
+    def divide_(self, scalar) -> PointArray:
+        """
+        Down scales the points in place, writing into the buffer
+
+        >>> pa = PointArray([[2, 4, 6]])
+        >>> pa.divide_(2)
+        PointArray([[1., 2., 3.]])
+
+
+        :param scalar: Scalar to down scale or a sequence of one scalar for each point
+        :return: This PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Dividing PointArray in place")
+        scalar = self._scalars(scalar)
+        # Raise an error if scalar is zero
+        if np.any(np.asarray(scalar) == 0):
+            self.logger.error("Cannot divide by zero")
+            raise ValueError("Cannot divide by zero")
+
+        np.divide(self.data, scalar, out=self.data)
+        return self
+
+    def dist(self, other: Union[Point, PointArray] = None) -> np.ndarray:
+        """
+        Returns distances between the points and the other if the other is given.
+        Returns distances from origin if the other is not given
+
+        >>> pa = PointArray([[2, 2, 2], [1, 1, 1]])
+        >>> pa.dist()
+        array([3.46410162, 1.73205081])
+        >>> pa.dist(Point(1, 1, 1))
+        array([1.73205081, 0.        ])
+
+
+        :param other: A Point or a PointArray of the same length to calculate distance between the points.
+        :return: The distances
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating PointArray distances")
+        diff = self.data if other is None else self.data - self._coordinates(other)
+        # Same summation order as Point.dist, so the results are identical
+        return np.sqrt(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1] + diff[:, 2] * diff[:, 2])
+
+    def is_same(self, other: Union[Point, PointArray], tolerance: float = 0.0001) -> np.ndarray:
+        """
+        Checks if the points are the same as the other, element by element
+
+        >>> pa = PointArray([[1, 1, 1], [1, 1, 2]])
+        >>> pa.is_same(Point(1, 1, 1))
+        array([ True, False])
+
+
+        :param other: A Point or a PointArray of the same length to compare with the points.
+        :param tolerance: Tolerance for equality
+        :return: A boolean mask, True where the points are the same
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if PointArray points are same")
+        return np.all(np.abs(self.data - self._coordinates(other)) < tolerance, axis=1)
+
+    def grid_keys(self, tolerance: float = 0.0001) -> np.ndarray:
+        """
+        Returns the points snapped to a grid of tolerance sized cells. Same as Point.grid_key for each point
+
+        >>> PointArray([[1, 2, 3], [1.00001, 2, 3]]).grid_keys()
+        array([[10000, 20000, 30000],
+               [10000, 20000, 30000]])
+
+
+        :param tolerance: Tolerance for equality. Size of the grid cells
+        :return: (N, 3) array of x, y and z cell numbers
+        """
+        # Raise an error if tolerance is not positive
+        if tolerance <= 0:
+            self.logger.error("Tolerance must be positive")
+            raise ValueError("Tolerance must be positive")
+
+        # rint rounds half to even, same as round
+        return np.rint(self.data / tolerance).astype(np.int64)
+
+    def to_polar(self, radians: bool = False, exact: bool = True) -> tuple:
+        """
+        Returns Polar coordinates of the points. Same as Point.to_polar for each point
+
+        >>> PointArray([[1, 1, 1], [0, 0, 0]]).to_polar()
+        (array([1.73205081, 0.        ]), array([54.73561032,  0.        ]), array([45.,  0.]))
+        >>> PointArray([[1, 1, 1]]).to_polar(radians=True)
+        (array([1.73205081]), array([0.95531662]), array([0.78539816]))
+
+
+        :param radians: If True, return theta and phi in radians instead of degrees
+        :param exact: If True, angles are calculated by the math module, as Point.to_polar does,
+        and match it exactly. If False, numpy's faster atan2 and arccos are used,
+        which may differ in the last digit
+        :return: tuple of r, theta and phi arrays
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Converting PointArray from cartesian to polar")
+        r = self.dist()
+        # If r is zero angles are zero. Same as Point.to_polar
+        zero = r == 0
+        ratio = self.z / np.where(zero, 1, r)
+
+        # Normal cartesian to polar conversion
+        if exact:
+            phi = np.empty(len(self))
+            theta = np.empty(len(self))
+            for start in range(0, len(self), _CHUNK_SIZE):
+                stop = start + _CHUNK_SIZE
+                phi[start:stop] = np.fromiter(map(math.atan2, self.y[start:stop].tolist(), self.x[start:stop].tolist()),
+                                              dtype=np.float64, count=len(phi[start:stop]))
+                theta[start:stop] = np.fromiter(map(math.acos, ratio[start:stop].tolist()),
+                                                dtype=np.float64, count=len(theta[start:stop]))
+        else:
+            phi = np.arctan2(self.y, self.x)
+            theta = np.arccos(ratio)
+
+        phi[zero] = 0
+        theta[zero] = 0
+        if not radians:
+            # Convert from radians to degrees in place
+            np.degrees(theta, out=theta)
+            np.degrees(phi, out=phi)
+
+        return r, theta, phi
+
+    @classmethod
+    def from_polar(cls, r, theta, phi, radians: bool = False, logger: Logger = None) -> PointArray:
+        """
+        Returns points from given polar values. Same as Point.from_polar for each point
+
+        >>> PointArray.from_polar([1.7320508075688772], [54.735610317245346], [45.0])
+        PointArray([[1., 1., 1.]])
+        >>> PointArray.from_polar([1, 2], np.pi / 2, 0, radians=True).x
+        array([1., 2.])
+
+
+        :param r: Distances from origin
+        :param theta: Theta angles
+        :param phi: Phi angles
+        :param radians: If True, theta and phi are in radians instead of degrees
+        :param logger: Logger to log
+        :return: The created PointArray
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Calculating PointArray polar to cartesian")
+        try:
+            r, theta, phi = np.broadcast_arrays(np.asarray(r, dtype=np.float64),
+                                                np.asarray(theta, dtype=np.float64),
+                                                np.asarray(phi, dtype=np.float64))
+        except (TypeError, ValueError):
+            # Raise an error if r, theta or phi is not numeric
+            cls.logger.error("Data must be numeric type")
+            raise ValueError("Data must be numeric type")
+
+        # Convert from degrees to radians
+        if not radians:
+            theta = np.radians(theta)
+            phi = np.radians(phi)
+
+        # Jacobian x, y and z calculation
+        data = np.empty(r.shape + (3,))
+        sin_theta = np.sin(theta)
+        data[..., 0] = r * sin_theta * np.cos(phi)
+        data[..., 1] = r * sin_theta * np.sin(phi)
+        data[..., 2] = r * np.cos(theta)
+        return cls(data.reshape(-1, 3), logger=logger)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import itertools
+
+import numpy as np
+
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+
+# Cell offsets of a cell and its 26 neighbours. The cell itself is checked first
+_NEIGHBOURS = sorted(itertools.product((-1, 0, 1), repeat=3), key=lambda offset: offset != (0, 0, 0))
+
+
+class PointSet:
+    logger = getLogger('dummy')
+
+    def __init__(self, points=None, tolerance: float = 0.0001, logger: Logger = None) -> None:
+        """
+        Constructor method. A set of points where membership uses Point.is_same instead of exact equality.
+        Points are hashed into a grid of tolerance sized cells (see Point.grid_key),
+        so adding or looking up a point only compares it with the members of 27 cells
+
+        >>> ps = PointSet([Point(1, 1, 1), Point(1.00001, 1, 1), Point(2, 2, 2)])
+        >>> ps
+        PointSet(points=2, tolerance=0.0001)
+        >>> Point(1, 1, 1.00005) in ps
+        True
+
+
+        :param points: Points to add. A list of Points, a PointArray or an (N, 3) array
+        :param tolerance: Tolerance for equality. Same as in Point.is_same
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if tolerance is not positive
+        if not isinstance(tolerance, (int, float)) or tolerance <= 0:
+            self.logger.error("Tolerance must be positive")
+            raise ValueError("Tolerance must be positive")
+
+        self.tolerance = tolerance
+        # Members in the order they were added, and member indices in each grid cell
+        self._points = []
+        self._cells = {}
+
+        if points is not None:
+            self.update(points)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(points={len(self)}, tolerance={self.tolerance})"
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __iter__(self):
+        for x, y, z in self._points:
+            yield Point._from_xyz(x, y, z, self.logger)
+
+    def __contains__(self, point: Union[Point, Vector]) -> bool:
+        return self.index(point) != -1
+
+    def _coordinates(self, point: Union[Point, Vector]) -> tuple:
+        # Returns x, y and z of a Point or a Vector
+        if isinstance(point, Vector):
+            point = point.point
+
+        if isinstance(point, Point):
+            return point.x, point.y, point.z
+        else:
+            # Raise an error if point is not a Point
+            self.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+    def _find(self, x: float, y: float, z: float, key: tuple) -> int:
+        # Returns index of a member that is the same as x, y, z. -1 if there is none
+        tolerance = self.tolerance
+        cells = self._cells
+        points = self._points
+        i, j, k = key
+        for di, dj, dk in _NEIGHBOURS:
+            members = cells.get((i + di, j + dj, k + dk))
+            if members is None:
+                continue
+
+            for index in members:
+                mx, my, mz = points[index]
+                if abs(x - mx) < tolerance and abs(y - my) < tolerance and abs(z - mz) < tolerance:
+                    return index
+
+        return -1
+
+    def _add(self, x: float, y: float, z: float, key: tuple) -> int:
+        # Returns index of the member that is the same as x, y, z. Adds it first if there is none
+        index = self._find(x, y, z, key)
+        if index == -1:
+            index = len(self._points)
+            self._points.append((x, y, z))
+            self._cells.setdefault(key, []).append(index)
+
+        return index
+
+    def index(self, point: Union[Point, Vector]) -> int:
+        """
+        Returns index of the member that is the same as the point
+
+        >>> ps = PointSet([Point(1, 1, 1), Point(2, 2, 2)])
+        >>> ps.index(Point(2, 2, 2.00001))
+        1
+        >>> ps.index(Point(3, 3, 3))
+        -1
+
+
+        :param point: A Point or a Vector
+        :return: Index of the member in the order members were added. -1 if the point is not a member
+        """
+        x, y, z = self._coordinates(point)
+        return self._find(x, y, z, Point._from_xyz(x, y, z).grid_key(self.tolerance))
+
+    def add(self, point: Union[Point, Vector]) -> int:
+        """
+        Adds the point unless a member is the same as it
+
+        >>> ps = PointSet()
+        >>> ps.add(Point(1, 1, 1))
+        0
+        >>> ps.add(Point(1.00001, 1, 1))
+        0
+
+
+        :param point: A Point or a Vector
+        :return: Index of the added point, or of the member that is the same as it
+        """
+        x, y, z = self._coordinates(point)
+        return self._add(x, y, z, Point._from_xyz(x, y, z).grid_key(self.tolerance))
+
+    def update(self, points) -> np.ndarray:
+        """
+        Adds many points. Each point that is the same as a member (or an earlier point) is not added
+
+        >>> ps = PointSet()
+        >>> ps.update([[0, 0, 0], [1, 1, 1], [0, 0, 0.00001]])
+        array([0, 1, 0])
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :return: Index of the member each point ended up as
+        """
+        self.logger.info("Adding points to PointSet")
+        points = PointArray(points, logger=self.logger)
+        keys = points.grid_keys(self.tolerance).tolist()
+        return np.fromiter((self._add(x, y, z, tuple(key)) for (x, y, z), key in zip(points.data.tolist(), keys)),
+                           dtype=np.int64, count=len(points))
+
+    def to_array(self) -> PointArray:
+        """
+        Returns the members as a PointArray
+
+        >>> PointSet([[1, 1, 1], [1, 1, 1]]).to_array()
+        PointArray([[1., 1., 1.]])
+
+
+        :return: The members
+        """
+        return PointArray(self._points if self._points else None, logger=self.logger)
+
+    @classmethod
+    def weld(cls, points, tolerance: float = 0.0001, logger: Logger = None) -> tuple:
+        """
+        Welds points that are the same (see Point.is_same) into one.
+        Each point is welded to a unique point it is the same as, or becomes a unique point itself.
+        Runs in near linear time instead of comparing every point with every other
+
+        >>> unique, inverse = PointSet.weld([[0, 0, 0], [1, 1, 1], [0, 0, 0.00001]])
+        >>> unique
+        PointArray([[0., 0., 0.],
+                    [1., 1., 1.]])
+        >>> inverse
+        array([0, 1, 0])
+
+
+        :param points: A list of Points, a PointArray or an (N, 3) array
+        :param tolerance: Tolerance for equality
+        :param logger: Logger to log
+        :return: tuple of the unique points as a PointArray and, for each point, index of its unique point
+        """
+        cls.logger.info("Welding points")
+        point_set = cls(tolerance=tolerance, logger=logger)
+        inverse = point_set.update(points)
+        return point_set.to_array(), inverse
@@ -0,0 +1,414 @@
+from __future__ import annotations
+from typing import Union, Optional
+
+from logging import getLogger
+from logging import Logger
+
+import math
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .vector import Vector
+from .vector_array import VectorArray
+from .mesh import TriangleMesh
+
+# Batched intersections below use the same operations in the same order as the methods of a single primitive,
+# so a ray gets exactly the same distance from both. _dot and _cross are the VectorArray helpers
+_dot = VectorArray._dot
+_cross = VectorArray._cross
+
+
+def _check_vector(vector: Vector, logger: Logger) -> None:
+    # Raise an error if the vector is not a non-zero Vector
+    if not isinstance(vector, Vector):
+        logger.error("Data must be Vector type")
+        raise ValueError("Data must be Vector type")
+
+    # Same tolerance as Vector.angle_between and VectorArray: every coordinate is closer to zero than 0.0001
+    if abs(vector.point.x) < 0.0001 and abs(vector.point.y) < 0.0001 and abs(vector.point.z) < 0.0001:
+        logger.error("{} is not a valid Vector".format(vector))
+        raise ValueError("{} is not a valid Vector".format(vector))
+
+
+def _check_point(point: Point, logger: Logger) -> None:
+    # Raise an error if the point is not a Point
+    if not isinstance(point, Point):
+        logger.error("Data must be Point type")
+        raise ValueError("Data must be Point type")
+
+
+class Ray:
+    logger = getLogger('dummy')
+
+    def __init__(self, origin: Point, direction: Vector, logger: Logger = None) -> None:
+        """
+        Constructor method. A half line starting at origin and going along direction.
+        Distances along the ray are in units of the length of direction
+
+        >>> ray = Ray(Point(0, 0, -5), Vector(Point(0, 0, 1)))
+        >>> ray
+        Ray(origin=Point(x=0, y=0, z=-5), direction=Vector(Point(x=0, y=0, z=1)))
+        >>> ray.intersect(Sphere(Point(0, 0, 0), 1))
+        4.0
+
+
+        :param origin: Start of the ray
+        :param direction: Direction of the ray. Must not be a zero Vector
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        _check_point(origin, self.logger)
+        _check_vector(direction, self.logger)
+        self.origin = origin
+        self.direction = direction
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(origin={self.origin}, direction={self.direction})"
+
+    def at(self, t: float) -> Point:
+        """
+        Returns the point at distance t along the ray
+
+        >>> Ray(Point(1, 0, 0), Vector(Point(0, 2, 0))).at(1.5)
+        Point(x=1.0, y=3.0, z=0.0)
+
+
+        :param t: Distance along the ray, in units of the length of direction
+        :return: The Point
+        """
+        o, d = self.origin, self.direction.point
+        return Point(o.x + d.x * t, o.y + d.y * t, o.z + d.z * t, logger=self.logger)
+
+    def intersect(self, target: Union[Plane, Sphere, Triangle]) -> Optional[float]:
+        """
+        Returns the distance along the ray to its first hit with the target
+
+        >>> ray = Ray(Point(0.2, 0.2, 1), Vector(Point(0, 0, -1)))
+        >>> ray.intersect(Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)))
+        1.0
+        >>> ray.intersect(Plane(Point(0, 0, 2), Vector(Point(0, 0, 1)))) is None
+        True
+
+
+        :param target: A Plane, a Sphere or a Triangle
+        :return: Distance t of the hit, so the hit point is ray.at(t). None if the ray misses
+        """
+        if isinstance(target, (Plane, Sphere, Triangle)):
+            return target.intersect(self)
+
+        # Raise an error if target can not be hit
+        self.logger.error("Data must be Plane, Sphere or Triangle type")
+        raise ValueError("Data must be Plane, Sphere or Triangle type")
+
+
+class Plane:
+    logger = getLogger('dummy')
+
+    def __init__(self, point: Point, normal: Vector, logger: Logger = None) -> None:
+        """
+        Constructor method. An infinite plane through point, perpendicular to normal
+
+        >>> Plane(Point(0, 0, 1), Vector(Point(0, 0, 1)))
+        Plane(point=Point(x=0, y=0, z=1), normal=Vector(Point(x=0, y=0, z=1)))
+
+
+        :param point: A point on the plane
+        :param normal: Normal of the plane. Must not be a zero Vector
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        _check_point(point, self.logger)
+        _check_vector(normal, self.logger)
+        self.point = point
+        self.normal = normal
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(point={self.point}, normal={self.normal})"
+
+    def distance(self, point: Point) -> float:
+        """
+        Returns the signed distance of a point from the plane. Positive on the side the normal points to
+
+        >>> Plane(Point(0, 0, 1), Vector(Point(0, 0, 2))).distance(Point(5, 5, -1))
+        -2.0
+
+
+        :param point: The Point
+        :return: The signed distance
+        """
+        p, n = self.point, self.normal.point
+        return (n.x * (point.x - p.x) + n.y * (point.y - p.y) + n.z * (point.z - p.z)) / self.normal.mag()
+
+    def intersect(self, ray: Ray) -> Optional[float]:
+        """
+        Returns the distance along the ray to the plane. A ray parallel to the plane misses it
+
+        >>> Plane(Point(0, 0, 1), Vector(Point(0, 0, 1))).intersect(Ray(Point(), Vector(Point(1, 0, 1))))
+        1.0
+
+
+        :param ray: The Ray
+        :return: Distance t of the hit along the ray. None if the ray misses
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Intersecting %s with %s", ray, self)
+        o, d, p, n = ray.origin, ray.direction.point, self.point, self.normal.point
+        denominator = n.x * d.x + n.y * d.y + n.z * d.z
+        if denominator == 0:
+            return None
+
+        t = (n.x * (p.x - o.x) + n.y * (p.y - o.y) + n.z * (p.z - o.z)) / denominator
+        return t if t >= 0 else None
+
+    @staticmethod
+    def _pack(planes: list) -> tuple:
+        # Points and normals of the planes as (M, 3) arrays
+        points = np.array([[plane.point.x, plane.point.y, plane.point.z] for plane in planes], dtype=np.float64)
+        normals = np.array([[plane.normal.point.x, plane.normal.point.y, plane.normal.point.z] for plane in planes],
+                           dtype=np.float64)
+        return points.reshape(-1, 3), normals.reshape(-1, 3)
+
+    @staticmethod
+    def _intersect_pairs(origins: np.ndarray, directions: np.ndarray, points: np.ndarray,
+                         normals: np.ndarray) -> np.ndarray:
+        # Distances of ray and plane pairs, row by row. Same as Plane.intersect. inf for misses
+        denominator = _dot(normals, directions)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = _dot(normals, points - origins) / denominator
+
+        return np.where((denominator != 0) & (t >= 0), t, np.inf)
+
+
+class Sphere:
+    logger = getLogger('dummy')
+
+    def __init__(self, center: Point, radius: float, logger: Logger = None) -> None:
+        """
+        Constructor method. A sphere to intersect rays with
+
+        >>> Sphere(Point(0, 0, 0), 1)
+        Sphere(center=Point(x=0, y=0, z=0), radius=1)
+
+
+        :param center: Center of the sphere
+        :param radius: Radius of the sphere
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        _check_point(center, self.logger)
+        # Raise an error if radius is not a non-negative number
+        if not isinstance(radius, (int, float)) or not radius >= 0:
+            self.logger.error("Radius must not be negative")
+            raise ValueError("Radius must not be negative")
+
+        self.center = center
+        self.radius = radius
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(center={self.center}, radius={self.radius})"
+
+    def intersect(self, ray: Ray) -> Optional[float]:
+        """
+        Returns the distance along the ray to where it enters the sphere.
+        A ray starting inside the sphere hits it where it leaves
+
+        >>> sphere = Sphere(Point(0, 0, 0), 1)
+        >>> sphere.intersect(Ray(Point(-3, 0, 0), Vector(Point(1, 0, 0))))
+        2.0
+        >>> sphere.intersect(Ray(Point(0, 0, 0), Vector(Point(1, 0, 0))))
+        1.0
+
+
+        :param ray: The Ray
+        :return: Distance t of the hit along the ray. None if the ray misses
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Intersecting %s with %s", ray, self)
+        o, d, c = ray.origin, ray.direction.point, self.center
+        # Solve |o + t * d - c| = r for t
+        x, y, z = o.x - c.x, o.y - c.y, o.z - c.z
+        a = d.x * d.x + d.y * d.y + d.z * d.z
+        b = x * d.x + y * d.y + z * d.z
+        c = (x * x + y * y + z * z) - self.radius * self.radius
+        discriminant = b * b - a * c
+        if discriminant < 0:
+            return None
+
+        root = math.sqrt(discriminant)
+        t = (-b - root) / a
+        if t < 0:
+            # Behind the origin. Try where the ray leaves the sphere
+            t = (-b + root) / a
+
+        return t if t >= 0 else None
+
+    @staticmethod
+    def _pack(spheres: list) -> tuple:
+        # Centers as an (M, 3) array and radii as an (M,) array
+        centers = np.array([[sphere.center.x, sphere.center.y, sphere.center.z] for sphere in spheres],
+                           dtype=np.float64)
+        radii = np.array([sphere.radius for sphere in spheres], dtype=np.float64)
+        return centers.reshape(-1, 3), radii
+
+    @staticmethod
+    def _intersect_pairs(origins: np.ndarray, directions: np.ndarray, centers: np.ndarray,
+                         radii: np.ndarray) -> np.ndarray:
+        # Distances of ray and sphere pairs, row by row. Same as Sphere.intersect. inf for misses
+        offsets = origins - centers
+        a = _dot(directions, directions)
+        b = _dot(offsets, directions)
+        c = _dot(offsets, offsets) - radii * radii
+        discriminant = b * b - a * c
+        with np.errstate(invalid="ignore"):
+            root = np.sqrt(discriminant)
+
+        near = (-b - root) / a
+        t = np.where(near < 0, (-b + root) / a, near)
+        return np.where((discriminant >= 0) & (t >= 0), t, np.inf)
+
+
+class Triangle:
+    logger = getLogger('dummy')
+
+    def __init__(self, a: Point, b: Point, c: Point, logger: Logger = None) -> None:
+        """
+        Constructor method. A triangle to intersect rays with. Both sides can be hit
+
+        >>> Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)).area()
+        0.5
+
+
+        :param a: First corner
+        :param b: Second corner
+        :param c: Third corner
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        for corner in (a, b, c):
+            _check_point(corner, self.logger)
+
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(a={self.a}, b={self.b}, c={self.c})"
+
+    def normal(self) -> Vector:
+        """
+        Returns the unit normal of the triangle. Same as TriangleMesh.face_normals
+
+        >>> Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0)).normal()
+        Vector(Point(x=0.0, y=0.0, z=1.0))
+
+
+        :return: The normal Vector
+        """
+        return Vector.from_points(self.b, self.a).normal(Vector.from_points(self.c, self.a))
+
+    def area(self) -> float:
+        """
+        Returns the area of the triangle
+
+        :return: The area
+        """
+        return (Vector.from_points(self.b, self.a) * Vector.from_points(self.c, self.a)).mag() / 2
+
+    def intersect(self, ray: Ray) -> Optional[float]:
+        """
+        Returns the distance along the ray to the triangle. Möller–Trumbore intersection.
+        Hits on the edges count. A ray in the plane of the triangle misses it
+
+        >>> triangle = Triangle(Point(0, 0, 0), Point(1, 0, 0), Point(0, 1, 0))
+        >>> triangle.intersect(Ray(Point(0.25, 0.25, -2), Vector(Point(0, 0, 1))))
+        2.0
+        >>> triangle.intersect(Ray(Point(1, 1, -2), Vector(Point(0, 0, 1)))) is None
+        True
+
+
+        :param ray: The Ray
+        :return: Distance t of the hit along the ray. None if the ray misses
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Intersecting %s with %s", ray, self)
+        o, d, a, b, c = ray.origin, ray.direction.point, self.a, self.b, self.c
+        # Edges from the first corner
+        e1x, e1y, e1z = b.x - a.x, b.y - a.y, b.z - a.z
+        e2x, e2y, e2z = c.x - a.x, c.y - a.y, c.z - a.z
+        # p = d x e2
+        px = d.y * e2z - d.z * e2y
+        py = d.z * e2x - d.x * e2z
+        pz = d.x * e2y - d.y * e2x
+        determinant = e1x * px + e1y * py + e1z * pz
+        if determinant == 0:
+            # The ray is parallel to the triangle
+            return None
+
+        inverse = 1 / determinant
+        sx, sy, sz = o.x - a.x, o.y - a.y, o.z - a.z
+        # Barycentric coordinates of the hit
+        u = (sx * px + sy * py + sz * pz) * inverse
+        if u < 0 or u > 1:
+            return None
+
+        # q = s x e1
+        qx = sy * e1z - sz * e1y
+        qy = sz * e1x - sx * e1z
+        qz = sx * e1y - sy * e1x
+        v = (d.x * qx + d.y * qy + d.z * qz) * inverse
+        if v < 0 or u + v > 1:
+            return None
+
+        t = (e2x * qx + e2y * qy + e2z * qz) * inverse
+        return t if t >= 0 else None
+
+    @staticmethod
+    def _pack(triangles) -> np.ndarray:
+        # Corners of the triangles as an (M, 3, 3) array. From a TriangleMesh, a list of Triangles or an array
+        if isinstance(triangles, TriangleMesh):
+            return np.take(triangles.vertices.data, triangles.faces, axis=0)
+
+        if isinstance(triangles, (list, tuple)) and len(triangles) > 0 and isinstance(triangles[0], Triangle):
+            return np.array([[[corner.x, corner.y, corner.z] for corner in (triangle.a, triangle.b, triangle.c)]
+                             for triangle in triangles], dtype=np.float64)
+
+        return np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+
+    @staticmethod
+    def _intersect_pairs(origins: np.ndarray, directions: np.ndarray, a: np.ndarray, e1: np.ndarray,
+                         e2: np.ndarray) -> np.ndarray:
+        # Distances of ray and triangle pairs, row by row. Same as Triangle.intersect. inf for misses
+        p = _cross(directions, e2)
+        determinant = _dot(e1, p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1 / determinant
+            s = origins - a
+            u = _dot(s, p) * inverse
+            q = _cross(s, e1)
+            v = _dot(directions, q) * inverse
+            t = _dot(e2, q) * inverse
+
+        hit = (determinant != 0) & (u >= 0) & (u <= 1) & (v >= 0) & (u + v <= 1) & (t >= 0)
+        return np.where(hit, t, np.inf)
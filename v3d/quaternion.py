@@ -0,0 +1,503 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import math
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .point import _LoggerAttribute
+from .point import _LoggerOwner
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+from .rotation import Rotation
+
+
+class Quaternion(metaclass=_LoggerOwner):
+    # No per instance __dict__. Same as Point
+    __slots__ = ("w", "x", "y", "z", "_logger")
+
+    logger = _LoggerAttribute(getLogger('dummy'))
+
+    def __init__(self, w: float = 1, x: float = 0, y: float = 0, z: float = 0, logger: Logger = None) -> None:
+        """
+        Constructor method
+
+        >>> Quaternion()
+        Quaternion(w=1, x=0, y=0, z=0)
+        >>> Quaternion(0, 1, 0, 0)
+        Quaternion(w=0, x=1, y=0, z=0)
+
+
+        :param w: Scalar part. 1 by default
+        :param x: First imaginary part. 0 by default
+        :param y: Second imaginary part. 0 by default
+        :param z: Third imaginary part. 0 by default
+        :param logger: Logger to log
+        """
+        # Only store the logger if it is given
+        self._logger = logger
+
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(w={self.w}, x={self.x}, y={self.y}, z={self.z})"
+
+    # From https://docs.python.org/3/library/operator.html
+    def __mul__(self, other: Union[Quaternion, float, int]) -> Quaternion:
+        # Call self.multiply on a * b
+        return self.multiply(other)
+
+    def __rmul__(self, scalar: Union[float, int]) -> Quaternion:
+        # Call self.multiply on b * a. Only scalars end up here
+        return self.multiply(scalar)
+
+    def __neg__(self) -> Quaternion:
+        # Change w, x, y and z's sign on -a
+        return Quaternion(-self.w, -self.x, -self.y, -self.z, logger=self.logger)
+
+    def __eq__(self, other: Quaternion) -> bool:
+        # Call self.is_same on a == b
+        return self.is_same(other)
+
+    def __abs__(self) -> float:
+        # Call self.norm on abs(a)
+        return self.norm()
+
+    def is_same(self, other: Quaternion, tolerance: float = 0.0001) -> bool:
+        """
+        Checks if two quaternions are the same.
+        Notice q and -q are the same rotation but not the same quaternion
+
+        >>> Quaternion(1, 0, 0, 0).is_same(Quaternion(1, 0, 0, 0))
+        True
+        >>> Quaternion(1, 0, 0, 0).is_same(Quaternion(-1, 0, 0, 0))
+        False
+
+
+        :param other: The other Quaternion to compare with this.
+        :param tolerance: Tolerance for equality
+        :return: True if the two quaternions are the same, False if otherwise.
+        """
+        # Check if other is a Quaternion
+        if isinstance(other, Quaternion):
+            return abs(self.w - other.w) < tolerance and abs(self.x - other.x) < tolerance and \
+                   abs(self.y - other.y) < tolerance and abs(self.z - other.z) < tolerance
+        else:
+            # Raise an error if other is not a Quaternion
+            self.logger.error("Data must be Quaternion type")
+            raise ValueError("Data must be Quaternion type")
+
+    def copy(self) -> Quaternion:
+        """
+        Makes a copy of the quaternion
+
+        >>> Quaternion(1, 2, 3, 4).copy()
+        Quaternion(w=1, x=2, y=3, z=4)
+
+
+        :return: The copied Quaternion
+        """
+        return Quaternion(self.w, self.x, self.y, self.z, logger=self.logger)
+
+    def multiply(self, other: Union[Quaternion, float, int]) -> Quaternion:
+        """
+        Returns either Hamilton product of two quaternions or scalar multiplication depending on given other.
+        Product of two rotation quaternions applies other first, than this one
+
+        >>> Quaternion(0, 1, 0, 0).multiply(Quaternion(0, 0, 1, 0))
+        Quaternion(w=0, x=0, y=0, z=1)
+        >>> Quaternion(1, 2, 3, 4).multiply(2)
+        Quaternion(w=2, x=4, y=6, z=8)
+
+
+        :param other: Either scalar or quaternion.
+        :return: Result of multiplication
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s * %s", self, other)
+        # Check if other is float or int (in short if it's numeric)
+        if isinstance(other, (int, float)):
+            return Quaternion(self.w * other, self.x * other, self.y * other, self.z * other, logger=self.logger)
+        elif isinstance(other, Quaternion):
+            # Hamilton product
+            return Quaternion(self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z,
+                              self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+                              self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+                              self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
+                              logger=self.logger)
+        else:
+            # Raise an error if other is neither numeric nor a quaternion
+            self.logger.error("Data must be Quaternion or scalar type")
+            raise ValueError("Data must be Quaternion or scalar type")
+
+    def dot(self, other: Quaternion) -> float:
+        """
+        Returns dot product of two quaternions
+
+        >>> Quaternion(1, 2, 3, 4).dot(Quaternion(1, 1, 1, 1))
+        10
+
+
+        :param other: Second quaternion
+        :return: Dot product of two quaternions
+        """
+        # Check if other is a Quaternion
+        if isinstance(other, Quaternion):
+            return self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+        else:
+            # Raise an error if other is not a Quaternion
+            self.logger.error("Data must be Quaternion type")
+            raise ValueError("Data must be Quaternion type")
+
+    def norm(self) -> float:
+        """
+        Returns the length of the quaternion
+
+        >>> Quaternion(1, 1, 1, 1).norm()
+        2.0
+
+
+        :return: The length of the quaternion
+        """
+        return math.sqrt(self.dot(self))
+
+    def unit(self) -> Quaternion:
+        """
+        Returns the normalized quaternion
+
+        >>> Quaternion(2, 0, 0, 0).unit()
+        Quaternion(w=1.0, x=0.0, y=0.0, z=0.0)
+
+
+        :return: The unit quaternion
+        """
+        norm = self.norm()
+        # Raise an error if the quaternion is zero
+        if norm == 0:
+            self.logger.error("Cannot divide by zero")
+            raise ValueError("Cannot divide by zero")
+
+        return self.multiply(1 / norm)
+
+    def conjugate(self) -> Quaternion:
+        """
+        Returns the conjugate of the quaternion
+
+        >>> Quaternion(1, 2, 3, 4).conjugate()
+        Quaternion(w=1, x=-2, y=-3, z=-4)
+
+
+        :return: The conjugate quaternion
+        """
+        return Quaternion(self.w, -self.x, -self.y, -self.z, logger=self.logger)
+
+    def inverse(self) -> Quaternion:
+        """
+        Returns the inverse of the quaternion. For a rotation it is the rotation that undoes this one
+
+        >>> Quaternion(0, 2, 0, 0).inverse()
+        Quaternion(w=0.0, x=-0.5, y=0.0, z=0.0)
+
+
+        :return: The inverse quaternion
+        """
+        squared = self.dot(self)
+        # Raise an error if the quaternion is zero
+        if squared == 0:
+            self.logger.error("Cannot divide by zero")
+            raise ValueError("Cannot divide by zero")
+
+        return self.conjugate().multiply(1 / squared)
+
+    @classmethod
+    def from_axis_angle(cls, axis: Vector, angle: float, logger: Logger = None) -> Quaternion:
+        """
+        Creates a rotation quaternion around the axis by given angle. Same rotation as Vector.rotate_about
+        for a unit axis. The axis is normalized, so its length does not matter
+
+        >>> q = Quaternion.from_axis_angle(Vector(Point(0, 1, 0)), 90)
+        >>> q
+        Quaternion(w=0.7071067811865476, x=0.0, y=0.7071067811865475, z=0.0)
+
+
+        :param axis: The vector to rotate around
+        :param angle: Rotation amount in degrees
+        :param logger: Logger to log
+        :return: The rotation quaternion
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Quaternion from axis and angle")
+        # Check if axis is a Vector and angle is numeric
+        if not isinstance(axis, Vector):
+            cls.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+        if not isinstance(angle, (int, float)):
+            cls.logger.error("Angle must be numeric type")
+            raise ValueError("Angle must be numeric type")
+
+        # Raises an error for a zero vector
+        unit = axis.unit().point
+        half = math.radians(angle) / 2
+        sin = math.sin(half)
+        return cls(math.cos(half), unit.x * sin, unit.y * sin, unit.z * sin, logger=logger)
+
+    def to_axis_angle(self) -> tuple:
+        """
+        Returns the axis and the angle of the rotation
+
+        >>> Quaternion.from_axis_angle(Vector(Point(0, 2, 0)), 90).to_axis_angle()
+        (Vector(Point(x=0.0, y=1.0, z=0.0)), 90.0)
+
+
+        :return: tuple of the unit axis as a Vector and the angle in degrees
+        """
+        q = self.unit()
+        # Use the quaternion with positive w. Keeps the angle in [0, 180]
+        if q.w < 0:
+            q = -q
+
+        sin = math.sqrt(q.x * q.x + q.y * q.y + q.z * q.z)
+        angle = math.degrees(2 * math.atan2(sin, q.w))
+        # No rotation. Any axis will do
+        if sin == 0:
+            return Vector.from_xyz(1, 0, 0, self.logger), 0.0
+
+        return Vector.from_xyz(q.x / sin, q.y / sin, q.z / sin, self.logger), angle
+
+    @classmethod
+    def from_euler(cls, alpha: float = 0, beta: float = 0, gamma: float = 0, logger: Logger = None) -> Quaternion:
+        """
+        Creates a rotation quaternion around x, y and z axis by given amount. Same rotation as Vector.rotate
+
+        >>> Quaternion.from_euler(alpha=180)
+        Quaternion(w=6.123233995736766e-17, x=1.0, y=0.0, z=0.0)
+
+
+        :param alpha: Rotation quantity around x axis
+        :param beta: Rotation quantity around y axis
+        :param gamma: Rotation quantity around z axis
+        :param logger: Logger to log
+        :return: The rotation quaternion
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Quaternion from Euler angles")
+        # Check if alpha, beta and gamma are float or int (in short if it's numeric)
+        if not (isinstance(alpha, (int, float)) and isinstance(beta, (int, float)) and isinstance(gamma, (int, float))):
+            # Raise an error if alpha, beta or gamma is not numeric
+            cls.logger.error("Angle must be numeric type")
+            raise ValueError("Angle must be numeric type")
+
+        alpha = math.radians(alpha) / 2
+        beta = math.radians(beta) / 2
+        gamma = math.radians(gamma) / 2
+
+        # Rotation along X, than Y, than Z axis. The same order as Vector.rotate
+        x_rotation = cls(math.cos(alpha), math.sin(alpha), 0.0, 0.0, logger=logger)
+        y_rotation = cls(math.cos(beta), 0.0, math.sin(beta), 0.0, logger=logger)
+        z_rotation = cls(math.cos(gamma), 0.0, 0.0, math.sin(gamma), logger=logger)
+        return z_rotation * y_rotation * x_rotation
+
+    def to_euler(self) -> tuple:
+        """
+        Returns Euler angles of the rotation, as used by Vector.rotate
+
+        >>> Quaternion.from_euler(alpha=10, beta=20, gamma=30).to_euler()
+        (10.000000000000002, 20.000000000000004, 30.000000000000004)
+
+
+        :return: tuple of alpha, beta and gamma in degrees
+        """
+        matrix = self.to_matrix()
+        sin_beta = min(1.0, max(-1.0, -matrix[2, 0]))
+        beta = math.asin(sin_beta)
+        # Gimbal lock. Only alpha - gamma (or alpha + gamma) is defined. Use gamma = 0
+        if abs(sin_beta) > 1 - 1e-12:
+            alpha = math.atan2(-matrix[1, 2], matrix[1, 1])
+            gamma = 0.0
+        else:
+            alpha = math.atan2(matrix[2, 1], matrix[2, 2])
+            gamma = math.atan2(matrix[1, 0], matrix[0, 0])
+
+        return math.degrees(alpha), math.degrees(beta), math.degrees(gamma)
+
+    @classmethod
+    def from_heading(cls, theta: float, phi: float, logger: Logger = None) -> Quaternion:
+        """
+        Creates the rotation that turns the z axis to the given heading. Reverse of heading
+
+        >>> q = Quaternion.from_heading(54.735610317245346, 45.0)
+        >>> q.rotate(Vector(Point(0, 0, 1))).heading()
+        (54.735610317245346, 45.0)
+
+
+        :param theta: Theta angle as returned by Vector.heading
+        :param phi: Phi angle as returned by Vector.heading
+        :param logger: Logger to log
+        :return: The rotation quaternion
+        """
+        # Tilt the z axis by theta around y axis, than turn it by phi around z axis
+        return cls.from_euler(beta=theta, gamma=phi, logger=logger)
+
+    def heading(self) -> tuple:
+        """
+        Returns heading of the z axis rotated by this quaternion. Same as Vector.heading
+
+        >>> Quaternion.from_heading(30, 60).heading()
+        (29.999999999999993, 59.999999999999986)
+
+
+        :return: Angles of the rotated z axis
+        """
+        return self.rotate(Vector.from_xyz(0, 0, 1, self.logger)).heading()
+
+    @classmethod
+    def from_matrix(cls, matrix, logger: Logger = None) -> Quaternion:
+        """
+        Creates a rotation quaternion from a 3x3 rotation matrix or a Rotation
+
+        >>> Quaternion.from_matrix(Rotation.from_euler(gamma=90))
+        Quaternion(w=0.7071067811865476, x=0.0, y=0.0, z=0.7071067811865475)
+
+
+        :param matrix: A 3x3 rotation matrix or a Rotation
+        :param logger: Logger to log
+        :return: The rotation quaternion
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Quaternion from matrix")
+        if isinstance(matrix, Rotation):
+            matrix = matrix.matrix
+
+        matrix = np.asarray(matrix, dtype=np.float64)
+        # Raise an error if the matrix is not 3x3
+        if matrix.shape != (3, 3):
+            cls.logger.error("Matrix must be 3x3")
+            raise ValueError("Matrix must be 3x3")
+
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = matrix.tolist()
+        trace = m00 + m11 + m22
+        # Shepperd's method. Divide by the largest of the four possible denominators
+        if trace > 0:
+            s = math.sqrt(trace + 1) * 2
+            return cls(s / 4, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, logger=logger)
+        elif m00 > m11 and m00 > m22:
+            s = math.sqrt(1 + m00 - m11 - m22) * 2
+            return cls((m21 - m12) / s, s / 4, (m01 + m10) / s, (m02 + m20) / s, logger=logger)
+        elif m11 > m22:
+            s = math.sqrt(1 + m11 - m00 - m22) * 2
+            return cls((m02 - m20) / s, (m01 + m10) / s, s / 4, (m12 + m21) / s, logger=logger)
+        else:
+            s = math.sqrt(1 + m22 - m00 - m11) * 2
+            return cls((m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, s / 4, logger=logger)
+
+    def to_matrix(self) -> np.ndarray:
+        """
+        Returns the 3x3 rotation matrix of the quaternion
+
+        >>> Quaternion(1, 0, 0, 0).to_matrix()
+        array([[1., 0., 0.],
+               [0., 1., 0.],
+               [0., 0., 1.]])
+
+
+        :return: The rotation matrix
+        """
+        return self.to_rotation().matrix
+
+    def to_rotation(self) -> Rotation:
+        """
+        Returns the Rotation of the quaternion. Its matrix is cached, use it to rotate the same data repeatedly
+
+        >>> Quaternion(0, 1, 0, 0).to_rotation()
+        Rotation([[ 1.,  0.,  0.],
+                  [ 0., -1.,  0.],
+                  [ 0.,  0., -1.]])
+
+
+        :return: The Rotation
+        """
+        return Rotation.from_quaternion(self.w, self.x, self.y, self.z, logger=self.logger)
+
+    def slerp(self, other: Quaternion, t: float) -> Quaternion:
+        """
+        Spherical linear interpolation between two rotation quaternions. Takes the shortest path
+
+        >>> q = Quaternion(1, 0, 0, 0)
+        >>> q2 = Quaternion.from_axis_angle(Vector(Point(0, 0, 1)), 90)
+        >>> q.slerp(q2, 0.5).to_axis_angle()
+        (Vector(Point(x=0.0, y=0.0, z=1.0)), 45.0)
+
+
+        :param other: The quaternion to interpolate to
+        :param t: Interpolation amount. 0 gives this, 1 gives other
+        :return: The interpolated unit quaternion
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating slerp between %s and %s", self, other)
+        # Check if other is a Quaternion and t is numeric
+        if not isinstance(other, Quaternion):
+            self.logger.error("Data must be Quaternion type")
+            raise ValueError("Data must be Quaternion type")
+
+        if not isinstance(t, (int, float)):
+            self.logger.error("Data must be numeric type")
+            raise ValueError("Data must be numeric type")
+
+        start = self.unit()
+        end = other.unit()
+        cos = start.dot(end)
+        # q and -q are the same rotation. Use the one closer to start for the shortest path
+        if cos < 0:
+            end = -end
+            cos = -cos
+
+        # Quaternions are almost the same. Linear interpolation avoids dividing by sin(0)
+        if cos > 0.9995:
+            w0, w1 = 1 - t, t
+        else:
+            angle = math.acos(cos)
+            sin = math.sin(angle)
+            w0, w1 = math.sin((1 - t) * angle) / sin, math.sin(t * angle) / sin
+
+        return Quaternion(start.w * w0 + end.w * w1, start.x * w0 + end.x * w1,
+                          start.y * w0 + end.y * w1, start.z * w0 + end.z * w1, logger=self.logger).unit()
+
+    def rotate(self, other: Union[Vector, Point, VectorArray, PointArray, np.ndarray]):
+        """
+        Rotates a Vector, a Point or a batch of them by this quaternion.
+        A batch is rotated in one pass through the rotation matrix
+
+        >>> q = Quaternion.from_axis_angle(Vector(Point(0, 1, 0)), 90)
+        >>> q.rotate(Vector(Point(1, 0, 0)))
+        Vector(Point(x=2.220446049250313e-16, y=0.0, z=-1.0))
+
+
+        :param other: A Vector, a Point, a VectorArray, a PointArray or an (N, 3) array
+        :return: The rotated object, of the same type as other
+        """
+        if isinstance(other, Vector):
+            return Vector._from_point(self.rotate(other.point), other._logger)
+        elif isinstance(other, Point):
+            q = self.unit()
+            # v + 2 * w * (q x v) + 2 * q x (q x v)
+            cx = q.y * other.z - q.z * other.y
+            cy = q.z * other.x - q.x * other.z
+            cz = q.x * other.y - q.y * other.x
+            return Point._from_xyz(other.x + 2 * (q.w * cx + q.y * cz - q.z * cy),
+                                   other.y + 2 * (q.w * cy + q.z * cx - q.x * cz),
+                                   other.z + 2 * (q.w * cz + q.x * cy - q.y * cx), other._logger)
+
+        return self.to_rotation().apply(other)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+from typing import Union, Callable
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+from .mesh import TriangleMesh
+from .primitives import Ray, Plane, Sphere, Triangle
+from .bvh import BVH
+
+# Scenes with more primitives than this are intersected through a BVH built on the fly
+_BVH_THRESHOLD = 64
+# Ray and primitive pairs tested at once without a BVH. Bounds the memory of the brute force test
+_PAIR_CHUNK = 1 << 20
+
+
+class RayArray:
+    logger = getLogger('dummy')
+
+    def __init__(self, origins, directions, logger: Logger = None) -> None:
+        """
+        Constructor method. N rays, stored as a PointArray of origins and a VectorArray of directions.
+        Intersects all rays with planes, spheres and triangles at once
+
+        >>> rays = RayArray(Point(0, 0, -5), [Vector(Point(0, 0, 1)), Vector(Point(0, 1, 0))])
+        >>> rays
+        RayArray(rays=2)
+        >>> rays.intersect(Sphere(Point(0, 0, 0), 1))
+        (array([ 4., inf]), array([ 0, -1]))
+
+
+        :param origins: Origins of the rays. A Point for rays starting at the same point, or anything PointArray accepts
+        :param directions: Directions of the rays. Anything VectorArray accepts. Must not contain zero Vectors
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        self.directions = directions if isinstance(directions, VectorArray) \
+            else VectorArray(directions, logger=self.logger)
+        if isinstance(origins, Point):
+            # One origin for all rays
+            origins = np.broadcast_to([origins.x, origins.y, origins.z], (len(self.directions), 3))
+
+        self.origins = PointArray(origins, logger=self.logger)
+        # Raise an error if there is not one origin for each direction
+        if len(self.origins) != len(self.directions):
+            self.logger.error("Origins and directions must have the same length")
+            raise ValueError("Origins and directions must have the same length")
+
+        self.directions._check_non_zero(self.directions.point.data)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(rays={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self.origins)
+
+    def __getitem__(self, index) -> Union[Ray, RayArray]:
+        # A single ray for an integer index, a RayArray for anything else
+        if isinstance(index, (int, np.integer)):
+            return Ray(self.origins[index], self.directions[index], logger=self.logger)
+
+        return RayArray(self.origins.data[index], self.directions.point.data[index], logger=self.logger)
+
+    def at(self, t) -> PointArray:
+        """
+        Returns the point at distance t along each ray. Same as Ray.at
+
+        >>> RayArray(Point(1, 0, 0), [Vector(Point(0, 2, 0)), Vector(Point(0, 0, 1))]).at(np.array([1.5, 2]))
+        PointArray([[1., 3., 0.],
+                    [1., 0., 2.]])
+
+
+        :param t: Distances along the rays as an (N,) array or a single distance for all rays
+        :return: The points as a PointArray
+        """
+        t = np.broadcast_to(np.asarray(t, dtype=np.float64), (len(self),))
+        return PointArray(self.origins.data + self.directions.point.data * t[:, None], logger=self.logger)
+
+    def intersect(self, target, bvh: BVH = None) -> tuple:
+        """
+        Returns the first hit of each ray with the target. Gives the same distances as Ray.intersect.
+        Scenes with many triangles or spheres are intersected through a BVH.
+        Pass a BVH to reuse it when the same scene is intersected many times
+
+        >>> rays = RayArray(PointArray([[0.2, 0.2, 1], [2, 2, 1]]), [Vector(Point(0, 0, -1))] * 2)
+        >>> mesh = TriangleMesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]])
+        >>> rays.intersect(mesh)
+        (array([ 1., inf]), array([ 0, -1]))
+        >>> rays.intersect([Plane(Point(0, 0, -3), Vector(Point(0, 0, 1))), Sphere(Point(2, 2, -1), 1)])
+        (array([4., 1.]), array([0, 1]))
+
+
+        :param target: A Plane, a Sphere, a Triangle, a TriangleMesh, an (M, 3, 3) array of triangle corners
+        or a list of Planes, Spheres and Triangles
+        :param bvh: A BVH over the triangles or spheres of the target, in the same order
+        :return: Distances of the hits as an (N,) array, inf for misses,
+        and indices of the primitives hit as an (N,) array, -1 for misses
+        """
+        self.logger.info("Intersecting %d rays", len(self))
+        if isinstance(target, (Plane, Sphere, Triangle)):
+            target = [target]
+
+        if isinstance(target, (TriangleMesh, np.ndarray)):
+            return self._triangles(Triangle._pack(target), bvh)
+
+        if not isinstance(target, (list, tuple)) or \
+                not all(isinstance(primitive, (Plane, Sphere, Triangle)) for primitive in target):
+            # Raise an error if target can not be hit
+            self.logger.error("Data must be Plane, Sphere, Triangle or TriangleMesh type")
+            raise ValueError("Data must be Plane, Sphere, Triangle or TriangleMesh type")
+
+        # Intersect each kind of primitive at once and keep the closest hit
+        kinds = [(Triangle, lambda group: self._triangles(Triangle._pack(group), bvh)),
+                 (Sphere, lambda group: self._spheres(*Sphere._pack(group), bvh)),
+                 (Plane, lambda group: self._planes(*Plane._pack(group)))]
+        present = [kind for kind, _ in kinds if any(isinstance(primitive, kind) for primitive in target)]
+        # Raise an error if the BVH can not be over all primitives
+        if bvh is not None and (len(present) != 1 or Plane in present):
+            self.logger.error("BVH must be built over the same primitives")
+            raise ValueError("BVH must be built over the same primitives")
+
+        best_t = np.full(len(self), np.inf)
+        best_index = np.full(len(self), -1, dtype=np.int64)
+        for kind, intersect in kinds:
+            positions = np.array([i for i, primitive in enumerate(target) if isinstance(primitive, kind)],
+                                 dtype=np.int64)
+            if positions.size == 0:
+                continue
+
+            t, index = intersect([target[i] for i in positions])
+            closer = t < best_t
+            best_t[closer] = t[closer]
+            best_index[closer] = positions[index[closer]]
+
+        return best_t, best_index
+
+    def _triangles(self, corners: np.ndarray, bvh: BVH) -> tuple:
+        # Closest triangle hit by each ray. Edges are calculated once, not for every ray
+        origins, directions = self.origins.data, self.directions.point.data
+        first = corners[:, 0]
+        first_edges, second_edges = corners[:, 1] - first, corners[:, 2] - first
+
+        def intersect_pairs(rays: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return Triangle._intersect_pairs(origins[rays], directions[rays], first[primitives],
+                                             first_edges[primitives], second_edges[primitives])
+
+        return self._nearest(len(corners), lambda: BVH.from_triangles(corners, logger=self.logger),
+                             intersect_pairs, bvh)
+
+    def _spheres(self, centers: np.ndarray, radii: np.ndarray, bvh: BVH) -> tuple:
+        # Closest sphere hit by each ray
+        origins, directions = self.origins.data, self.directions.point.data
+
+        def intersect_pairs(rays: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return Sphere._intersect_pairs(origins[rays], directions[rays], centers[primitives], radii[primitives])
+
+        def build() -> BVH:
+            return BVH(centers - radii[:, None], centers + radii[:, None], logger=self.logger)
+
+        return self._nearest(len(centers), build, intersect_pairs, bvh)
+
+    def _planes(self, points: np.ndarray, normals: np.ndarray) -> tuple:
+        # Closest plane hit by each ray. Planes are infinite, a BVH can not bound them
+        origins, directions = self.origins.data, self.directions.point.data
+
+        def intersect_pairs(rays: np.ndarray, primitives: np.ndarray) -> np.ndarray:
+            return Plane._intersect_pairs(origins[rays], directions[rays], points[primitives], normals[primitives])
+
+        return self._nearest(len(points), None, intersect_pairs, None)
+
+    def _nearest(self, count: int, build: Callable[[], BVH], intersect_pairs: Callable, bvh: BVH) -> tuple:
+        # Closest of count primitives hit by each ray. Through a BVH for large scenes, every pair otherwise
+        if bvh is None and build is not None and count > _BVH_THRESHOLD:
+            bvh = build()
+
+        if bvh is not None:
+            # Raise an error if the BVH is over some other primitives
+            if len(bvh) != count:
+                self.logger.error("BVH must be built over the same primitives")
+                raise ValueError("BVH must be built over the same primitives")
+
+            return bvh.cast(self.origins.data, self.directions.point.data, intersect_pairs)
+
+        total = len(self)
+        best_t = np.full(total, np.inf)
+        best_index = np.full(total, -1, dtype=np.int64)
+        if count == 0:
+            return best_t, best_index
+
+        step = max(1, _PAIR_CHUNK // count)
+        for first in range(0, total, step):
+            rays = np.arange(first, min(first + step, total))
+            t = intersect_pairs(np.repeat(rays, count), np.tile(np.arange(count), len(rays)))
+            t = t.reshape(len(rays), count)
+            nearest = np.argmin(t, axis=1)
+            best_t[rays] = t[np.arange(len(rays)), nearest]
+            best_index[rays] = np.where(np.isfinite(best_t[rays]), nearest, -1)
+
+        return best_t, best_index
@@ -0,0 +1,255 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import math
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+
+
+class Rotation:
+    logger = getLogger('dummy')
+
+    def __init__(self, matrix=None, logger: Logger = None) -> None:
+        """
+        Constructor method. A rotation is kept as its 3x3 matrix, computed once
+
+        >>> Rotation()
+        Rotation([[1., 0., 0.],
+                  [0., 1., 0.],
+                  [0., 0., 1.]])
+
+
+        :param matrix: 3x3 rotation matrix. Identity by default
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # If the matrix is not given. Use identity, no rotation
+        if matrix is None:
+            matrix = np.eye(3)
+
+        matrix = np.array(matrix, dtype=np.float64)
+        # Raise an error if the matrix is not 3x3
+        if matrix.shape != (3, 3):
+            self.logger.error("Matrix must be 3x3")
+            raise ValueError("Matrix must be 3x3")
+
+        # The matrix is shared with every application. Do not let it change
+        matrix.setflags(write=False)
+        self.matrix = matrix
+        # Matrix rows as floats. Rotating a single Vector or Point does not need numpy
+        self._rows = tuple(tuple(row) for row in matrix.tolist())
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        prefix = f"{self.__class__.__name__}("
+        return f"{prefix}{np.array2string(self.matrix, separator=', ', prefix=prefix)})"
+
+    # From https://docs.python.org/3/library/operator.html
+    def __mul__(self, other: Rotation) -> Rotation:
+        # Call self.multiply on a * b
+        return self.multiply(other)
+
+    @classmethod
+    def from_euler(cls, alpha: float = 0, beta: float = 0, gamma: float = 0, logger: Logger = None) -> Rotation:
+        """
+        Creates a rotation around x, y and z axis by given amount. Same as Vector.rotate
+
+        >>> r = Rotation.from_euler(alpha=180)
+        >>> r.apply(Vector(Point(1, 1, 1)))
+        Vector(Point(x=1.0, y=-1.0000000000000002, z=-0.9999999999999999))
+
+
+        :param alpha: Rotation quantity around x axis
+        :param beta: Rotation quantity around y axis
+        :param gamma: Rotation quantity around z axis
+        :param logger: Logger to log
+        :return: The rotation
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Rotation from Euler angles")
+        # Check if alpha, beta and gamma are float or int (in short if it's numeric)
+        if not (isinstance(alpha, (int, float)) and isinstance(beta, (int, float)) and isinstance(gamma, (int, float))):
+            # Raise an error if alpha, beta or gamma is not numeric
+            cls.logger.error("Angle must be numeric type")
+            raise ValueError("Angle must be numeric type")
+
+        # Convert angles from degrees to radians
+        alpha = math.radians(alpha)
+        beta = math.radians(beta)
+        gamma = math.radians(gamma)
+
+        # Rotation along X, than Y, than Z axis. The same order as Vector.rotate
+        x_rotation = np.array([[1, 0, 0],
+                               [0, math.cos(alpha), -math.sin(alpha)],
+                               [0, math.sin(alpha), math.cos(alpha)]])
+        y_rotation = np.array([[math.cos(beta), 0, math.sin(beta)],
+                               [0, 1, 0],
+                               [-math.sin(beta), 0, math.cos(beta)]])
+        z_rotation = np.array([[math.cos(gamma), -math.sin(gamma), 0],
+                               [math.sin(gamma), math.cos(gamma), 0],
+                               [0, 0, 1]])
+        return cls(z_rotation @ y_rotation @ x_rotation, logger=logger)
+
+    @classmethod
+    def from_axis_angle(cls, axis: Vector, angle: float, logger: Logger = None) -> Rotation:
+        """
+        Creates a rotation around the axis by given angle. Same as Vector.rotate_about for a unit axis.
+        The axis is normalized, so its length does not matter
+
+        >>> r = Rotation.from_axis_angle(Vector(Point(0, 1, 0)), 90)
+        >>> r.apply(Vector(Point(1, 0, 0)))
+        Vector(Point(x=6.123233995736766e-17, y=0.0, z=-1.0))
+
+
+        :param axis: The vector to rotate around
+        :param angle: Rotation amount
+        :param logger: Logger to log
+        :return: The rotation
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Rotation from axis and angle")
+        # Check if axis is a Vector and angle is numeric
+        if not isinstance(axis, Vector):
+            cls.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+        if not isinstance(angle, (int, float)):
+            cls.logger.error("Angle must be numeric type")
+            raise ValueError("Angle must be numeric type")
+
+        # Rotate around the unit axis. Raises an error for a zero vector
+        unit = axis.unit().point
+        x, y, z = unit.x, unit.y, unit.z
+        angle = math.radians(angle)
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+
+        # Rodrigues' rotation formula in matrix form.
+        # v * cos + (axis * v) * sin + axis * axis.dot(v) * (1 - cos)
+        cross = np.array([[0, -z, y],
+                          [z, 0, -x],
+                          [-y, x, 0]])
+        outer = np.outer([x, y, z], [x, y, z])
+        return cls(np.eye(3) * cos + cross * sin + outer * (1 - cos), logger=logger)
+
+    @classmethod
+    def from_quaternion(cls, w: float, x: float, y: float, z: float, logger: Logger = None) -> Rotation:
+        """
+        Creates a rotation from a quaternion. The quaternion is normalized, so its length does not matter
+
+        >>> r = Rotation.from_quaternion(0, 1, 0, 0)
+        >>> r.apply(Vector(Point(1, 1, 1)))
+        Vector(Point(x=1.0, y=-1.0, z=-1.0))
+
+
+        :param w: Scalar part of the quaternion
+        :param x: First imaginary part of the quaternion
+        :param y: Second imaginary part of the quaternion
+        :param z: Third imaginary part of the quaternion
+        :param logger: Logger to log
+        :return: The rotation
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Rotation from quaternion")
+        # Check if w, x, y and z are float or int (in short if they're numeric)
+        if not all(isinstance(value, (int, float)) for value in (w, x, y, z)):
+            cls.logger.error("Data must be numeric type")
+            raise ValueError("Data must be numeric type")
+
+        norm = math.sqrt(w * w + x * x + y * y + z * z)
+        # Raise an error if the quaternion is zero
+        if norm == 0:
+            cls.logger.error("Cannot divide by zero")
+            raise ValueError("Cannot divide by zero")
+
+        w, x, y, z = w / norm, x / norm, y / norm, z / norm
+        return cls([[1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+                    [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+                    [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)]], logger=logger)
+
+    def multiply(self, other: Rotation) -> Rotation:
+        """
+        Returns composition of two rotations. The other rotation is applied first, than this one
+
+        >>> r = Rotation.from_euler(alpha=90) * Rotation.from_euler(alpha=90)
+        >>> r.apply(Vector(Point(1, 1, 1)))
+        Vector(Point(x=1.0, y=-1.0000000000000002, z=-0.9999999999999999))
+
+
+        :param other: The rotation to apply before this one
+        :return: The composed rotation
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Composing Rotations")
+        # Check if other is a Rotation
+        if isinstance(other, Rotation):
+            return Rotation(self.matrix @ other.matrix, logger=self.logger)
+        else:
+            # Raise an error if other is not a Rotation
+            self.logger.error("Data must be Rotation type")
+            raise ValueError("Data must be Rotation type")
+
+    def inverse(self) -> Rotation:
+        """
+        Returns the rotation that undoes this one
+
+        >>> r = Rotation.from_euler(alpha=90)
+        >>> r.inverse().apply(r.apply(Vector(Point(1, 2, 3))))
+        Vector(Point(x=1.0, y=1.9999999999999998, z=3.0))
+
+
+        :return: The inverse rotation
+        """
+        # Inverse of a rotation matrix is its transpose
+        return Rotation(self.matrix.T, logger=self.logger)
+
+    def apply(self, other: Union[Vector, Point, VectorArray, PointArray, np.ndarray]):
+        """
+        Rotates a Vector, a Point or a batch of them in one pass
+
+        >>> r = Rotation.from_euler(gamma=90)
+        >>> r.apply(Point(1, 0, 0))
+        Point(x=6.123233995736766e-17, y=1.0, z=0.0)
+        >>> r.apply(PointArray([[1, 0, 0], [0, 1, 0]]))
+        PointArray([[ 6.123234e-17,  1.000000e+00,  0.000000e+00],
+                    [-1.000000e+00,  6.123234e-17,  0.000000e+00]])
+
+
+        :param other: A Vector, a Point, a VectorArray, a PointArray or an (N, 3) array
+        :return: The rotated object, of the same type as other
+        """
+        if isinstance(other, Vector):
+            return Vector._from_point(self._apply_point(other.point), other._logger)
+        elif isinstance(other, Point):
+            return self._apply_point(other)
+        elif isinstance(other, VectorArray):
+            return VectorArray(self.apply(other.point), logger=other.logger)
+        elif isinstance(other, PointArray):
+            return PointArray(self.apply(other.data), logger=other.logger)
+        elif isinstance(other, np.ndarray) and other.ndim == 2 and other.shape[1] == 3:
+            # (R @ p.T).T for all points at once
+            return other @ self.matrix.T
+        else:
+            # Raise an error if other is not rotatable
+            self.logger.error("Data must be Vector, Point or an array of them")
+            raise ValueError("Data must be Vector, Point or an array of them")
+
+    def _apply_point(self, point: Point) -> Point:
+        (a, b, c), (d, e, f), (g, h, i) = self._rows
+        x, y, z = point.x, point.y, point.z
+        return Point._from_xyz(a * x + b * y + c * z,
+                               d * x + e * y + f * z,
+                               g * x + h * y + i * z, point._logger)
@@ -0,0 +1,35 @@
+"""
+Global settings of v3d
+"""
+
+# Point and Vector log every arithmetic call at INFO level. Messages are only built if the logger is
+# enabled for INFO. Setting this to False removes logging from arithmetic altogether.
+# Errors are logged either way.
+LOG_ARITHMETIC = True
+
+
+def enable_arithmetic_logging() -> None:
+    """
+    Enables logging of Point and Vector arithmetic
+
+    >>> from v3d import settings
+    >>> settings.enable_arithmetic_logging()
+    >>> settings.LOG_ARITHMETIC
+    True
+    """
+    global LOG_ARITHMETIC
+    LOG_ARITHMETIC = True
+
+
+def disable_arithmetic_logging() -> None:
+    """
+    Disables logging of Point and Vector arithmetic. Errors are still logged
+
+    >>> from v3d import settings
+    >>> settings.disable_arithmetic_logging()
+    >>> settings.LOG_ARITHMETIC
+    False
+    >>> settings.enable_arithmetic_logging()
+    """
+    global LOG_ARITHMETIC
+    LOG_ARITHMETIC = False
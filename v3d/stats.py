@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .primitives import Plane
+
+# Rows reduced at once. Bounds the memory of the temporaries when the points are a memory mapped file
+_CHUNK = 1 << 16
+
+
+class PointStatistics:
+    logger = getLogger('dummy')
+
+    def __init__(self, points=None, weights=None, logger: Logger = None) -> None:
+        """
+        Constructor method. Centroid and covariance of points, accumulated in one pass.
+        Each chunk is reduced around its own mean and merged with the running sums (Chan et al.),
+        so points can be added chunk by chunk without losing precision far from the origin
+
+        >>> statistics = PointStatistics([[0, 0, 0], [2, 0, 0], [0, 2, 0], [2, 2, 0]])
+        >>> statistics
+        PointStatistics(count=4, weight=4.0)
+        >>> statistics.centroid()
+        Point(x=1.0, y=1.0, z=0.0)
+        >>> statistics.plane()
+        Plane(point=Point(x=1.0, y=1.0, z=0.0), normal=Vector(Point(x=0.0, y=0.0, z=1.0)))
+
+
+        :param points: Points to start with. A list of Points, a PointArray or an (N, 3) array
+        :param weights: Weight of each point as an (N,) array. Must not be negative. All ones if not given
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        self.count = 0
+        self.weight = 0.0
+        self.mean = np.zeros(3)
+        # Sum of the weighted outer products of the points around the mean
+        self.comoment = np.zeros((3, 3))
+        if points is not None:
+            self.update_(points, weights)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(count={self.count}, weight={self.weight})"
+
+    @classmethod
+    def from_chunks(cls, chunks, weights=None, logger: Logger = None) -> PointStatistics:
+        """
+        Accumulates chunks of points one by one. Only one chunk is kept in memory
+
+        >>> PointStatistics.from_chunks([[[0, 0, 0]], [[4, 0, 0], [2, 3, 0]]]).centroid()
+        Point(x=2.0, y=1.0, z=0.0)
+
+
+        :param chunks: An iterable of anything update_ accepts, such as XYZReader.read() or a list of PointArrays
+        :param weights: An iterable of weights for each chunk. All ones if not given
+        :param logger: Logger to log
+        :return: The statistics
+        """
+        statistics = cls(logger=logger)
+        statistics.logger.info("Accumulating chunks")
+        if weights is None:
+            for chunk in chunks:
+                statistics.update_(chunk)
+        else:
+            for chunk, chunk_weights in zip(chunks, weights):
+                statistics.update_(chunk, chunk_weights)
+
+        return statistics
+
+    def copy(self) -> PointStatistics:
+        """
+        Returns a copy of the statistics
+
+        :return: The copied PointStatistics
+        """
+        statistics = PointStatistics(logger=self.logger)
+        statistics.count, statistics.weight = self.count, self.weight
+        statistics.mean, statistics.comoment = self.mean.copy(), self.comoment.copy()
+        return statistics
+
+    def is_empty(self) -> bool:
+        """
+        Checks if any weight was accumulated
+
+        >>> PointStatistics().is_empty()
+        True
+
+
+        :return: True if there is nothing to calculate statistics of
+        """
+        return self.weight == 0
+
+    def _check_not_empty(self) -> None:
+        # Raise an error if there is nothing to calculate statistics of
+        if self.is_empty():
+            self.logger.error("PointStatistics is empty")
+            raise ValueError("PointStatistics is empty")
+
+    def _merge(self, count: int, weight: float, mean: np.ndarray, comoment: np.ndarray) -> None:
+        # Merges the sums of another set of points into these
+        if weight == 0:
+            self.count += count
+            return
+
+        total = self.weight + weight
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.weight * weight / total)
+        self.mean += delta * (weight / total)
+        self.count += count
+        self.weight = total
+
+    def _update_rows(self, data: np.ndarray, weights: np.ndarray) -> None:
+        # Reduces the rows chunk by chunk around each chunk's own mean
+        for start in range(0, len(data), _CHUNK):
+            rows = np.asarray(data[start:start + _CHUNK], dtype=np.float64)
+            if weights is None:
+                weight = float(len(rows))
+                mean = rows.sum(axis=0) / weight
+                centered = rows - mean
+                comoment = centered.T @ centered
+            else:
+                chunk_weights = weights[start:start + _CHUNK]
+                weight = float(chunk_weights.sum())
+                if weight == 0:
+                    self.count += len(rows)
+                    continue
+
+                mean = chunk_weights @ rows / weight
+                centered = rows - mean
+                comoment = (centered * chunk_weights[:, None]).T @ centered
+
+            self._merge(len(rows), weight, mean, comoment)
+
+    def update_(self, points, weights=None) -> PointStatistics:
+        """
+        Adds points in place
+
+        >>> statistics = PointStatistics([[0, 0, 0]])
+        >>> statistics.update_(Point(3, 0, 0)).update_(PointStatistics([[0, 3, 0]])).centroid()
+        Point(x=1.0, y=1.0, z=0.0)
+
+
+        :param points: A Point, a PointStatistics, a list of Points, a PointArray or an (N, 3) array
+        :param weights: Weight of each point. A number for a Point, an (N,) array otherwise. Must not be negative.
+        All ones if not given. Ignored for a PointStatistics
+        :return: These statistics
+        """
+        if isinstance(points, PointStatistics):
+            self._merge(points.count, points.weight, points.mean, points.comoment)
+            return self
+
+        if isinstance(points, Point):
+            points = [points]
+            if weights is not None:
+                weights = [weights]
+
+        data = PointArray(points, logger=self.logger).data
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64).reshape(-1)
+            # Raise an error if there is not one weight for each point
+            if len(weights) != len(data):
+                self.logger.error("Weights must have the same length as the points")
+                raise ValueError("Weights must have the same length as the points")
+
+            # Raise an error if a weight is negative
+            if (weights < 0).any():
+                self.logger.error("Weights must not be negative")
+                raise ValueError("Weights must not be negative")
+
+        self._update_rows(data, weights)
+        return self
+
+    def update(self, points, weights=None) -> PointStatistics:
+        """
+        Returns new statistics with the points added
+
+        :param points: A Point, a PointStatistics, a list of Points, a PointArray or an (N, 3) array
+        :param weights: Weight of each point. Must not be negative. All ones if not given
+        :return: The new PointStatistics
+        """
+        return self.copy().update_(points, weights)
+
+    def centroid(self) -> Point:
+        """
+        Returns the weighted mean of the points
+
+        >>> PointStatistics([[0, 0, 0], [4, 0, 0]], weights=[1, 3]).centroid()
+        Point(x=3.0, y=0.0, z=0.0)
+
+
+        :return: The centroid
+        """
+        self._check_not_empty()
+        x, y, z = self.mean.tolist()
+        return Point._from_xyz(x, y, z, self.logger)
+
+    def covariance(self, sample: bool = False) -> np.ndarray:
+        """
+        Returns the weighted covariance matrix of the points
+
+        >>> PointStatistics([[0, 0, 0], [2, 0, 0], [0, 2, 0], [2, 2, 0]]).covariance()
+        array([[1., 0., 0.],
+               [0., 1., 0.],
+               [0., 0., 0.]])
+
+
+        :param sample: Divide by the total weight minus one instead of the total weight.
+        For counts or frequency weights
+        :return: The (3, 3) matrix
+        """
+        self._check_not_empty()
+        divisor = self.weight - 1 if sample else self.weight
+        # Raise an error if the sample covariance is not defined
+        if divisor <= 0:
+            self.logger.error("Sample covariance needs a total weight larger than one")
+            raise ValueError("Sample covariance needs a total weight larger than one")
+
+        return self.comoment / divisor
+
+    def principal_axes(self) -> tuple:
+        """
+        Returns the principal axes of the points, the directions of the largest to the smallest spread.
+        Each axis points to the positive side of its largest component
+
+        >>> axes, variances = PointStatistics([[0, 0, 0], [4, 0, 0], [0, 1, 0], [4, 1, 0]]).principal_axes()
+        >>> axes[0]
+        Vector(Point(x=1.0, y=0.0, z=0.0))
+        >>> variances
+        array([4.  , 0.25, 0.  ])
+
+
+        :return: Three unit Vectors and the variances along them as a (3,) array, largest first
+        """
+        variances, vectors = np.linalg.eigh(self.covariance())
+        variances, vectors = variances[::-1], vectors[:, ::-1]
+        # eigh returns each axis with either sign. Choose one
+        largest = np.argmax(np.abs(vectors), axis=0)
+        vectors = vectors * np.sign(vectors[largest, np.arange(3)])
+        axes = [Vector._from_point(Point._from_xyz(*vectors[:, i].tolist(), self.logger), self.logger)
+                for i in range(3)]
+        return axes, np.maximum(variances, 0)
+
+    def plane(self) -> Plane:
+        """
+        Returns the best fit plane: through the centroid, perpendicular to the axis of the smallest spread.
+        Minimizes the weighted sum of squared distances of the points to the plane
+
+        >>> PointStatistics([[0, 0, 1], [1, 0, 1], [0, 1, 1]]).plane().normal
+        Vector(Point(x=0.0, y=0.0, z=1.0))
+
+
+        :return: The Plane
+        """
+        self.logger.info("Fitting plane")
+        axes, _ = self.principal_axes()
+        return Plane(self.centroid(), axes[2], logger=self.logger)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import struct
+
+import numpy as np
+
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+
+# File layout. A fixed size header followed by count * 3 packed little endian x, y, z values:
+# magic, version, kind (points or vectors), dtype of the values, count of rows
+_MAGIC = b"V3DF"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHB5sQ")
+# Values start at this offset. Keeps them aligned for the memory map
+_HEADER_SIZE = 64
+_KINDS = {0: "points", 1: "vectors"}
+_DTYPES = ("<f4", "<f8")
+
+
+class PointFile:
+    logger = getLogger('dummy')
+
+    def __init__(self, path: str, mode: str = "r", logger: Logger = None) -> None:
+        """
+        Constructor method. Opens a file written by PointFile.write or PointFileWriter through a memory map.
+        Opening does not read the values, so it is instant for any file size. Only the rows used are read
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.v3d")
+        >>> PointFile.write(path, PointArray([[1, 2, 3], [4, 5, 6]]))
+        >>> with PointFile(path) as pf:
+        ...     pf
+        ...     pf[1]
+        PointFile(points=2, dtype=float64)
+        Point(x=4.0, y=5.0, z=6.0)
+
+
+        :param path: Path of the file
+        :param mode: Memory map mode. "r" is read only, "r+" writes changes to the file, "c" keeps changes in memory
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if the mode is not a memory map mode that keeps the file as is
+        if mode not in ("r", "r+", "c"):
+            self.logger.error("Mode must be r, r+ or c")
+            raise ValueError("Mode must be r, r+ or c")
+
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+
+        self.kind, self.dtype, self.count = self._read_header(header)
+        if self.count == 0:
+            # A memory map can not be empty
+            self.data = np.empty((0, 3), dtype=self.dtype)
+        else:
+            self.data = np.memmap(path, dtype=self.dtype, mode=mode, offset=_HEADER_SIZE, shape=(self.count, 3))
+
+    def _read_header(self, header: bytes) -> tuple:
+        # Returns kind, dtype and count of a header. Raises an error if it is not a v3d file header
+        if len(header) < _HEADER_SIZE or header[:4] != _MAGIC:
+            self.logger.error("{} is not a v3d file".format(self.path))
+            raise ValueError("{} is not a v3d file".format(self.path))
+
+        _, version, kind, dtype, count = _HEADER.unpack_from(header)
+        dtype = dtype.rstrip(b"\0").decode()
+        if version != _VERSION or kind not in _KINDS or dtype not in _DTYPES:
+            self.logger.error("{} has an unsupported header".format(self.path))
+            raise ValueError("{} has an unsupported header".format(self.path))
+
+        return _KINDS[kind], np.dtype(dtype), count
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.kind}={self.count}, dtype={self.dtype.name})"
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> PointFile:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __getitem__(self, index) -> Union[Point, Vector, PointArray, VectorArray]:
+        # An integer returns a Point (or Vector). Anything else returns a PointArray (or VectorArray)
+        if isinstance(index, (int, np.integer)):
+            x, y, z = self.data[index].tolist()
+            point = Point._from_xyz(x, y, z, self.logger)
+            return point if self.kind == "points" else Vector._from_point(point, self.logger)
+
+        return self._wrap(self.data[index])
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def _wrap(self, data: np.ndarray) -> Union[PointArray, VectorArray]:
+        # float64 rows are not copied. Pages of the file are read when they are used
+        points = PointArray(data, logger=self.logger)
+        return points if self.kind == "points" else VectorArray(points, logger=self.logger)
+
+    def to_array(self) -> Union[PointArray, VectorArray]:
+        """
+        Returns all rows as a PointArray, or a VectorArray for a file of vectors.
+        float64 files are not copied into memory. float32 files are converted
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "vectors.v3d")
+        >>> PointFile.write(path, [Vector(Point(1, 1, 1))], dtype="float32")
+        >>> PointFile(path).to_array()
+        VectorArray(PointArray([[1., 1., 1.]]))
+
+
+        :return: The rows
+        """
+        return self._wrap(self.data)
+
+    def flush(self) -> None:
+        """
+        Writes changes of a file opened with mode "r+" to the disk
+        """
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+    def close(self) -> None:
+        """
+        Closes the memory map. Arrays returned before keep the file open until they are deleted
+        """
+        self.flush()
+        self.data = np.empty((0, 3), dtype=self.dtype)
+        self.count = 0
+
+    @classmethod
+    def write(cls, path: str, data, dtype: str = "float64", logger: Logger = None) -> None:
+        """
+        Writes points or vectors to a file
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.v3d")
+        >>> PointFile.write(path, [Point(1, 2, 3)])
+        >>> os.path.getsize(path)
+        88
+
+
+        :param path: Path of the file
+        :param data: A list of Points or Vectors, a PointArray, a VectorArray or an (N, 3) array of points
+        :param dtype: Type of the stored values. "float64" or "float32"
+        :param logger: Logger to log
+        """
+        cls.logger.info("Writing points to file")
+        with PointFileWriter(path, kind=PointFileWriter.kind_of(data), dtype=dtype, logger=logger) as writer:
+            writer.append(data)
+
+
+class PointFileWriter:
+    logger = getLogger('dummy')
+
+    def __init__(self, path: str, kind: str = "points", dtype: str = "float64", logger: Logger = None) -> None:
+        """
+        Constructor method. Writes a file in chunks, so data larger than memory can be saved.
+        The count in the header is written when the writer is closed
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "cloud.v3d")
+        >>> with PointFileWriter(path) as writer:
+        ...     writer.append([Point(1, 2, 3)])
+        ...     writer.append(np.zeros((2, 3)))
+        >>> len(PointFile(path))
+        3
+
+
+        :param path: Path of the file
+        :param kind: "points" or "vectors". What reading the file returns
+        :param dtype: Type of the stored values. "float64" or "float32"
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Raise an error if kind or dtype is not supported
+        if kind not in _KINDS.values():
+            self.logger.error("Kind must be points or vectors")
+            raise ValueError("Kind must be points or vectors")
+
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        if self.dtype.str not in _DTYPES:
+            self.logger.error("Dtype must be float32 or float64")
+            raise ValueError("Dtype must be float32 or float64")
+
+        self.kind = kind
+        self.count = 0
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def __enter__(self) -> PointFileWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def kind_of(data) -> str:
+        """
+        Returns the kind a file of the data has
+
+        >>> PointFileWriter.kind_of([Vector(Point(1, 1, 1))])
+        'vectors'
+
+
+        :param data: A list of Points or Vectors, a PointArray, a VectorArray or an (N, 3) array of points
+        :return: "vectors" for Vectors and VectorArrays, "points" for anything else
+        """
+        if isinstance(data, (Vector, VectorArray)):
+            return "vectors"
+
+        if isinstance(data, (list, tuple)) and len(data) > 0 and isinstance(data[0], Vector):
+            return "vectors"
+
+        return "points"
+
+    def _write_header(self) -> None:
+        kind = next(code for code, name in _KINDS.items() if name == self.kind)
+        header = _HEADER.pack(_MAGIC, _VERSION, kind, self.dtype.str.encode(), self.count)
+        self._file.seek(0)
+        self._file.write(header.ljust(_HEADER_SIZE, b"\0"))
+
+    def append(self, data) -> None:
+        """
+        Appends points or vectors to the end of the file
+
+        :param data: A list of Points or Vectors, a PointArray, a VectorArray or an (N, 3) array of points
+        """
+        if isinstance(data, (Vector, VectorArray)):
+            data = data.point
+        elif isinstance(data, (list, tuple)) and len(data) > 0 and isinstance(data[0], Vector):
+            data = VectorArray(data, logger=self.logger).point
+
+        values = PointArray(data, logger=self.logger).data.astype(self.dtype, copy=False)
+        self._file.seek(0, 2)
+        values.tofile(self._file)
+        self.count += len(values)
+
+    def close(self) -> None:
+        """
+        Writes the count to the header and closes the file
+        """
+        if not self._file.closed:
+            self._write_header()
+            self._file.close()
+
@@ -0,0 +1,340 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+from .vector_array import VectorArray
+from .rotation import Rotation
+from .quaternion import Quaternion
+
+
+class Transform:
+    logger = getLogger('dummy')
+
+    def __init__(self, matrix=None, logger: Logger = None) -> None:
+        """
+        Constructor method. An affine transform kept as its 4x4 matrix, computed once.
+        Translations, rotations and scales are composed into the matrix,
+        so applying a chain of them walks the data only once
+
+        >>> t = Transform().translate(Point(1, 0, 0)).scale(2)
+        >>> t
+        Transform([[2., 0., 0., 2.],
+                   [0., 2., 0., 0.],
+                   [0., 0., 2., 0.],
+                   [0., 0., 0., 1.]])
+        >>> t.apply(Point(1, 1, 1))
+        Point(x=4.0, y=2.0, z=2.0)
+
+
+        :param matrix: 4x4 affine matrix. Identity by default
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # If the matrix is not given. Use identity, no transform
+        if matrix is None:
+            matrix = np.eye(4)
+
+        matrix = np.array(matrix, dtype=np.float64)
+        # Raise an error if the matrix is not an affine 4x4 matrix
+        if matrix.shape != (4, 4) or not np.array_equal(matrix[3], [0, 0, 0, 1]):
+            self.logger.error("Matrix must be a 4x4 affine matrix")
+            raise ValueError("Matrix must be a 4x4 affine matrix")
+
+        # The matrix is shared with every application. Do not let it change
+        matrix.setflags(write=False)
+        self.matrix = matrix
+        # Top three rows as floats. Transforming a single Vector or Point does not need numpy
+        self._rows = tuple(tuple(row) for row in matrix[:3].tolist())
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        prefix = f"{self.__class__.__name__}("
+        return f"{prefix}{np.array2string(self.matrix, separator=', ', prefix=prefix)})"
+
+    # From https://docs.python.org/3/library/operator.html
+    def __mul__(self, other: Transform) -> Transform:
+        # Call self.multiply on a * b
+        return self.multiply(other)
+
+    @staticmethod
+    def _offset(offset: Union[Point, Vector, tuple, list]) -> list:
+        # Returns x, y and z of a translation. None if it is not a Point, a Vector or three numbers
+        if isinstance(offset, Vector):
+            offset = offset.point
+
+        if isinstance(offset, Point):
+            return [offset.x, offset.y, offset.z]
+
+        if isinstance(offset, (tuple, list)) and len(offset) == 3 and \
+                all(isinstance(value, (int, float)) for value in offset):
+            return list(offset)
+
+        return None
+
+    @classmethod
+    def from_translation(cls, offset: Union[Point, Vector, tuple, list], logger: Logger = None) -> Transform:
+        """
+        Creates a translation. Same as Point.add
+
+        >>> Transform.from_translation(Point(1, 2, 3)).apply(Point(1, 1, 1))
+        Point(x=2.0, y=3.0, z=4.0)
+
+
+        :param offset: A Point, a Vector or three numbers to add to every point
+        :param logger: Logger to log
+        :return: The transform
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Transform from translation")
+        values = cls._offset(offset)
+        # Raise an error if offset is not a Point, a Vector or three numbers
+        if values is None:
+            cls.logger.error("Data must be Point, Vector or three numbers")
+            raise ValueError("Data must be Point, Vector or three numbers")
+
+        matrix = np.eye(4)
+        matrix[:3, 3] = values
+        return cls(matrix, logger=logger)
+
+    @classmethod
+    def from_scale(cls, factor: Union[float, int, tuple, list], logger: Logger = None) -> Transform:
+        """
+        Creates a scale about the origin. Same as Point.scale for one factor
+
+        >>> Transform.from_scale((1, 2, 3)).apply(Point(1, 1, 1))
+        Point(x=1.0, y=2.0, z=3.0)
+
+
+        :param factor: A scalar, or three scalars for x, y and z
+        :param logger: Logger to log
+        :return: The transform
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Transform from scale")
+        if isinstance(factor, (int, float)):
+            factor = [factor] * 3
+
+        # Raise an error if factor is not a scalar or three scalars
+        if not (isinstance(factor, (tuple, list)) and len(factor) == 3 and
+                all(isinstance(value, (int, float)) for value in factor)):
+            cls.logger.error("Scalar must be float or int type")
+            raise ValueError("Scalar must be float or int type")
+
+        return cls(np.diag(list(factor) + [1]), logger=logger)
+
+    @classmethod
+    def from_rotation(cls, rotation: Union[Rotation, Quaternion], logger: Logger = None) -> Transform:
+        """
+        Creates a rotation about the origin from a Rotation or a Quaternion
+
+        >>> Transform.from_rotation(Rotation.from_euler(gamma=90)).apply(Vector(Point(1, 0, 0)))
+        Vector(Point(x=6.123233995736766e-17, y=1.0, z=0.0))
+
+
+        :param rotation: The Rotation or the Quaternion
+        :param logger: Logger to log
+        :return: The transform
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating Transform from rotation")
+        if isinstance(rotation, Quaternion):
+            rotation = rotation.to_rotation()
+
+        # Raise an error if rotation is not a Rotation
+        if not isinstance(rotation, Rotation):
+            cls.logger.error("Data must be Rotation type")
+            raise ValueError("Data must be Rotation type")
+
+        matrix = np.eye(4)
+        matrix[:3, :3] = rotation.matrix
+        return cls(matrix, logger=logger)
+
+    @classmethod
+    def from_euler(cls, alpha: float = 0, beta: float = 0, gamma: float = 0, logger: Logger = None) -> Transform:
+        """
+        Creates a rotation around x, y and z axis by given amount. Same as Vector.rotate
+
+        >>> Transform.from_euler(alpha=180).apply(Vector(Point(1, 1, 1)))
+        Vector(Point(x=1.0, y=-1.0000000000000002, z=-0.9999999999999999))
+
+
+        :param alpha: Rotation quantity around x axis
+        :param beta: Rotation quantity around y axis
+        :param gamma: Rotation quantity around z axis
+        :param logger: Logger to log
+        :return: The transform
+        """
+        return cls.from_rotation(Rotation.from_euler(alpha=alpha, beta=beta, gamma=gamma), logger=logger)
+
+    @classmethod
+    def from_axis_angle(cls, axis: Vector, angle: float, logger: Logger = None) -> Transform:
+        """
+        Creates a rotation around the axis by given angle. Same as Vector.rotate_about for a unit axis
+
+        >>> Transform.from_axis_angle(Vector(Point(0, 1, 0)), 90).apply(Vector(Point(1, 0, 0)))
+        Vector(Point(x=6.123233995736766e-17, y=0.0, z=-1.0))
+
+
+        :param axis: The vector to rotate around
+        :param angle: Rotation amount
+        :param logger: Logger to log
+        :return: The transform
+        """
+        return cls.from_rotation(Rotation.from_axis_angle(axis, angle), logger=logger)
+
+    def multiply(self, other: Transform) -> Transform:
+        """
+        Returns composition of two transforms. The other transform is applied first, than this one
+
+        >>> t = Transform.from_scale(2) * Transform.from_translation(Point(1, 0, 0))
+        >>> t.apply(Point(0, 0, 0))
+        Point(x=2.0, y=0.0, z=0.0)
+
+
+        :param other: The transform to apply before this one
+        :return: The composed transform
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Composing Transforms")
+        # Check if other is a Transform
+        if isinstance(other, Transform):
+            return Transform(self.matrix @ other.matrix, logger=self.logger)
+        else:
+            # Raise an error if other is not a Transform
+            self.logger.error("Data must be Transform type")
+            raise ValueError("Data must be Transform type")
+
+    def translate(self, offset: Union[Point, Vector, tuple, list]) -> Transform:
+        """
+        Returns this transform followed by a translation
+
+        >>> Transform().scale(2).translate(Point(1, 0, 0)).apply(Point(1, 1, 1))
+        Point(x=3.0, y=2.0, z=2.0)
+
+
+        :param offset: A Point, a Vector or three numbers to add to every point
+        :return: The composed transform
+        """
+        return Transform.from_translation(offset, logger=self.logger) * self
+
+    def scale(self, factor: Union[float, int, tuple, list]) -> Transform:
+        """
+        Returns this transform followed by a scale about the origin
+
+        >>> Transform().translate(Point(1, 0, 0)).scale(2).apply(Point(1, 1, 1))
+        Point(x=4.0, y=2.0, z=2.0)
+
+
+        :param factor: A scalar, or three scalars for x, y and z
+        :return: The composed transform
+        """
+        return Transform.from_scale(factor, logger=self.logger) * self
+
+    def rotate(self, alpha: float = 0, beta: float = 0, gamma: float = 0) -> Transform:
+        """
+        Returns this transform followed by a rotation around x, y and z axis. Same as Vector.rotate
+
+        >>> Transform().translate(Point(1, 0, 0)).rotate(gamma=90).apply(Point(0, 0, 0))
+        Point(x=6.123233995736766e-17, y=1.0, z=0.0)
+
+
+        :param alpha: Rotation quantity around x axis
+        :param beta: Rotation quantity around y axis
+        :param gamma: Rotation quantity around z axis
+        :return: The composed transform
+        """
+        return Transform.from_euler(alpha=alpha, beta=beta, gamma=gamma, logger=self.logger) * self
+
+    def rotate_about(self, axis: Vector, angle: float) -> Transform:
+        """
+        Returns this transform followed by a rotation around the axis. Same as Vector.rotate_about for a unit axis
+
+        >>> Transform().rotate_about(Vector(Point(0, 0, 1)), 90).apply(Point(1, 0, 0))
+        Point(x=6.123233995736766e-17, y=1.0, z=0.0)
+
+
+        :param axis: The vector to rotate around
+        :param angle: Rotation amount
+        :return: The composed transform
+        """
+        return Transform.from_axis_angle(axis, angle, logger=self.logger) * self
+
+    def inverse(self) -> Transform:
+        """
+        Returns the transform that undoes this one
+
+        >>> t = Transform().translate(Point(1, 2, 3)).scale(2)
+        >>> t.inverse().apply(t.apply(Point(1, 1, 1)))
+        Point(x=1.0, y=1.0, z=1.0)
+
+
+        :return: The inverse transform
+        """
+        # Inverse of an affine matrix. x -> A x + t is undone by x -> A^-1 x - A^-1 t
+        try:
+            linear = np.linalg.inv(self.matrix[:3, :3])
+        except np.linalg.LinAlgError:
+            # Raise an error if the transform collapses space, such as a zero scale
+            self.logger.error("Transform is not invertible")
+            raise ValueError("Transform is not invertible")
+
+        matrix = np.eye(4)
+        matrix[:3, :3] = linear
+        matrix[:3, 3] = -linear @ self.matrix[:3, 3]
+        return Transform(matrix, logger=self.logger)
+
+    def apply(self, other: Union[Point, Vector, PointArray, VectorArray, np.ndarray]):
+        """
+        Transforms a Point, a Vector or a batch of them in one pass.
+        Vectors are directions, so they are rotated and scaled but not translated
+
+        >>> t = Transform().translate(Point(1, 0, 0))
+        >>> t.apply(PointArray([[0, 0, 0], [1, 1, 1]]))
+        PointArray([[1., 0., 0.],
+                    [2., 1., 1.]])
+        >>> t.apply(Vector(Point(1, 1, 1)))
+        Vector(Point(x=1.0, y=1.0, z=1.0))
+
+
+        :param other: A Point, a Vector, a PointArray, a VectorArray or an (N, 3) array of points
+        :return: The transformed object, of the same type as other
+        """
+        if isinstance(other, Vector):
+            return Vector._from_point(self._apply_point(other.point, translate=False), other._logger)
+        elif isinstance(other, Point):
+            return self._apply_point(other)
+        elif isinstance(other, VectorArray):
+            return VectorArray(PointArray(other.data @ self.matrix[:3, :3].T, logger=other.logger), logger=other.logger)
+        elif isinstance(other, PointArray):
+            return PointArray(self.apply(other.data), logger=other.logger)
+        elif isinstance(other, np.ndarray) and other.ndim == 2 and other.shape[1] == 3:
+            # (A @ p.T).T + t for all points at once
+            result = other @ self.matrix[:3, :3].T
+            result += self.matrix[:3, 3]
+            return result
+        else:
+            # Raise an error if other is not transformable
+            self.logger.error("Data must be Vector, Point or an array of them")
+            raise ValueError("Data must be Vector, Point or an array of them")
+
+    def _apply_point(self, point: Point, translate: bool = True) -> Point:
+        (a, b, c, tx), (d, e, f, ty), (g, h, i, tz) = self._rows
+        if not translate:
+            tx = ty = tz = 0.0
+
+        x, y, z = point.x, point.y, point.z
+        return Point._from_xyz(a * x + b * y + c * z + tx,
+                               d * x + e * y + f * z + ty,
+                               g * x + h * y + i * z + tz, point._logger)
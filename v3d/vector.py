@@ -12,11 +12,18 @@ from logging import Logger
 
 import math
 
+from . import settings
 from .point import Point
+from .point import _LoggerAttribute
+from .point import _LoggerOwner
+from .point import _new
 
 
-class Vector:
-    logger = getLogger('dummy')
+class Vector(metaclass=_LoggerOwner):
+    # No per instance __dict__. Keeps a Vector at the size of its Point reference
+    __slots__ = ("point", "_logger")
+
+    logger = _LoggerAttribute(getLogger('dummy'))
 
     def __init__(self, point: Point = None, logger: Logger = None) -> None:
         """
@@ -31,11 +38,8 @@ class Vector:
         :param point: Point value of a vector
         :param logger: Logger to log
         """
-        # From https://stackoverflow.com/questions/13521981/implementing-an-optional-logger-in-code
-        self.logger = logger or getLogger('dummy')
-
-        if logger is not None:
-            self.logger = logger
+        # Only store the logger if it is given. Falls back to the default logger otherwise
+        self._logger = logger
 
         # If the point is not given. Create a zero point and assign it to point
         if point is None:
@@ -43,6 +47,51 @@ class Vector:
 
         self.point = point
 
+    @classmethod
+    def _from_point(cls, point: Point, logger: Logger = None) -> Vector:
+        # Trusted constructor for the hot paths of v3d. Skips __init__ and its keyword handling.
+        # Returns an instance of the class it is called on
+        vector = _new(cls)
+        vector.point = point
+        vector._logger = logger
+        return vector
+
+    @classmethod
+    def from_xyz(cls, x: float, y: float, z: float, logger: Logger = None) -> Vector:
+        """
+        Creates a Vector from x, y and z values. Same as Vector(Point(x, y, z)) without the checks and keyword
+        handling of the constructors, for code that creates many vectors from values known to be numbers
+
+        >>> Vector.from_xyz(1, 2, 3)
+        Vector(Point(x=1, y=2, z=3))
+
+
+        :param x: X value of the vector
+        :param y: Y value of the vector
+        :param z: Z value of the vector
+        :param logger: Logger to log
+        :return: The created Vector
+        """
+        vector = _new(cls)
+        vector.point = Point._from_xyz(x, y, z, logger)
+        vector._logger = logger
+        return vector
+
+    @classmethod
+    def from_sequence(cls, values, logger: Logger = None) -> Vector:
+        """
+        Creates a Vector from a sequence of x, y and z values, such as a tuple, a list or a row of an array
+
+        >>> Vector.from_sequence([1, 2, 3])
+        Vector(Point(x=1, y=2, z=3))
+
+
+        :param values: x, y and z values
+        :param logger: Logger to log
+        :return: The created Vector
+        """
+        return cls(Point.from_sequence(values, logger=logger), logger=logger)
+
     def __repr__(self) -> str:
         return self.__str__()
 
@@ -53,7 +102,7 @@ class Vector:
     # From https://docs.python.org/3/library/operator.html
     def __neg__(self) -> Vector:
         # Change sign of point on -a
-        return Vector(-self.point, logger=self.logger)
+        return Vector._from_point(-self.point, self._logger)
 
     def __add__(self, other: Vector) -> Vector:
         # Call self.add on a + b
@@ -83,6 +132,22 @@ class Vector:
         # call self.mag of abs(a)
         return self.mag()
 
+    def __iadd__(self, other: Vector) -> Vector:
+        # Call self.add_ on a += b
+        return self.add_(other)
+
+    def __isub__(self, other: Vector) -> Vector:
+        # Call self.subtract_ on a -= b
+        return self.subtract_(other)
+
+    def __imul__(self, other: Union[Vector, float, int]) -> Vector:
+        # Call self.multiply_ on a *= b
+        return self.multiply_(other)
+
+    def __itruediv__(self, scalar: float) -> Vector:
+        # Call self.divide_ on a /= b
+        return self.divide_(scalar)
+
     def is_same(self, other: Vector) -> bool:
         """
         Checks if two vectors are the same.
@@ -104,6 +169,20 @@ class Vector:
         # if points assigned to Vector and other are same.
         return self.point == other.point
 
+    def grid_key(self, tolerance: float = 0.0001) -> tuple:
+        """
+        Returns a hashable key of the vector snapped to a grid of tolerance sized cells.
+        Vectors with the same key are within tolerance of each other. Uses Point.grid_key
+
+        >>> Vector(Point(1, 2, 3)).grid_key()
+        (10000, 20000, 30000)
+
+
+        :param tolerance: Tolerance for equality. Size of the grid cells
+        :return: tuple of x, y and z cell numbers
+        """
+        return self.point.grid_key(tolerance)
+
     @classmethod
     def from_points(cls, point1: Point, point2: Point) -> Vector:
         """
@@ -118,11 +197,12 @@ class Vector:
 
         :return: A vectro from two points
         """
-        cls.logger.info("Creating vector from two points")
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating vector from two points")
         # Check if point1 and point2 are Point
         if isinstance(point1, Point) and isinstance(point2, Point):
             # Assign Vector's Point ot point1 - point2
-            return Vector(point1 - point2)
+            return Vector._from_point(point1 - point2)
         else:
             # Raise an error if point1 or point2 is not Point
             cls.logger.error("Data must be Point type")
@@ -141,7 +221,7 @@ class Vector:
         """
         # Make a copy of Vector by returning a new Vector
         # with a copy of this.point is assigned as Point
-        return Vector(self.point.copy(), logger=self.logger)
+        return Vector._from_point(self.point.copy(), self._logger)
 
     def dot(self, other: Vector) -> float:
         """
@@ -156,7 +236,8 @@ class Vector:
         :param other: Second vector
         :return: Dot product of two vectors
         """
-        self.logger.info("Calculating dot product of {} and {}".format(self, other))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating dot product of %s and %s", self, other)
         # Check if the other is a Vector
         if isinstance(other, Vector):
             # Calculate and return dot product of two vectors
@@ -181,17 +262,17 @@ class Vector:
         :param other: Either scalar or vector.
         :return: Result of multiplication
         """
-        self.logger.info("Calculating {} * {}".format(self, other))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s * %s", self, other)
         # Check if other is float or int (in short if it's numeric)
         if isinstance(other, (int, float)):
             # Scale Vector's Point with the scalar
-            return Vector(self.point.scale(other), logger=self.logger)
+            return Vector._from_point(self.point.scale(other), self._logger)
         elif isinstance(other, Vector):
             # If it's a Vector than calculate cross product of two vectors
-            return Vector(Point(x=self.point.y * other.point.z - self.point.z * other.point.y,
-                                y=self.point.z * other.point.x - self.point.x * other.point.z,
-                                z=self.point.x * other.point.y - self.point.y * other.point.x,
-                                logger=self.logger), logger=self.logger)
+            return Vector.from_xyz(self.point.y * other.point.z - self.point.z * other.point.y,
+                                   self.point.z * other.point.x - self.point.x * other.point.z,
+                                   self.point.x * other.point.y - self.point.y * other.point.x, self._logger)
         else:
             # Raise an error if other is neither numeric nor a vector
             self.logger.error("Data must be Vector or scalar type")
@@ -208,7 +289,8 @@ class Vector:
 
         :return: The length of the vector
         """
-        self.logger.info("Calling Point.dist")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Point.dist")
         # Calls self.point's dist method
         return self.point.dist()
 
@@ -224,7 +306,8 @@ class Vector:
         :param other: Scalar to down scale
         :return: The new down scaled Vector
         """
-        self.logger.info("Calling Vector.multiply")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Vector.multiply")
         # Check if other is float or int (in short if it's numeric)
         if isinstance(other, (int, float)):
             # Raise an error if other is zero
@@ -256,11 +339,12 @@ class Vector:
         :param other: The vector to add to this vector
         :return: The addition result as a Vector
         """
-        self.logger.info("Calculating {} + {}".format(self, other))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s + %s", self, other)
         # Check if other is a Vector
         if isinstance(other, Vector):
             # Return a new Vector with point as sum of this and other's points
-            return Vector(self.point + other.point, logger=self.logger)
+            return Vector._from_point(self.point + other.point, self._logger)
         else:
             # Raise and error if other is not a Vector
             self.logger.error("Data must be Vector type")
@@ -279,10 +363,121 @@ class Vector:
         :param other: The vector to subtract from this vector
         :return: The subtraction result as a Vector
         """
-        self.logger.info("Calling Vector.add")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling Vector.add")
         # Call add with negative value of other vector
         return self.add(-other)
 
+    def add_(self, other: Vector) -> Vector:
+        """
+        Adds the other vector to this vector in place. Same as add without creating a new Vector.
+        Notice a Vector does not copy its Point. The Point given to the constructor changes too
+
+        >>> v = Vector(Point(1, 1, 1))
+        >>> v.add_(Vector(Point(2, 2, 2)))
+        Vector(Point(x=3, y=3, z=3))
+
+
+        :param other: The vector to add to this vector
+        :return: This vector
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s += %s", self, other)
+        # Check if other is a Vector
+        if isinstance(other, Vector):
+            self.point.add_(other.point)
+            return self
+        else:
+            # Raise and error if other is not a Vector
+            self.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+    def subtract_(self, other: Vector) -> Vector:
+        """
+        Subtracts the other vector from this vector in place. Same as subtract without creating a new Vector
+
+        >>> v = Vector(Point(1, 1, 1))
+        >>> v.subtract_(Vector(Point(2, 2, 2)))
+        Vector(Point(x=-1, y=-1, z=-1))
+
+
+        :param other: The vector to subtract from this vector
+        :return: This vector
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s -= %s", self, other)
+        # Check if other is a Vector
+        if isinstance(other, Vector):
+            self.point.subtract_(other.point)
+            return self
+        else:
+            # Raise and error if other is not a Vector
+            self.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+    def multiply_(self, other: Union[Vector, float, int]) -> Vector:
+        """
+        Scales this vector, or replaces it with its cross product with the other, in place.
+        Same as multiply without creating a new Vector
+
+        >>> v = Vector(Point(1, 1, 1))
+        >>> v.multiply_(2)
+        Vector(Point(x=2, y=2, z=2))
+        >>> v.multiply_(Vector(Point(3, 1, 4)))
+        Vector(Point(x=6, y=-2, z=-4))
+
+
+        :param other: Either scalar or vector.
+        :return: This vector
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating %s *= %s", self, other)
+        # Check if other is float or int (in short if it's numeric)
+        if isinstance(other, (int, float)):
+            self.point.scale_(other)
+            return self
+        elif isinstance(other, Vector):
+            # Calculate all of the cross product before changing the point. other can be this vector
+            x = self.point.y * other.point.z - self.point.z * other.point.y
+            y = self.point.z * other.point.x - self.point.x * other.point.z
+            z = self.point.x * other.point.y - self.point.y * other.point.x
+            self.point.x, self.point.y, self.point.z = x, y, z
+            return self
+        else:
+            # Raise an error if other is neither numeric nor a vector
+            self.logger.error("Data must be Vector or scalar type")
+            raise ValueError("Data must be Vector or scalar type")
+
+    def divide_(self, other: Union[float, int]) -> Vector:
+        """
+        Down scales this vector in place. Same as divide without creating a new Vector
+
+        >>> v = Vector(Point(2, 2, 2))
+        >>> v.divide_(2)
+        Vector(Point(x=1.0, y=1.0, z=1.0))
+
+
+        :param other: Scalar to down scale
+        :return: This vector
+        """
+        # Check if other is float or int (in short if it's numeric)
+        if isinstance(other, (int, float)):
+            # Raise an error if other is zero
+            if other == 0:
+                raise ValueError("Cannot divide by zero")
+
+            # Calls self.multiply_ for 1/other. Same as divide
+            return self.multiply_(1 / other)
+
+        elif isinstance(other, Vector):
+            # Raise an error if other is a Vector
+            self.logger.error("Vector by Vector division is not possible")
+            raise ValueError("Vector by Vector division is not possible")
+        else:
+            # Raise an error if other is not numeric
+            self.logger.error("Data must be numeric type")
+            raise ValueError("Data must be numeric type")
+
     def heading(self) -> tuple[float, float]:
         """
         Returns heading angle of the vector
@@ -294,7 +489,8 @@ class Vector:
 
         :return: Angles of the vector
         """
-        self.logger.info("Calculating Heading")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating Heading")
         # Calculate Magnitude of Vector
         r = self.mag()
         # Use Jacobian to calculate theta and phi
@@ -314,55 +510,64 @@ class Vector:
 
         :return: The unit vector of this vector
         """
-        self.logger.info("Calculating unit vector of {}".format(self))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating unit vector of %s", self)
         # Divide self with magnitude and return as a new vector
         m = self.mag()
-        return Vector(self.point / m, logger=self.logger)
+        return Vector._from_point(self.point / m, self._logger)
 
-    def angle_between(self, other: Vector) -> float:
+    def angle_between(self, other: Vector, radians: bool = False) -> float:
         """
-        Returns angle between this and the given vector
+        Returns angle between this and the given vector.
+        Calculated in one pass as atan2 of magnitude of cross product and dot product,
+        which is accurate for angles close to 0 and 180 degrees too
 
         >>> v = Vector(Point(1, 1, 1))
         >>> v2 = Vector(Point(3, 1, 4))
         >>> v.angle_between(v2)
-        25.065829224994683
+        25.0658292249947
+        >>> v.angle_between(v2, radians=True)
+        0.43748124971877606
 
 
         :param other: The vector to calculate angle between this
+        :param radians: If True, return the angle in radians instead of degrees
         :return: Angle between this and given vector
         """
-        self.logger.info("calculating angle between {} and {}".format(self, other))
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("calculating angle between %s and %s", self, other)
         # Check if the other is a Vector
-        if isinstance(other, Vector):
-            # Check if Vector is not equal to a zero Vector
-            if not self == Vector(Point(logger=self.logger), logger=self.logger):
-                # Check if Vector is not equal to the other
-                if not other == Vector(Point(logger=self.logger), logger=self.logger):
-                    # Calculate Unit Vector of Vector and the other vector
-                    unit_other = other.unit()
-                    unit_self = self.unit()
-                    # Check if unit vectors are not same
-                    if not unit_other.point == unit_self.point:
-                        # Calculate and return angle between two Vectors
-                        return math.degrees(math.acos(self.dot(other) / (self.mag() * other.mag())))
-                    else:
-                        # Return zero as angle because unit vectors are same
-                        self.logger.warning("Unit Vectors are the same")
-                        return 0
-                else:
-                    # Raise an error if other is not a valid Vector. Its zero Vector
-                    self.logger.error("{} is not a valid Vector".format(other))
-                    raise ValueError("{} is not a valid Vector".format(other))
-            else:
-                # Raise an error if vector is zero vector
-                self.logger.error("{} is not a valid Vector".format(other))
-                raise ValueError("{} is not a valid Vector".format(other))
-        else:
+        if not isinstance(other, Vector):
             # Raise an error if other is not a Vector
             self.logger.error("Data must be Vector type")
             raise ValueError("Data must be Vector type")
 
+        ax, ay, az = self.point.x, self.point.y, self.point.z
+        bx, by, bz = other.point.x, other.point.y, other.point.z
+        # Raise an error if any of the vectors is a zero Vector. Same tolerance as ==
+        for vector, (x, y, z) in ((self, (ax, ay, az)), (other, (bx, by, bz))):
+            if abs(x) < 0.0001 and abs(y) < 0.0001 and abs(z) < 0.0001:
+                self.logger.error("{} is not a valid Vector".format(vector))
+                raise ValueError("{} is not a valid Vector".format(vector))
+
+        self_mag = math.sqrt(ax * ax + ay * ay + az * az)
+        other_mag = math.sqrt(bx * bx + by * by + bz * bz)
+        # Return zero as angle if unit vectors are the same
+        if abs(ax / self_mag - bx / other_mag) < 0.0001 and abs(ay / self_mag - by / other_mag) < 0.0001 and \
+                abs(az / self_mag - bz / other_mag) < 0.0001:
+            self.logger.warning("Unit Vectors are the same")
+            return 0
+
+        # Magnitude of the cross product is |a||b|sin, the dot product is |a||b|cos
+        cx = ay * bz - az * by
+        cy = az * bx - ax * bz
+        cz = ax * by - ay * bx
+        angle = math.atan2(math.sqrt(cx * cx + cy * cy + cz * cz), ax * bx + ay * by + az * bz)
+        if radians:
+            return angle
+
+        return math.degrees(angle)
+
     def as_plt(self) -> dict:
         """
         Returns values to plot on matplotlib
@@ -390,7 +595,8 @@ class Vector:
         :param other: Other vector
         :return: A unit vector normal to a plane which this and other vector are on.
         """
-        self.logger.info("calculating Normal Vector")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("calculating Normal Vector")
         # Check if other is a Vector
         if isinstance(other, Vector):
             # Return unit vector of cross product of Vector and other
@@ -401,9 +607,17 @@ class Vector:
             self.logger.error("Data must be Vector type")
             raise ValueError("Data must be Vector type")
 
-    def is_parallel(self, other: Vector) -> bool:
+    def _check_tolerance(self, rel_tol: float) -> None:
+        # Raise an error if the relative tolerance is not a non-negative number
+        if not isinstance(rel_tol, (int, float)) or not rel_tol >= 0:
+            self.logger.error("Tolerance must not be negative")
+            raise ValueError("Tolerance must not be negative")
+
+    def is_parallel(self, other: Vector, rel_tol: float = 0) -> bool:
         """
-        Checks if two vectors are parallel
+        Checks if two vectors are parallel.
+        With rel_tol, vectors are parallel if |a x b| <= rel_tol * |a| * |b|,
+        that is if the sine of the angle between them is at most rel_tol
 
         >>> v = Vector(Point(1, 1, 1))
         >>> v2 = Vector(Point(1, 1, 1))
@@ -412,25 +626,42 @@ class Vector:
         True
         >>> v.is_parallel(v3)
         False
+        >>> v.is_parallel(Vector(Point(0.1, 0.1, 0.1 + 1e-12)))
+        False
+        >>> v.is_parallel(Vector(Point(0.1, 0.1, 0.1 + 1e-12)), rel_tol=1e-9)
+        True
 
 
         :param other: Other vector to check
+        :param rel_tol: Relative tolerance. 0 by default, the cross product must be exactly zero
         :return: True if this and other vector are parallel, False otherwise
         """
-        self.logger.info("Checking if vectors are parallel")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if vectors are parallel")
         # Check if the other is Vector
         if isinstance(other, Vector):
-            # Return True if vecotr and other's cross products's
-            # magnitude is zero
-            return (self * other).mag() == 0
+            self._check_tolerance(rel_tol)
+            # Magnitude of the cross product, without creating a Vector
+            a, b = self.point, other.point
+            x = a.y * b.z - a.z * b.y
+            y = a.z * b.x - a.x * b.z
+            z = a.x * b.y - a.y * b.x
+            cross = math.sqrt(x * x + y * y + z * z)
+            if not rel_tol:
+                # Return True if vector and other's cross product's magnitude is zero
+                return cross == 0
+
+            return cross <= rel_tol * self.mag() * other.mag()
         else:
             # Raise an error if the other is not a vector
             self.logger.error("Data must be Vector type")
             raise ValueError("Data must be Vector type")
 
-    def is_perpendicular(self, other: Vector) -> bool:
+    def is_perpendicular(self, other: Vector, rel_tol: float = 0) -> bool:
         """
-        Checks if two vectors are perpendicular
+        Checks if two vectors are perpendicular.
+        With rel_tol, vectors are perpendicular if |a . b| <= rel_tol * |a| * |b|,
+        that is if the cosine of the angle between them is at most rel_tol
 
         >>> v = Vector(Point(1, 0, 0))
         >>> v2 = Vector(Point(0, 0, 1))
@@ -442,22 +673,32 @@ class Vector:
         True
         >>> v.is_perpendicular(v4)
         False
+        >>> v.is_perpendicular(Vector(Point(1e-12, 1, 0)), rel_tol=1e-9)
+        True
 
 
         :param other: Other vector to check
+        :param rel_tol: Relative tolerance. 0 by default, the dot product must be exactly zero
         :return: True if this and other vector are perpendicular, False otherwise
         """
-        self.logger.info("Checking if vectors are perpendicular")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if vectors are perpendicular")
         # Check if the other is Vector
         if isinstance(other, Vector):
-            # Return True if dot product of vector and the other is zero
-            return self.dot(other) == 0
+            self._check_tolerance(rel_tol)
+            a, b = self.point, other.point
+            dot = a.x * b.x + a.y * b.y + a.z * b.z
+            if not rel_tol:
+                # Return True if dot product of vector and the other is zero
+                return dot == 0
+
+            return abs(dot) <= rel_tol * self.mag() * other.mag()
         else:
             # Raise an error if the other is not a vector
             self.logger.error("Data must be Vector type")
             raise ValueError("Data must be Vector type")
 
-    def is_non_parallel(self, other: Vector) -> bool:
+    def is_non_parallel(self, other: Vector, rel_tol: float = 0) -> bool:
         """
         Checks if two vectors are neither parallel nor perpendicular
 
@@ -471,13 +712,15 @@ class Vector:
 
 
         :param other: Other vector to check
+        :param rel_tol: Relative tolerance of is_parallel and is_perpendicular. 0 by default
         :return: True if this and other vector are not parallel, False otherwise
         """
-        self.logger.info("Checking if vectors are non-parallel")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if vectors are non-parallel")
         # Check if the other is Vector
         if isinstance(other, Vector):
             # Return True if vector and other is not parallel
-            return not (self.is_parallel(other) or self.is_perpendicular(other))
+            return not (self.is_parallel(other, rel_tol=rel_tol) or self.is_perpendicular(other, rel_tol=rel_tol))
         else:
             # Raise an error if the other is not a vector
             self.logger.error("Data must be Vector type")
@@ -517,7 +760,8 @@ class Vector:
 
         :return: The rotated vector
         """
-        self.logger.info("Rotating Vector")
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Rotating Vector")
         # From https://stackoverflow.com/a/14609567/2681662
 
         # Check if alpha, beta and gamma are float or int (in short if it's numeric)
@@ -527,28 +771,22 @@ class Vector:
             beta = math.radians(beta)
             gamma = math.radians(gamma)
 
-            # Make a copy of Vector
-            vec = self.copy()
+            # Rotate the coordinates. Only the result is created as a Vector
+            x, y, z = self.point.x, self.point.y, self.point.z
 
             # Rotate along X axis
-            x = vec.point.x
-            y = vec.point.y * math.cos(alpha) - vec.point.z * math.sin(alpha)
-            z = vec.point.y * math.sin(alpha) + vec.point.z * math.cos(alpha)
-            vec = Vector(Point(x=x, y=y, z=z, logger=self.logger), logger=self.logger)
+            cos, sin = math.cos(alpha), math.sin(alpha)
+            y, z = y * cos - z * sin, y * sin + z * cos
 
             # Rotate along Y axis
-            x = vec.point.x * math.cos(beta) + vec.point.z * math.sin(beta)
-            y = vec.point.y
-            z = -vec.point.x * math.sin(beta) + vec.point.z * math.cos(beta)
-            vec = Vector(Point(x=x, y=y, z=z, logger=self.logger), logger=self.logger)
+            cos, sin = math.cos(beta), math.sin(beta)
+            x, z = x * cos + z * sin, -x * sin + z * cos
 
             # Rotate along Z axis
-            x = vec.point.x * math.cos(gamma) - vec.point.y * math.sin(gamma)
-            y = vec.point.x * math.sin(gamma) + vec.point.y * math.cos(gamma)
-            z = vec.point.z
-            vec = Vector(Point(x=x, y=y, z=z, logger=self.logger), logger=self.logger)
+            cos, sin = math.cos(gamma), math.sin(gamma)
+            x, y = x * cos - y * sin, x * sin + y * cos
 
-            return vec
+            return Vector.from_xyz(x, y, z, self._logger)
 
         else:
             # Raise an error if alpha, beta or gamma is not numeric
@@ -0,0 +1,652 @@
+from __future__ import annotations
+from typing import Union
+
+from logging import getLogger
+from logging import Logger
+
+import numpy as np
+
+from . import settings
+from .point import Point
+from .vector import Vector
+from .point_array import PointArray
+
+
+class VectorArray:
+    logger = getLogger('dummy')
+
+    def __init__(self, point=None, logger: Logger = None) -> None:
+        """
+        Constructor method. Stores N vectors as a PointArray, the same way a Vector stores a Point
+
+        >>> VectorArray([Vector(Point(1, 1, 1)), Vector(Point(1, 1, 2))])
+        VectorArray(PointArray([[1., 1., 1.],
+                                [1., 1., 2.]]))
+        >>> VectorArray(PointArray([[1, 1, 1]]))
+        VectorArray(PointArray([[1., 1., 1.]]))
+
+
+        :param point: PointArray value of the vectors, a list of Vectors or anything PointArray accepts
+        :param logger: Logger to log
+        """
+        if logger is not None:
+            self.logger = logger
+
+        # Convert Vectors to their Points
+        if isinstance(point, Vector):
+            point = point.point
+        elif isinstance(point, (list, tuple)) and len(point) > 0 and isinstance(point[0], Vector):
+            point = self._vectors_to_points(point)
+
+        # Keep the PointArray as is, create one for anything else
+        if not isinstance(point, PointArray):
+            point = PointArray(point, logger=self.logger)
+
+        self.point = point
+
+    def _vectors_to_points(self, vectors: list) -> list:
+        # Check if each element is a Vector
+        if not all(isinstance(vector, Vector) for vector in vectors):
+            self.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+        return [vector.point for vector in vectors]
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __str__(self) -> str:
+        prefix = f"{self.__class__.__name__}({self.point.__class__.__name__}("
+        return f"{prefix}{np.array2string(self.data, separator=', ', prefix=prefix)}))"
+
+    def __len__(self) -> int:
+        return len(self.point)
+
+    def __getitem__(self, index) -> Union[Vector, VectorArray]:
+        # Return a Vector for an integer index and a VectorArray for slices and masks
+        if isinstance(index, (int, np.integer)):
+            return Vector._from_point(self.point[index], self.logger)
+
+        return VectorArray(self.point[index], logger=self.logger)
+
+    def __iter__(self):
+        for point in self.point:
+            yield Vector._from_point(point, self.logger)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.point.__array__(dtype=dtype, copy=copy)
+
+    # From https://docs.python.org/3/library/operator.html
+    def __neg__(self) -> VectorArray:
+        # Change sign of points on -a
+        return VectorArray(-self.point, logger=self.logger)
+
+    def __add__(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        # Call self.add on a + b
+        return self.add(other)
+
+    def __sub__(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        # Call self.subtract on a - b
+        return self.subtract(other)
+
+    def __mul__(self, other) -> VectorArray:
+        # Call self.multiply on a * b
+        return self.multiply(other)
+
+    def __rmul__(self, other) -> VectorArray:
+        # Call self.multiply on b * a
+        return self.multiply(other)
+
+    def __truediv__(self, scalar) -> VectorArray:
+        # Call self.divide on a / b
+        return self.divide(scalar)
+
+    def __eq__(self, other: Union[Vector, VectorArray]) -> np.ndarray:
+        # Call self.is_same on a == b
+        return self.is_same(other)
+
+    def __abs__(self) -> np.ndarray:
+        # call self.mag of abs(a)
+        return self.mag()
+
+    def __iadd__(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        # Call self.add_ on a += b
+        return self.add_(other)
+
+    def __isub__(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        # Call self.subtract_ on a -= b
+        return self.subtract_(other)
+
+    def __imul__(self, other) -> VectorArray:
+        # Call self.multiply_ on a *= b
+        return self.multiply_(other)
+
+    def __itruediv__(self, scalar) -> VectorArray:
+        # Call self.divide_ on a /= b
+        return self.divide_(scalar)
+
+    @property
+    def data(self) -> np.ndarray:
+        return self.point.data
+
+    def _coordinates(self, other: Union[Vector, VectorArray], all_pairs: bool = False) -> tuple:
+        # Returns self and other as arrays that broadcast against each other.
+        # With all_pairs, self becomes (N, 1, 3) and other (1, M, 3), so results are (N, M)
+        if isinstance(other, Vector):
+            return self.data, np.array([other.point.x, other.point.y, other.point.z], dtype=np.float64)
+        elif isinstance(other, VectorArray):
+            if all_pairs:
+                return self.data[:, None, :], other.data[None, :, :]
+
+            # Raise an error if the lengths cannot be broadcast
+            if len(other) not in (1, len(self)):
+                self.logger.error("VectorArrays must have the same length")
+                raise ValueError("VectorArrays must have the same length")
+
+            return self.data, other.data
+        else:
+            # Raise an error if other is not a Vector
+            self.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+    @staticmethod
+    def _dot(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        # Dot product over the last axis, in the same order as Vector.dot
+        return first[..., 0] * second[..., 0] + first[..., 1] * second[..., 1] + first[..., 2] * second[..., 2]
+
+    @staticmethod
+    def _cross(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        # Cross product over the last axis, in the same order as Vector.multiply
+        shape = np.broadcast_shapes(first.shape, second.shape)
+        result = np.empty(shape)
+        result[..., 0] = first[..., 1] * second[..., 2] - first[..., 2] * second[..., 1]
+        result[..., 1] = first[..., 2] * second[..., 0] - first[..., 0] * second[..., 2]
+        result[..., 2] = first[..., 0] * second[..., 1] - first[..., 1] * second[..., 0]
+        return result
+
+    @staticmethod
+    def _mag(data: np.ndarray) -> np.ndarray:
+        # Magnitude over the last axis, in the same order as Point.dist
+        return np.sqrt(data[..., 0] * data[..., 0] + data[..., 1] * data[..., 1] + data[..., 2] * data[..., 2])
+
+    def _check_non_zero(self, data: np.ndarray) -> None:
+        # Raise the same error as Vector.angle_between if any of the vectors is a zero Vector.
+        # Same tolerance: every coordinate is closer to zero than 0.0001
+        zero = np.flatnonzero(np.all(np.abs(data.reshape(-1, 3)) < 0.0001, axis=1))
+        if zero.size > 0:
+            x, y, z = data.reshape(-1, 3)[zero[0]].tolist()
+            vector = Vector(Point(x, y, z))
+            self.logger.error("{} is not a valid Vector".format(vector))
+            raise ValueError("{} is not a valid Vector".format(vector))
+
+    @classmethod
+    def from_vectors(cls, vectors: list, logger: Logger = None) -> VectorArray:
+        """
+        Creates a VectorArray from a list of Vectors
+
+        >>> VectorArray.from_vectors([Vector(Point(1, 2, 3))])
+        VectorArray(PointArray([[1., 2., 3.]]))
+
+
+        :param vectors: List of Vectors
+        :param logger: Logger to log
+        :return: The created VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating VectorArray from Vectors")
+        vectors = list(vectors)
+        if len(vectors) == 0:
+            return cls(logger=logger)
+
+        return cls(vectors, logger=logger)
+
+    @classmethod
+    def from_points(cls, point1: Union[Point, PointArray], point2: Union[Point, PointArray]) -> VectorArray:
+        """
+        Creates vectors from given points. Same as Vector.from_points, element by element
+
+        >>> VectorArray.from_points(PointArray([[1, 1, 1]]), Point(2, 2, 3))
+        VectorArray(PointArray([[-1., -1., -2.]]))
+
+
+        :param point1: First points. To be translated to the origin
+        :param point2: Second points
+        :return: Vectors from the points
+        """
+        if settings.LOG_ARITHMETIC:
+            cls.logger.info("Creating VectorArray from two points")
+        # Check if point1 and point2 are Points or PointArrays
+        if isinstance(point1, PointArray) and isinstance(point2, (Point, PointArray)):
+            return cls(point1 - point2)
+        elif isinstance(point1, Point) and isinstance(point2, PointArray):
+            return cls(-(point2 - point1))
+        else:
+            # Raise an error if point1 or point2 is not Point
+            cls.logger.error("Data must be Point type")
+            raise ValueError("Data must be Point type")
+
+    def to_vectors(self) -> list:
+        """
+        Returns the vectors as a list of Vectors
+
+        >>> VectorArray([[1, 2, 3]]).to_vectors()
+        [Vector(Point(x=1.0, y=2.0, z=3.0))]
+
+
+        :return: List of Vectors
+        """
+        return list(self)
+
+    def copy(self) -> VectorArray:
+        """
+        Returns a copy of the VectorArray
+
+        >>> VectorArray([[1, 1, 1]]).copy()
+        VectorArray(PointArray([[1., 1., 1.]]))
+
+
+        :return: The copied VectorArray
+        """
+        return VectorArray(self.point.copy(), logger=self.logger)
+
+    def is_same(self, other: Union[Vector, VectorArray]) -> np.ndarray:
+        """
+        Checks if the vectors are the same as the other, element by element
+
+        >>> VectorArray([[1, 1, 1], [1, 1, 2]]).is_same(Vector(Point(1, 1, 1)))
+        array([ True, False])
+
+
+        :param other: A Vector or a VectorArray of the same length to compare with.
+        :return: A boolean mask, True where the vectors are the same
+        """
+        first, second = self._coordinates(other)
+        return np.all(np.abs(first - second) < 0.0001, axis=-1)
+
+    def add(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        """
+        Returns addition of the vectors with a Vector or another VectorArray, element by element
+
+        >>> VectorArray([[1, 1, 1]]).add(Vector(Point(2, 2, 2)))
+        VectorArray(PointArray([[3., 3., 3.]]))
+
+
+        :param other: The Vector or VectorArray to add to the vectors
+        :return: The addition result as a VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray addition")
+        first, second = self._coordinates(other)
+        return VectorArray(first + second, logger=self.logger)
+
+    def subtract(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        """
+        Returns subtraction of a Vector or another VectorArray from the vectors, element by element
+
+        >>> VectorArray([[1, 1, 1]]).subtract(Vector(Point(2, 2, 2)))
+        VectorArray(PointArray([[-1., -1., -1.]]))
+
+
+        :param other: The Vector or VectorArray to subtract from the vectors
+        :return: The subtraction result as a VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray subtraction")
+        first, second = self._coordinates(other)
+        return VectorArray(first - second, logger=self.logger)
+
+    def add_(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        """
+        Adds a Vector or another VectorArray to the vectors in place, writing into the PointArray's buffer
+
+        >>> va = VectorArray([[1, 1, 1]])
+        >>> va.add_(Vector(Point(2, 2, 2)))
+        VectorArray(PointArray([[3., 3., 3.]]))
+
+
+        :param other: The Vector or VectorArray to add to the vectors
+        :return: This VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray addition in place")
+        first, second = self._coordinates(other)
+        np.add(first, second, out=first)
+        return self
+
+    def subtract_(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        """
+        Subtracts a Vector or another VectorArray from the vectors in place, writing into the PointArray's buffer
+
+        >>> va = VectorArray([[1, 1, 1]])
+        >>> va.subtract_(Vector(Point(2, 2, 2)))
+        VectorArray(PointArray([[-1., -1., -1.]]))
+
+
+        :param other: The Vector or VectorArray to subtract from the vectors
+        :return: This VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray subtraction in place")
+        first, second = self._coordinates(other)
+        np.subtract(first, second, out=first)
+        return self
+
+    def multiply_(self, other) -> VectorArray:
+        """
+        Scales the vectors, or replaces them with their cross products with the other, in place
+
+        >>> va = VectorArray([[1, 1, 1]])
+        >>> va.multiply_(2)
+        VectorArray(PointArray([[2., 2., 2.]]))
+        >>> va.multiply_(Vector(Point(3, 1, 4)))
+        VectorArray(PointArray([[ 6., -2., -4.]]))
+
+
+        :param other: Either a scalar, a sequence of one scalar for each vector, a Vector or a VectorArray
+        :return: This VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray multiplication in place")
+        # Check if other is a Vector or a VectorArray. Than calculate cross product
+        if isinstance(other, (Vector, VectorArray)):
+            first, second = self._coordinates(other)
+            first[...] = self._cross(first, second)
+            return self
+
+        try:
+            # Scale the points with the scalar
+            self.point.scale_(other)
+            return self
+        except ValueError:
+            # Raise an error if other is neither numeric nor a vector
+            self.logger.error("Data must be Vector or scalar type")
+            raise ValueError("Data must be Vector or scalar type")
+
+    def divide_(self, other) -> VectorArray:
+        """
+        Down scales the vectors in place
+
+        >>> va = VectorArray([[2, 2, 2]])
+        >>> va.divide_(2)
+        VectorArray(PointArray([[1., 1., 1.]]))
+
+
+        :param other: Scalar to down scale or a sequence of one scalar for each vector
+        :return: This VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling PointArray.divide_")
+        # Raise an error if other is a Vector
+        if isinstance(other, (Vector, VectorArray)):
+            self.logger.error("Vector by Vector division is not possible")
+            raise ValueError("Vector by Vector division is not possible")
+
+        self.point.divide_(other)
+        return self
+
+    def dot(self, other: Union[Vector, VectorArray], all_pairs: bool = False) -> np.ndarray:
+        """
+        Returns dot products of the vectors and the other
+
+        >>> va = VectorArray([[1, 1, 1], [1, 0, 0]])
+        >>> va.dot(Vector(Point(3, 1, 4)))
+        array([8., 3.])
+        >>> va.dot(va, all_pairs=True)
+        array([[3., 1.],
+               [1., 1.]])
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :param all_pairs: If True, calculate for every vector against every vector of the other.
+        The result is then an (N, M) array
+        :return: Dot products
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray dot product")
+        first, second = self._coordinates(other, all_pairs=all_pairs)
+        return self._dot(first, second)
+
+    def multiply(self, other) -> VectorArray:
+        """
+        Returns either cross products or scalar multiplication depending on given other.
+
+        >>> va = VectorArray([[1, 1, 1]])
+        >>> va.multiply(2)
+        VectorArray(PointArray([[2., 2., 2.]]))
+        >>> va.multiply(Vector(Point(3, 1, 4)))
+        VectorArray(PointArray([[ 3., -1., -2.]]))
+
+
+        :param other: Either a scalar, a sequence of one scalar for each vector, a Vector or a VectorArray
+        :return: Result of multiplication
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray multiplication")
+        # Check if other is a Vector or a VectorArray. Than calculate cross product
+        if isinstance(other, (Vector, VectorArray)):
+            first, second = self._coordinates(other)
+            return VectorArray(self._cross(first, second), logger=self.logger)
+
+        try:
+            # Scale the points with the scalar
+            return VectorArray(self.point.scale(other), logger=self.logger)
+        except ValueError:
+            # Raise an error if other is neither numeric nor a vector
+            self.logger.error("Data must be Vector or scalar type")
+            raise ValueError("Data must be Vector or scalar type")
+
+    def divide(self, other) -> VectorArray:
+        """
+        Returns down scaled vectors
+
+        >>> VectorArray([[2, 2, 2]]).divide(2)
+        VectorArray(PointArray([[1., 1., 1.]]))
+
+
+        :param other: Scalar to down scale or a sequence of one scalar for each vector
+        :return: The new down scaled VectorArray
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calling PointArray.divide")
+        # Raise an error if other is a Vector
+        if isinstance(other, (Vector, VectorArray)):
+            self.logger.error("Vector by Vector division is not possible")
+            raise ValueError("Vector by Vector division is not possible")
+
+        return VectorArray(self.point.divide(other), logger=self.logger)
+
+    def mag(self) -> np.ndarray:
+        """
+        Returns the lengths of the vectors.
+
+        >>> VectorArray([[1, 1, 1], [3, 4, 0]]).mag()
+        array([1.73205081, 5.        ])
+
+
+        :return: The lengths of the vectors
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray magnitudes")
+        return self._mag(self.data)
+
+    def unit(self) -> VectorArray:
+        """
+        Returns unit vectors
+
+        >>> VectorArray([[3, 4, 0]]).unit()
+        VectorArray(PointArray([[0.6, 0.8, 0. ]]))
+
+
+        :return: The unit vectors of the vectors
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray unit vectors")
+        # Divide each vector with its magnitude. Raises an error for zero vectors same as Vector.unit
+        return self.divide(self.mag())
+
+    def heading(self) -> tuple:
+        """
+        Returns heading angles of the vectors
+
+        >>> VectorArray([[1, 1, 1]]).heading()
+        (array([54.73561032]), array([45.]))
+
+
+        :return: tuple of theta and phi arrays
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray Heading")
+        r = self.mag()
+        # Raise an error for zero vectors same as Vector.heading
+        if np.any(r == 0):
+            self.logger.error("float division by zero")
+            raise ZeroDivisionError("float division by zero")
+
+        # Use Jacobian to calculate theta and phi
+        phi = np.arctan2(self.point.y, self.point.x)
+        theta = np.arccos(self.point.z / r)
+        return np.degrees(theta), np.degrees(phi)
+
+    def angle_between(self, other: Union[Vector, VectorArray], all_pairs: bool = False,
+                      radians: bool = False) -> np.ndarray:
+        """
+        Returns angles between the vectors and the other. Same as Vector.angle_between
+
+        >>> va = VectorArray([[1, 1, 1], [1, 0, 0]])
+        >>> va.angle_between(Vector(Point(3, 1, 4)))
+        array([25.06582922, 53.96010657])
+        >>> va.angle_between(va, all_pairs=True)
+        array([[ 0.        , 54.73561032],
+               [54.73561032,  0.        ]])
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :param all_pairs: If True, calculate for every vector against every vector of the other.
+        The result is then an (N, M) array
+        :param radians: If True, return the angles in radians instead of degrees
+        :return: Angles between the vectors and the other
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray angles")
+        first, second = self._coordinates(other, all_pairs=all_pairs)
+        first_mag = self._mag(first)
+        second_mag = self._mag(second)
+        # Raise an error if any of the vectors is a zero Vector
+        self._check_non_zero(first)
+        self._check_non_zero(second)
+
+        # Same as Vector.angle_between. Angle is zero if unit vectors are the same
+        same = np.all(np.abs(first / first_mag[..., None] - second / second_mag[..., None]) < 0.0001, axis=-1)
+        # atan2 of magnitude of the cross product and the dot product
+        angles = np.arctan2(self._mag(self._cross(first, second)), self._dot(first, second))
+        if not radians:
+            angles = np.degrees(angles)
+
+        return np.where(same, 0, angles)
+
+    def normal(self, other: Union[Vector, VectorArray]) -> VectorArray:
+        """
+        Returns normal (unit) vectors of the vectors and the other
+
+        >>> VectorArray([[1, 1, 1]]).normal(Vector(Point(3, 1, 4)))
+        VectorArray(PointArray([[ 0.80178373, -0.26726124, -0.53452248]]))
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :return: Unit vectors normal to the planes which the vectors and the other are on.
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Calculating VectorArray Normal Vectors")
+        # Check if other is a Vector
+        if not isinstance(other, (Vector, VectorArray)):
+            # Raise an error if other is not a Vector
+            self.logger.error("Data must be Vector type")
+            raise ValueError("Data must be Vector type")
+
+        # Return unit vectors of cross products
+        return self.multiply(other).unit()
+
+    def _bound(self, first: np.ndarray, second: np.ndarray, rel_tol: float) -> np.ndarray:
+        # rel_tol * |a| * |b| for each pair. Raise an error if the relative tolerance is negative
+        if not isinstance(rel_tol, (int, float)) or not rel_tol >= 0:
+            self.logger.error("Tolerance must not be negative")
+            raise ValueError("Tolerance must not be negative")
+
+        return rel_tol * self._mag(first) * self._mag(second)
+
+    def is_parallel(self, other: Union[Vector, VectorArray], all_pairs: bool = False,
+                    rel_tol: float = 0) -> np.ndarray:
+        """
+        Checks if the vectors are parallel to the other.
+        Same as Vector.is_parallel. With rel_tol, vectors are parallel if |a x b| <= rel_tol * |a| * |b|,
+        that is if the sine of the angle between them is at most rel_tol
+
+        >>> va = VectorArray([[1, 1, 1], [2, 2, 2.000000001], [3, 1, 4]])
+        >>> va.is_parallel(Vector(Point(1, 1, 1)))
+        array([ True, False, False])
+        >>> va.is_parallel(va, all_pairs=True, rel_tol=1e-9)
+        array([[ True,  True, False],
+               [ True,  True, False],
+               [False, False,  True]])
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :param all_pairs: If True, check every vector against every vector of the other.
+        The result is then an (N, M) mask
+        :param rel_tol: Relative tolerance. 0 by default, the cross product must be exactly zero
+        :return: A boolean mask, True where the vectors are parallel
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if VectorArray vectors are parallel")
+        first, second = self._coordinates(other, all_pairs=all_pairs)
+        bound = self._bound(first, second, rel_tol)
+        return self._mag(self._cross(first, second)) <= bound
+
+    def is_perpendicular(self, other: Union[Vector, VectorArray], all_pairs: bool = False,
+                         rel_tol: float = 0) -> np.ndarray:
+        """
+        Checks if the vectors are perpendicular to the other.
+        Same as Vector.is_perpendicular. With rel_tol, vectors are perpendicular if |a . b| <= rel_tol * |a| * |b|,
+        that is if the cosine of the angle between them is at most rel_tol
+
+        >>> va = VectorArray([[0, 0, 1], [1e-12, 1, 0], [1, 1, 1]])
+        >>> va.is_perpendicular(Vector(Point(1, 0, 0)))
+        array([ True, False, False])
+        >>> va.is_perpendicular(Vector(Point(1, 0, 0)), rel_tol=1e-9)
+        array([ True,  True, False])
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :param all_pairs: If True, check every vector against every vector of the other.
+        The result is then an (N, M) mask
+        :param rel_tol: Relative tolerance. 0 by default, the dot product must be exactly zero
+        :return: A boolean mask, True where the vectors are perpendicular
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if VectorArray vectors are perpendicular")
+        first, second = self._coordinates(other, all_pairs=all_pairs)
+        bound = self._bound(first, second, rel_tol)
+        return np.abs(self._dot(first, second)) <= bound
+
+    def is_non_parallel(self, other: Union[Vector, VectorArray], all_pairs: bool = False,
+                        rel_tol: float = 0) -> np.ndarray:
+        """
+        Checks if the vectors are neither parallel nor perpendicular to the other
+
+        >>> VectorArray([[1, 0, 0], [1, 1, 0]]).is_non_parallel(Vector(Point(0, 1, 0)))
+        array([False,  True])
+
+
+        :param other: A Vector, or a VectorArray of the same length
+        :param all_pairs: If True, check every vector against every vector of the other.
+        The result is then an (N, M) mask
+        :param rel_tol: Relative tolerance of is_parallel and is_perpendicular. 0 by default
+        :return: A boolean mask, True where the vectors are neither parallel nor perpendicular
+        """
+        if settings.LOG_ARITHMETIC:
+            self.logger.info("Checking if VectorArray vectors are non-parallel")
+        first, second = self._coordinates(other, all_pairs=all_pairs)
+        bound = self._bound(first, second, rel_tol)
+        parallel = self._mag(self._cross(first, second)) <= bound
+        perpendicular = np.abs(self._dot(first, second)) <= bound
+        return ~(parallel | perpendicular)